@@ -76,7 +76,8 @@ class AIAnalyzer:
             'successful_steps': len([step for step in results.get('steps', []) if step.get('success', False)]),
             'total_steps': len(results.get('steps', [])),
             'errors': [step.get('error') for step in results.get('steps', []) if step.get('error')],
-            'screenshots': results.get('screenshots', [])
+            'screenshots': results.get('screenshots', []),
+            'performance': results.get('performance', {})
         }
         
         # Добавление детальной информации о шагах
@@ -104,6 +105,21 @@ class AIAnalyzer:
         
         return analysis_data
         
+    def _format_performance(self, performance: Dict[str, Any]) -> str:
+        """Метрики производительности для промпта"""
+        if not performance or not performance.get('pages'):
+            return ''
+            
+        ratings = performance.get('ratings', {})
+        lines = ['', '**Производительность страниц (худшие значения):**']
+        for name, unit in [('ttfb', 'мс'), ('fcp', 'мс'), ('lcp', 'мс'), ('cls', ''), ('inp', 'мс')]:
+            if performance.get(name) is not None:
+                value = f"{performance[name]} {unit}".strip()
+                lines.append(f"- {name.upper()}: {value} ({ratings.get(name)})")
+        lines.append(f"- Длинных задач: {performance.get('long_tasks', 0)} ({performance.get('long_task_time', 0)} мс)")
+        
+        return '\n'.join(lines) + '\n'
+        
     def _create_analysis_prompt(self, analysis_data: Dict[str, Any]) -> str:
         """Создание промпта для AI анализа"""
         
@@ -143,7 +159,7 @@ class AIAnalyzer:
 **Статистика:**
 - Успешных шагов: {analysis_data['successful_steps']} из {analysis_data['total_steps']}
 - Ошибок: {len(analysis_data['errors'])}
-
+{self._format_performance(analysis_data['performance'])}
 **Задача:** Проведи детальный UX-анализ и предоставь рекомендации по улучшению пользовательского опыта.
 
 **Требования к ответу:**
@@ -0,0 +1,167 @@
+"""
+Analysis Cache - модуль кэширования результатов анализа страниц по хэшу содержимого
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANALYSIS_CACHE_CONFIG = {
+    'enabled': True,
+    'memory_entries': 128,  # Результатов в памяти процесса (LRU)
+    'directory': None,  # Папка дискового кэша (None - только память)
+    'max_disk_bytes': 64 * 1024 * 1024  # При превышении удаляются давно использованные записи
+}
+
+# Части разметки, которые меняются от загрузки к загрузке, но не влияют на анализ
+VOLATILE_PATTERNS = [
+    (re.compile(r'<!--.*?-->', re.DOTALL), ''),
+    (re.compile(r'\snonce="[^"]*"'), ''),
+    (re.compile(r'(<meta[^>]+name="csrf[-_]token"[^>]+content=")[^"]*'), r'\1')
+]
+
+def normalize_html(html_content: str) -> str:
+    """HTML без комментариев, nonce и CSRF-токенов"""
+    for pattern, replacement in VOLATILE_PATTERNS:
+        html_content = pattern.sub(replacement, html_content)
+    return html_content.strip()
+
+def content_key(kind: str, html_content: str, version: str) -> str:
+    """Ключ кэша: вид анализа, версия анализатора и хэш нормализованного HTML"""
+    digest = hashlib.sha256(f'{kind}\0{version}\0'.encode('utf-8'))
+    digest.update(normalize_html(html_content).encode('utf-8'))
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """Двухуровневый кэш результатов анализа
+
+    Память - LRU на memory_entries записей; диск - JSON-файл на запись,
+    общий для процессов пакетного режима. Результаты хранятся как JSON,
+    поэтому каждый get возвращает независимую копию.
+    """
+
+    def __init__(self, cache_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_ANALYSIS_CACHE_CONFIG, **(cache_config or {})}
+        self.memory = OrderedDict()
+        self.directory = Path(self.settings['directory']).expanduser() if self.settings['directory'] else None
+        self.disk_bytes = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.disk_bytes = sum(path.stat().st_size for path in self.directory.glob('*.json'))
+
+    def get_or_compute(self, kind: str, html_content: str, version: str,
+                       compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Результат из кэша или вычисленный compute() (и сохраненный)"""
+        key = content_key(kind, html_content, version)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        analysis = compute()
+        self.put(key, analysis)
+        return analysis
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Результат по ключу (копия) или None"""
+        with self._lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return json.loads(self.memory[key])
+
+            data = self._read_disk(key)
+            if data is None:
+                self.stats['misses'] += 1
+                return None
+
+            self.stats['disk_hits'] += 1
+            self._remember(key, data)
+            return json.loads(data)
+
+    def put(self, key: str, analysis: Dict[str, Any]):
+        """Сохранение результата в память и на диск"""
+        data = json.dumps(analysis, ensure_ascii=False, default=str)
+        with self._lock:
+            self._remember(key, data)
+            self._write_disk(key, data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика попаданий"""
+        with self._lock:
+            lookups = self.stats['memory_hits'] + self.stats['disk_hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round((lookups - self.stats['misses']) / lookups, 3) if lookups else 0,
+                'memory_entries': len(self.memory),
+                'disk_bytes': self.disk_bytes
+            }
+
+    def _remember(self, key: str, data: str):
+        """Запись в LRU памяти"""
+        self.memory[key] = data
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.settings['memory_entries']:
+            self.memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        """Запись с диска (время доступа обновляется для вытеснения)"""
+        if not self.directory:
+            return None
+
+        path = self.directory / f'{key}.json'
+        try:
+            data = path.read_text(encoding='utf-8')
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: str):
+        """Запись на диск с вытеснением давно использованных файлов"""
+        if not self.directory:
+            return
+
+        path = self.directory / f'{key}.json'
+        temp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            previous_size = path.stat().st_size if path.exists() else 0
+            temp_path.write_text(data, encoding='utf-8')
+            temp_path.replace(path)
+            self.disk_bytes += path.stat().st_size - previous_size
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить результат анализа в кэш {path}: {e}")
+            return
+
+        if self.disk_bytes > self.settings['max_disk_bytes']:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Удаление давно использованных записей до предела max_disk_bytes"""
+        entries = []
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # Размер пересчитывается: файлы могли добавить другие процессы
+        self.disk_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self.disk_bytes <= self.settings['max_disk_bytes']:
+                break
+            path.unlink(missing_ok=True)
+            self.disk_bytes -= size
+            self.stats['evictions'] += 1
@@ -0,0 +1,593 @@
+"""
+Async Engine - асинхронный исполнитель сценариев поверх Chrome DevTools Protocol
+
+В отличие от ScenarioExecutor (блокирующий Selenium, один драйвер на поток),
+здесь один цикл asyncio управляет множеством вкладок через одно соединение
+с браузером. Готовность страниц определяется по событиям DevTools, а не опросом.
+"""
+
+import json
+import time
+import shutil
+import asyncio
+import logging
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable, Tuple
+
+from .cdp_client import CDPConnection, CDPError, browser_websocket_url
+from .browser import build_chrome_options
+from .driver_resolver import find_chrome_binary
+from .network_blocker import NetworkBlocker
+from .page_waiter import DEFAULT_WAIT_CONFIG
+from .typing_engine import TypingEngine
+from .web_analyzer import WebAnalyzer
+from .analysis_cache import AnalysisCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENGINE_CONFIG = {
+    'concurrency': 50,  # Одновременных сценариев (вкладок) на один браузер
+    'job_timeout': 180,  # Ограничение времени одного сценария, сек
+    'navigation_start_timeout': 1.0,  # Если за это время навигация не началась - страница обновилась без перехода
+    'launch_timeout': 20
+}
+
+# Ожидание любого из селекторов внутри страницы (MutationObserver, без опроса из Python)
+WAIT_FOR_SELECTOR_SCRIPT = """
+var selectors = arguments[0], timeout = arguments[1];
+
+function isVisible(el) {
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+}
+
+function match() {
+    for (var i = 0; i < selectors.length; i++) {
+        var nodes;
+        try {
+            nodes = document.querySelectorAll(selectors[i]);
+        } catch (e) {
+            continue;
+        }
+        for (var j = 0; j < nodes.length; j++) {
+            if (isVisible(nodes[j])) {
+                return selectors[i];
+            }
+        }
+    }
+    return null;
+}
+
+return new Promise(function (resolve) {
+    var found = match();
+    if (found || !timeout) {
+        resolve(found);
+        return;
+    }
+    var observer = new MutationObserver(function () {
+        var found = match();
+        if (found) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(found);
+        }
+    });
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    var timer = setTimeout(function () {
+        observer.disconnect();
+        resolve(null);
+    }, timeout);
+});
+"""
+
+# Центр первого видимого элемента (для клика событиями мыши)
+ELEMENT_CENTER_SCRIPT = """
+var nodes = document.querySelectorAll(arguments[0]);
+for (var i = 0; i < nodes.length; i++) {
+    var rect = nodes[i].getBoundingClientRect();
+    if (rect.width > 0 && rect.height > 0) {
+        nodes[i].scrollIntoView({block: 'center'});
+        rect = nodes[i].getBoundingClientRect();
+        return {x: rect.left + rect.width / 2, y: rect.top + rect.height / 2};
+    }
+}
+return null;
+"""
+
+# Установка значений полей так, как это делает ввод пользователя
+SET_VALUES_SCRIPT = """
+var values = arguments[0], filled = 0;
+values.forEach(function (item) {
+    var element = document.querySelectorAll(item.selector)[item.index || 0];
+    if (!element) {
+        return;
+    }
+    var proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, String(item.value));
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    filled += 1;
+});
+return filled;
+"""
+
+class AsyncPage:
+    """Вкладка в собственном изолированном контексте браузера"""
+
+    def __init__(self, browser: 'AsyncBrowser', target_id: str, session_id: str, context_id: str):
+        self.browser = browser
+        self.connection = browser.connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.context_id = context_id
+        self.wait_settings = browser.wait_settings
+
+        self.inflight = {}
+        self.last_network_activity = time.time()
+        self._network_changed = asyncio.Event()
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Команда DevTools в сессии вкладки"""
+        return await self.connection.send(method, params, self.session_id)
+
+    async def enable(self, blocked_urls: List[str], user_agent: Optional[str]):
+        """Включение доменов DevTools и подписка на сетевые события"""
+        self.connection.on('Network.requestWillBeSent', self._on_request, self.session_id)
+        self.connection.on('Network.loadingFinished', self._on_request_done, self.session_id)
+        self.connection.on('Network.loadingFailed', self._on_request_done, self.session_id)
+
+        commands = [self.send('Page.enable'), self.send('Network.enable')]
+        if blocked_urls:
+            commands.append(self.send('Network.setBlockedURLs', {'urls': blocked_urls}))
+        if user_agent:
+            commands.append(self.send('Network.setUserAgentOverride', {'userAgent': user_agent}))
+        await asyncio.gather(*commands)
+
+    async def wait_for_event(self, method: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Ожидание события вкладки"""
+        return await self.connection.wait_for(method, self.session_id, timeout=timeout)
+
+    async def settle_after(self, action: Callable[[], Awaitable[Any]], timeout: float):
+        """Выполнение действия и ожидание результата: загрузки новой страницы или простоя сети"""
+        started = asyncio.ensure_future(self.wait_for_event(
+            'Page.frameStartedLoading', self.browser.settings['navigation_start_timeout']))
+        loaded = asyncio.ensure_future(self.wait_for_event('Page.loadEventFired', timeout))
+        # Подписки должны появиться до отправки действия
+        await asyncio.sleep(0)
+
+        try:
+            await action()
+            try:
+                await started
+                await loaded
+            except asyncio.TimeoutError:
+                # Переход не начался - страница обновилась на месте
+                pass
+        finally:
+            started.cancel()
+            loaded.cancel()
+
+        await self.wait_for_network_idle(timeout)
+
+    async def goto(self, url: str, timeout: float):
+        """Переход по адресу с ожиданием загрузки"""
+        async def navigate():
+            result = await self.send('Page.navigate', {'url': url})
+            if result.get('errorText'):
+                raise CDPError(f"Не удалось открыть {url}: {result['errorText']}")
+
+        await self.settle_after(navigate, timeout)
+
+    async def wait_for_network_idle(self, timeout: float):
+        """Ожидание простоя сети по событиям Network.*"""
+        idle_time = self.wait_settings['network_idle_time']
+        max_age = min(self.wait_settings['max_request_age'], self.wait_settings['default_timeout'] / 2)
+        deadline = time.time() + timeout
+
+        while True:
+            now = time.time()
+            active = [started for started in self.inflight.values() if now - started < max_age]
+            quiet_for = now - self.last_network_activity
+
+            if len(active) <= self.wait_settings['max_inflight_requests'] and quiet_for >= idle_time:
+                return
+            if now >= deadline:
+                logger.debug(f"Сеть не затихла за {timeout} сек: {len(active)} запросов")
+                return
+
+            # Ждем следующего сетевого события или окончания периода тишины
+            self._network_changed.clear()
+            remaining = idle_time - quiet_for if not active else deadline - now
+            try:
+                await asyncio.wait_for(self._network_changed.wait(), max(0.01, min(remaining, deadline - now)))
+            except asyncio.TimeoutError:
+                pass
+
+    async def evaluate(self, script: str, *args, await_promise: bool = False) -> Any:
+        """Выполнение функции в странице (script - тело функции, как в execute_script)"""
+        expression = f"(function () {{{script}\n}}).apply(null, {json.dumps(list(args))})"
+        result = await self.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': await_promise
+        })
+
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise CDPError(details.get('exception', {}).get('description', details.get('text', 'Ошибка скрипта')))
+        return result['result'].get('value')
+
+    async def wait_for_selector(self, selectors: List[str], timeout: float) -> Optional[str]:
+        """Первый видимый селектор из списка (None, если не появился за timeout)"""
+        return await self.evaluate(WAIT_FOR_SELECTOR_SCRIPT, list(selectors), int(timeout * 1000), await_promise=True)
+
+    async def click(self, selector: str) -> bool:
+        """Клик мышью по первому видимому элементу"""
+        center = await self.evaluate(ELEMENT_CENTER_SCRIPT, selector)
+        if not center:
+            return False
+
+        for event_type in ('mouseMoved', 'mousePressed', 'mouseReleased'):
+            await self.send('Input.dispatchMouseEvent', {
+                'type': event_type, 'x': center['x'], 'y': center['y'], 'button': 'left', 'clickCount': 1
+            })
+        return True
+
+    async def type_text(self, text: str, delays: Optional[List[float]] = None):
+        """Ввод текста в элемент с фокусом; паузы между символами не блокируют другие вкладки"""
+        delays = delays or [0.0] * len(text)
+
+        for char, delay in zip(text, delays):
+            await self.send('Input.dispatchKeyEvent', {'type': 'keyDown', 'text': char, 'key': char})
+            await self.send('Input.dispatchKeyEvent', {'type': 'keyUp', 'key': char})
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def press_enter(self):
+        """Нажатие Enter"""
+        key = {'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13}
+        await self.send('Input.dispatchKeyEvent', {'type': 'keyDown', 'text': '\r', **key})
+        await self.send('Input.dispatchKeyEvent', {'type': 'keyUp', **key})
+
+    async def set_values(self, values: List[Dict[str, Any]]) -> int:
+        """Заполнение полей: [{'selector', 'index', 'value'}]"""
+        return await self.evaluate(SET_VALUES_SCRIPT, values)
+
+    async def content(self) -> str:
+        """HTML страницы"""
+        return await self.evaluate('return document.documentElement.outerHTML;')
+
+    async def close(self):
+        """Закрытие вкладки вместе с ее контекстом"""
+        # Соединение общее для всех вкладок: обработчики закрытой сессии больше не нужны
+        self.connection.off_session(self.session_id)
+        try:
+            await self.connection.send('Target.disposeBrowserContext', {'browserContextId': self.context_id})
+        except CDPError as e:
+            logger.debug(f"Контекст {self.context_id} уже закрыт: {e}")
+
+    def _on_request(self, params: Dict[str, Any]):
+        """Новый сетевой запрос"""
+        if not params.get('request', {}).get('url', '').startswith('data:'):
+            self.inflight[params['requestId']] = time.time()
+            self.last_network_activity = time.time()
+            self._network_changed.set()
+
+    def _on_request_done(self, params: Dict[str, Any]):
+        """Запрос завершен"""
+        if self.inflight.pop(params['requestId'], None) is not None:
+            self.last_network_activity = time.time()
+            self._network_changed.set()
+
+class AsyncBrowser:
+    """Chrome, управляемый через одно соединение DevTools"""
+
+    def __init__(self, connection: CDPConnection, config: Dict[str, Any],
+                 process: Optional[asyncio.subprocess.Process] = None, user_data_dir: Optional[str] = None):
+        self.connection = connection
+        self.config = config
+        self.settings = {**DEFAULT_ENGINE_CONFIG, **config.get('async_engine', {})}
+        self.wait_settings = {**DEFAULT_WAIT_CONFIG, **config.get('waits', {})}
+        self.blocked_urls = NetworkBlocker(config['network']).patterns
+        self.process = process
+        self.user_data_dir = user_data_dir
+
+    @classmethod
+    async def launch(cls, config: Dict[str, Any], headless: bool = True) -> 'AsyncBrowser':
+        """Запуск отдельного процесса Chrome с портом отладки"""
+        binary = find_chrome_binary(config['browser']['driver'].get('chrome_binary'))
+        if not binary:
+            raise RuntimeError("Chrome не найден; укажите путь в CHROME_BINARY")
+
+        user_data_dir = tempfile.mkdtemp(prefix='ux-agent-chrome-')
+        arguments = [
+            binary,
+            '--remote-debugging-port=0',
+            f'--user-data-dir={user_data_dir}',
+            '--no-first-run',
+            '--no-default-browser-check',
+            *build_chrome_options(config, headless).arguments,
+            'about:blank'
+        ]
+        process = await asyncio.create_subprocess_exec(*arguments, stdout=subprocess.DEVNULL,
+                                                       stderr=subprocess.DEVNULL)
+
+        # Chrome сообщает выбранный порт в файле DevToolsActivePort
+        port_file = Path(user_data_dir) / 'DevToolsActivePort'
+        launch_timeout = {**DEFAULT_ENGINE_CONFIG, **config.get('async_engine', {})}['launch_timeout']
+        deadline = time.time() + launch_timeout
+        while not port_file.exists() or len(port_file.read_text().splitlines()) < 2:
+            if time.time() >= deadline or process.returncode is not None:
+                process.kill()
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+                raise RuntimeError(f"Chrome не открыл порт отладки за {launch_timeout} сек")
+            await asyncio.sleep(0.05)
+
+        port, path = port_file.read_text().splitlines()[:2]
+        connection = CDPConnection(f'ws://127.0.0.1:{port}{path}')
+        await connection.connect()
+
+        logger.info(f"Chrome запущен для асинхронного исполнителя (порт {port})")
+        return cls(connection, config, process, user_data_dir)
+
+    @classmethod
+    async def connect(cls, debugger_address: str, config: Dict[str, Any]) -> 'AsyncBrowser':
+        """Подключение к уже запущенному Chrome (host:port отладки)"""
+        ws_url = await asyncio.get_running_loop().run_in_executor(None, browser_websocket_url, debugger_address)
+        connection = CDPConnection(ws_url)
+        await connection.connect()
+        return cls(connection, config)
+
+    async def new_page(self) -> AsyncPage:
+        """Новая вкладка в отдельном контексте (свои cookies и хранилище)"""
+        context = await self.connection.send('Target.createBrowserContext', {'disposeOnDetach': True})
+        target = await self.connection.send('Target.createTarget', {
+            'url': 'about:blank', 'browserContextId': context['browserContextId']
+        })
+        session = await self.connection.send('Target.attachToTarget', {
+            'targetId': target['targetId'], 'flatten': True
+        })
+
+        page = AsyncPage(self, target['targetId'], session['sessionId'], context['browserContextId'])
+        await page.enable(self.blocked_urls, self.config.get('user_agent'))
+        return page
+
+    async def close(self):
+        """Отключение и завершение запущенного процесса"""
+        if self.process:
+            try:
+                await self.connection.send('Browser.close')
+            except CDPError:
+                pass
+
+        await self.connection.close()
+
+        if self.process:
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+class AsyncScenarioEngine:
+    """Одновременное выполнение множества сценариев в одном браузере
+
+    Каждый сценарий - задача asyncio в своей вкладке; задачи можно отменить
+    по одной (cancel_job) или все сразу (cancel).
+    """
+
+    def __init__(self, config: Dict[str, Any], headless: bool = True, concurrency: Optional[int] = None):
+        self.config = config
+        self.headless = headless
+        self.settings = {**DEFAULT_ENGINE_CONFIG, **config.get('async_engine', {})}
+        if concurrency:
+            self.settings['concurrency'] = concurrency
+
+        simulation = config.get('user_simulation', {})
+        self.human_typing = simulation.get('human_behavior', False) and not simulation.get('virtual_clock', False)
+        self.typing_engine = TypingEngine(config.get('typing'))
+        # Разбор выдачи идет в потоках пула; кэш общий для всех сценариев
+        cache_config = config.get('analysis_cache', {})
+        self.analysis_cache = AnalysisCache(cache_config) if cache_config.get('enabled') else None
+
+        self.browser = None
+        self._jobs = {}
+
+    async def start(self, debugger_address: Optional[str] = None):
+        """Запуск браузера (или подключение к уже запущенному)"""
+        if debugger_address:
+            self.browser = await AsyncBrowser.connect(debugger_address, self.config)
+        else:
+            self.browser = await AsyncBrowser.launch(self.config, self.headless)
+
+    async def close(self):
+        """Отмена заданий и закрытие браузера"""
+        self.cancel()
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def cancel(self):
+        """Отмена всех выполняющихся сценариев"""
+        for task in self._jobs.values():
+            task.cancel()
+
+    def cancel_job(self, job_id: str) -> bool:
+        """Отмена одного сценария"""
+        task = self._jobs.get(job_id)
+        if task and not task.done():
+            task.cancel()
+            return True
+        return False
+
+    async def run_jobs(self, jobs: List[Dict[str, Any]]) -> AsyncIterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Выполнение заданий (формат build_jobs); результаты - по мере завершения"""
+        semaphore = asyncio.Semaphore(self.settings['concurrency'])
+
+        async def run(job: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+            async with semaphore:
+                return job, await self._run_job(job)
+
+        tasks = []
+        for job in jobs:
+            task = asyncio.ensure_future(run(job))
+            self._jobs[job['job_id']] = task
+            tasks.append(task)
+
+        logger.info(f"Асинхронный запуск: {len(jobs)} заданий, до {self.settings['concurrency']} одновременно")
+
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._jobs.clear()
+
+    async def _run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Одно задание с ограничением времени; отмена не прерывает остальные задания"""
+        start_time = time.time()
+        results = {
+            'job_id': job['job_id'],
+            'scenario': job['scenario'],
+            'timestamp': start_time,
+            'config': job['scenario_config'],
+            'steps': [],
+            'engine': 'async'
+        }
+
+        try:
+            await asyncio.wait_for(self.run_scenario(job['scenario_config'], results),
+                                   self.settings['job_timeout'])
+        except asyncio.TimeoutError:
+            results['error'] = f"Превышено время выполнения {self.settings['job_timeout']} сек"
+        except asyncio.CancelledError:
+            results['error'] = 'Задание отменено'
+        except Exception as e:
+            logger.error(f"Ошибка в задании {job['job_id']}: {e}")
+            results['error'] = str(e)
+
+        results['duration'] = time.time() - start_time
+        return results
+
+    async def run_scenario(self, scenario_config: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+        """Сценарий поиска по направлению в новой вкладке"""
+        page = await self.browser.new_page()
+        timeout = self.config['browser']['page_load_timeout']
+
+        try:
+            steps = [
+                ('open_homepage', lambda: self._open_homepage(page, timeout)),
+                ('search_destination', lambda: self._search_destination(page, scenario_config['destination'])),
+                ('select_dates', lambda: self._select_dates(page, scenario_config)),
+                ('configure_guests', lambda: self._configure_guests(page, scenario_config)),
+                ('search_hotels', lambda: self._search_hotels(page, timeout)),
+                ('analyze_search_results', lambda: self._analyze_results(page))
+            ]
+
+            for action, step_func in steps:
+                step = await self._run_step(action, step_func)
+                results['steps'].append(step)
+                if not step['success']:
+                    break
+
+        finally:
+            # Закрытие вкладки не должно прерываться отменой задания
+            await asyncio.shield(page.close())
+
+        return results
+
+    async def _run_step(self, action: str, step_func: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Выполнение шага в формате ScenarioExecutor"""
+        start_time = time.time()
+        try:
+            step = {'action': action, 'success': True, **(await step_func())}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка на шаге {action}: {e}")
+            step = {'action': action, 'success': False, 'error': str(e)}
+
+        step['timestamp'] = time.time()
+        step['duration'] = time.time() - start_time
+        return step
+
+    async def _open_homepage(self, page: AsyncPage, timeout: float) -> Dict[str, Any]:
+        """Главная страница"""
+        await page.goto(self.config['base_url'], timeout)
+        return {'url': self.config['base_url']}
+
+    async def _search_destination(self, page: AsyncPage, destination: str) -> Dict[str, Any]:
+        """Ввод направления и выбор подсказки"""
+        search_selectors = [
+            self.config['selectors']['search_box'],
+            'input[name*="query"]',
+            'input[placeholder*="поиск"]',
+            'input[placeholder*="куда"]',
+            '.search-input'
+        ]
+
+        selector = await page.wait_for_selector(search_selectors, 5)
+        if not selector:
+            return {'destination': destination, 'success': False, 'error': 'Поле поиска не найдено'}
+
+        await page.click(selector)
+        delays = self.typing_engine.schedule(destination) if self.human_typing else None
+        await page.type_text(destination, delays)
+
+        suggestion = await page.wait_for_selector(['.suggestion', '.autocomplete-item', '.dropdown-item'], 3)
+        if suggestion:
+            await page.click(suggestion)
+
+        return {'destination': destination, 'suggestion_selected': bool(suggestion)}
+
+    async def _select_dates(self, page: AsyncPage, scenario_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Заполнение дат заезда и выезда"""
+        filled = await page.set_values([
+            {'selector': 'input[type="date"]', 'index': 0, 'value': scenario_config['check_in']},
+            {'selector': 'input[type="date"]', 'index': 1, 'value': scenario_config['check_out']}
+        ])
+        return {'check_in': scenario_config['check_in'], 'check_out': scenario_config['check_out'],
+                'dates_filled': filled}
+
+    async def _configure_guests(self, page: AsyncPage, scenario_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Количество гостей и номеров"""
+        opener = await page.wait_for_selector(['.guest-selector button', '.guest-selector', '.traveler-selector'], 0)
+        if opener:
+            await page.click(opener)
+
+        filled = await page.set_values([
+            {'selector': 'input[type="number"], .guest-count', 'value': scenario_config['guests']},
+            {'selector': '.room-count, .rooms-count', 'value': scenario_config['rooms']}
+        ])
+        return {'guests': scenario_config['guests'], 'rooms': scenario_config['rooms'], 'fields_filled': filled}
+
+    async def _search_hotels(self, page: AsyncPage, timeout: float) -> Dict[str, Any]:
+        """Запуск поиска и ожидание результатов"""
+        button = await page.wait_for_selector(
+            [self.config['selectors']['search_button'], '.search-button', '.find-button', '.search-btn'], 0)
+
+        async def submit():
+            if not button or not await page.click(button):
+                await page.press_enter()
+
+        await page.settle_after(submit, timeout)
+        return {'submitted_with': button or 'enter'}
+
+    async def _analyze_results(self, page: AsyncPage) -> Dict[str, Any]:
+        """Анализ выдачи; разбор HTML выполняется вне цикла событий"""
+        html = await page.content()
+        loop = asyncio.get_running_loop()
+        analysis = await loop.run_in_executor(None, lambda: WebAnalyzer(parser_config=self.config.get('parser'),
+                                                                        cache=self.analysis_cache)
+                                            .analyze_search_results(html))
+        return {'analysis': analysis}
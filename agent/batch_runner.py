@@ -0,0 +1,174 @@
+"""
+Batch Runner - модуль параллельного запуска сценариев в пуле процессов
+"""
+
+import os
+import time
+import logging
+import multiprocessing.util
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from .price_stats import summarize_runs as summarize_prices
+from .card_store import HotelCardStore
+
+logger = logging.getLogger(__name__)
+
+# Состояние процесса-исполнителя
+_worker_agent = None
+
+def build_jobs(scenarios: Dict[str, Dict[str, Any]],
+               destinations: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Формирование матрицы заданий: сценарии × направления"""
+    jobs = []
+
+    for scenario_name, scenario_config in scenarios.items():
+        if destinations and 'destination' in scenario_config:
+            for destination in destinations:
+                jobs.append({
+                    'job_id': f'{scenario_name}__{destination}',
+                    'scenario': scenario_name,
+                    'scenario_config': {**scenario_config, 'destination': destination}
+                })
+        else:
+            jobs.append({
+                'job_id': scenario_name,
+                'scenario': scenario_name,
+                'scenario_config': scenario_config
+            })
+
+    return jobs
+
+def _init_worker(config: Dict[str, Any], headless: bool, log_dir: str):
+    """Инициализация процесса-исполнителя: свой лог и свой браузер"""
+    global _worker_agent
+
+    from .ux_agent import UXResearchAgent
+
+    # Отдельный лог на каждый процесс вместо общего файла родителя
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+
+    log_path = Path(log_dir) / f'worker_{os.getpid()}.log'
+    file_handler = logging.FileHandler(log_path, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root_logger.addHandler(file_handler)
+    root_logger.setLevel(logging.INFO)
+
+    _worker_agent = UXResearchAgent(config, headless=headless)
+    _worker_agent.setup_driver()
+
+    # Закрытие браузера при завершении процесса пула
+    multiprocessing.util.Finalize(None, _shutdown_worker, exitpriority=10)
+
+    logger.info(f"Исполнитель {os.getpid()} готов, лог: {log_path}")
+
+def _shutdown_worker():
+    """Освобождение браузера процесса-исполнителя"""
+    global _worker_agent
+
+    if _worker_agent is not None:
+        _worker_agent.cleanup()
+        _worker_agent = None
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Выполнение одного задания в процессе-исполнителе"""
+    start_time = time.time()
+    logger.info(f"Задание {job['job_id']} запущено")
+
+    try:
+        results = _worker_agent.run_scenario(job['scenario'], job['scenario_config'])
+    except Exception as e:
+        logger.error(f"Ошибка в задании {job['job_id']}: {e}")
+        results = {
+            'scenario': job['scenario'],
+            'timestamp': start_time,
+            'config': job['scenario_config'],
+            'steps': [],
+            'error': str(e)
+        }
+
+    results['job_id'] = job['job_id']
+    results['worker_pid'] = os.getpid()
+    results['duration'] = time.time() - start_time
+
+    logger.info(f"Задание {job['job_id']} завершено за {results['duration']:.1f} сек")
+    return results
+
+class BatchRunner:
+    """Параллельное выполнение набора сценариев в нескольких процессах"""
+
+    def __init__(self, config: Dict[str, Any], workers: int, headless: bool = True, log_dir: str = 'logs'):
+        if config.get('har', {}).get('mode') == 'record':
+            # Процессы писали бы трафик разных заданий в один и тот же архив
+            raise ValueError("Запись HAR не поддерживается в пакетном режиме")
+
+        self.config = config
+        self.workers = workers
+        self.headless = headless
+        self.log_dir = log_dir
+
+    def run(self, jobs: List[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Запуск заданий; результаты возвращаются по мере завершения"""
+        Path(self.log_dir).mkdir(exist_ok=True)
+
+        logger.info(f"Пакетный запуск: {len(jobs)} заданий, {self.workers} процессов")
+
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.config, self.headless, self.log_dir)) as executor:
+            futures = {executor.submit(_run_job, job): job for job in jobs}
+
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.error(f"Процесс-исполнитель завершился с ошибкой на задании {job['job_id']}: {e}")
+                    results = {
+                        'job_id': job['job_id'],
+                        'scenario': job['scenario'],
+                        'config': job['scenario_config'],
+                        'steps': [],
+                        'error': str(e)
+                    }
+                yield job, results
+
+def summarize_batch(records: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    """Сводка по всем заданиям пакета"""
+    durations = [r.get('duration', 0) for r in records]
+    steps = [step for r in records for step in r.get('steps', [])]
+    failed = [r for r in records if r.get('error') or not r.get('steps')]
+    crawls = {r['job_id']: step['analysis']['output'] for r in records for step in r.get('steps', [])
+              if step.get('action') in ('crawl_results', 'crawl_search_results')
+              and (step.get('analysis') or {}).get('output')}
+
+    return {
+        'jobs_total': len(records),
+        'jobs_succeeded': len(records) - len(failed),
+        'jobs_failed': len(failed),
+        'failed_jobs': {r['job_id']: r.get('error', 'нет выполненных шагов') for r in failed},
+        'wall_time': wall_time,
+        'total_job_time': sum(durations),
+        'average_job_time': sum(durations) / len(durations) if durations else 0,
+        'speedup': sum(durations) / wall_time if wall_time > 0 else 0,
+        'steps_total': len(steps),
+        'steps_success_rate': len([s for s in steps if s.get('success')]) / len(steps) if steps else 0,
+        # Цены выдачи между прогонами: разброс медиан и прогоны-выбросы
+        'prices': summarize_prices(records),
+        # Все карточки обходов выдачи в одном колоночном хранилище
+        'hotel_cards': HotelCardStore.from_jsonl(crawls).describe() if crawls else None,
+        'jobs': [
+            {
+                'job_id': r['job_id'],
+                'worker_pid': r.get('worker_pid'),
+                'duration': r.get('duration', 0),
+                'steps': len(r.get('steps', [])),
+                'successful_steps': len([s for s in r.get('steps', []) if s.get('success')]),
+                'report': r.get('report_path')
+            }
+            for r in records
+        ]
+    }
@@ -0,0 +1,70 @@
+"""
+Browser - модуль для создания и настройки веб-драйвера Chrome
+"""
+
+import logging
+from typing import Dict, Any
+from selenium import webdriver
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+from .driver_resolver import resolve_chromedriver
+from .network_blocker import attach_network_blocker
+
+logger = logging.getLogger(__name__)
+
+def build_chrome_options(config: Dict[str, Any], headless: bool = False) -> Options:
+    """Формирование опций запуска Chrome"""
+
+    chrome_options = Options()
+
+    chrome_binary = config['browser']['driver'].get('chrome_binary')
+    if chrome_binary:
+        chrome_options.binary_location = chrome_binary
+
+    if headless:
+        chrome_options.add_argument('--headless')
+
+    width, height = config['browser'].get('window_size', (1920, 1080))
+
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument(f'--window-size={width},{height}')
+    chrome_options.add_argument(f'--user-agent={config["user_agent"]}')
+
+    # Фоновые вкладки не притормаживаются (персоны и фильтры работают в параллельных вкладках)
+    chrome_options.add_argument('--disable-background-timer-throttling')
+    chrome_options.add_argument('--disable-backgrounding-occluded-windows')
+    chrome_options.add_argument('--disable-renderer-backgrounding')
+
+    # Отключение изображений для ускорения (кроме профилей, где важна полная загрузка)
+    network_config = config['network']
+    if network_config['profiles'][network_config['profile']].get('disable_images', False):
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+
+    # События DevTools (Network.*, Page.*) для ожиданий по готовности страницы
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': True})
+
+    return chrome_options
+
+def create_chrome_driver(config: Dict[str, Any], headless: bool = False) -> WebDriver:
+    """Запуск нового экземпляра Chrome с настройками из конфигурации"""
+
+    chrome_options = build_chrome_options(config, headless)
+
+    # Путь к chromedriver определяется один раз на процесс и без сети
+    resolution = resolve_chromedriver(config)
+    service = Service(resolution['path'])
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+
+    # Настройка таймаутов
+    driver.implicitly_wait(config['browser']['implicit_wait'])
+    driver.set_page_load_timeout(config['browser']['page_load_timeout'])
+
+    # Блокировка запросов по профилю из конфигурации
+    attach_network_blocker(driver, config['network'])
+
+    return driver
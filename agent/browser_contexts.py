@@ -0,0 +1,210 @@
+"""
+Browser Contexts - модуль изолированных контекстов и вкладок внутри одного Chrome
+"""
+
+import time
+import logging
+import weakref
+from typing import Dict, Any, Callable, Generator, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .page_waiter import DOM_QUIET_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+# Задача вкладки - генератор, который отдает условие готовности (или None),
+# когда ему нужно дождаться страницы, и возвращает итоговый результат.
+ReadyCheck = Optional[Callable[[WebDriver], bool]]
+TabTask = Generator[ReadyCheck, None, Dict[str, Any]]
+
+# Настройка новых вкладок драйвера (блокировка запросов, запись и воспроизведение HAR):
+# execute_cdp_cmd и подключения DevTools действуют только на одну вкладку, поэтому
+# каждая вкладка, открытая BrowserContextManager, настраивается до начала загрузки
+TargetHook = Callable[[WebDriver], None]
+_target_hooks = weakref.WeakKeyDictionary()
+
+def add_target_hook(driver: WebDriver, hook: TargetHook):
+    """Подписка на новые вкладки: hook вызывается, когда новая вкладка - текущая в драйвере"""
+    _target_hooks.setdefault(driver, []).append(hook)
+
+def remove_target_hook(driver: WebDriver, hook: TargetHook):
+    """Отписка от новых вкладок"""
+    hooks = _target_hooks.get(driver, [])
+    if hook in hooks:
+        hooks.remove(hook)
+
+def target_hooks(driver: WebDriver) -> List[TargetHook]:
+    """Обработчики новых вкладок драйвера"""
+    return list(_target_hooks.get(driver, []))
+
+def page_loaded(previous_url: str = 'about:blank') -> Callable[[WebDriver], bool]:
+    """Условие: вкладка ушла с previous_url и документ загружен"""
+    def check(driver: WebDriver) -> bool:
+        return (driver.current_url != previous_url
+                and driver.execute_script('return document.readyState') == 'complete')
+    return check
+
+def dom_quiet(quiet_time: float = 0.3) -> Callable[[WebDriver], bool]:
+    """Условие: DOM не меняется quiet_time секунд"""
+    def check(driver: WebDriver) -> bool:
+        return driver.execute_script(DOM_QUIET_SCRIPT) >= quiet_time * 1000
+    return check
+
+def page_settled(previous_url: str, quiet_time: float = 0.3) -> Callable[[WebDriver], bool]:
+    """Условие: после действия загрузилась новая страница или перестал меняться DOM"""
+    def check(driver: WebDriver) -> bool:
+        if driver.current_url != previous_url:
+            return (driver.execute_script('return document.readyState') == 'complete'
+                    and driver.execute_script(DOM_QUIET_SCRIPT) >= quiet_time * 1000)
+        # Без перехода (SPA) ждем более длительного затишья DOM
+        return driver.execute_script(DOM_QUIET_SCRIPT) >= quiet_time * 3000
+    return check
+
+class BrowserContextManager:
+    """Изолированные контексты (как инкогнито-окна) в одном процессе Chrome"""
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self.contexts = []
+        self.tabs = []
+
+    def create_context(self, url: str = 'about:blank') -> Dict[str, Any]:
+        """Создание контекста с отдельными cookies/хранилищем и вкладки в нем"""
+        context_id = self.driver.execute_cdp_cmd('Target.createBrowserContext',
+                                                 {'disposeOnDetach': False})['browserContextId']
+        target_id = self.driver.execute_cdp_cmd('Target.createTarget',
+                                                {'url': 'about:blank', 'browserContextId': context_id})['targetId']
+
+        self._wait_for_handle(target_id)
+        self._prepare_target(target_id, url)
+
+        context = {'context_id': context_id, 'handle': target_id}
+        self.contexts.append(context)
+        return context
+
+    def open_tab(self, url: str = 'about:blank') -> Dict[str, Any]:
+        """Вкладка в основном контексте (общие cookies и хранилище); загрузка не блокирует драйвер"""
+        target_id = self.driver.execute_cdp_cmd('Target.createTarget', {'url': 'about:blank'})['targetId']
+        self._wait_for_handle(target_id)
+        self._prepare_target(target_id, url)
+
+        tab = {'handle': target_id}
+        self.tabs.append(tab)
+        return tab
+
+    def close_tabs(self):
+        """Закрытие вкладок, открытых open_tab"""
+        for tab in list(self.tabs):
+            try:
+                self.driver.execute_cdp_cmd('Target.closeTarget', {'targetId': tab['handle']})
+            except Exception as e:
+                logger.warning(f"Не удалось закрыть вкладку {tab['handle']}: {e}")
+            self.tabs.remove(tab)
+
+    def _wait_for_handle(self, target_id: str):
+        """Ожидание, пока драйвер увидит новую вкладку"""
+        # chromedriver использует идентификатор цели как дескриптор окна
+        deadline = time.time() + 5
+        while target_id not in self.driver.window_handles:
+            if time.time() >= deadline:
+                raise RuntimeError(f"Вкладка {target_id} не появилась в списке окон драйвера")
+            time.sleep(0.05)
+
+    def _prepare_target(self, target_id: str, url: str):
+        """Настройка пустой вкладки обработчиками драйвера и запуск загрузки url"""
+        original_handle = self.driver.current_window_handle
+        self.driver.switch_to.window(target_id)
+        try:
+            for hook in target_hooks(self.driver):
+                hook(self.driver)
+            if url != 'about:blank':
+                # Page.navigate не ждет загрузки документа - вкладки грузятся параллельно
+                self.driver.execute_cdp_cmd('Page.navigate', {'url': url})
+        finally:
+            self.driver.switch_to.window(original_handle)
+
+    def dispose_context(self, context: Dict[str, Any]):
+        """Закрытие контекста вместе со всеми его вкладками"""
+        try:
+            self.driver.execute_cdp_cmd('Target.disposeBrowserContext',
+                                        {'browserContextId': context['context_id']})
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть контекст {context['context_id']}: {e}")
+
+        if context in self.contexts:
+            self.contexts.remove(context)
+
+    def dispose_all(self):
+        """Закрытие всех созданных контекстов"""
+        for context in list(self.contexts):
+            self.dispose_context(context)
+
+class TabScheduler:
+    """Поочередное выполнение задач в нескольких вкладках
+
+    WebDriver обрабатывает команды одной сессии последовательно, поэтому
+    задачи переключаются кооперативно: пока одна вкладка грузит страницу,
+    драйвер обслуживает остальные. Сетевые загрузки и рендеринг идут параллельно.
+    """
+
+    def __init__(self, driver: WebDriver, poll_interval: float = 0.1, task_timeout: float = 120):
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.task_timeout = task_timeout
+
+    def run(self, tasks: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Выполнение задач вида {имя: {'handle': окно, 'task': генератор}}"""
+        original_handle = self.driver.current_window_handle
+        pending = {
+            name: {
+                'handle': task['handle'],
+                'task': task['task'],
+                'ready': None,
+                'started': time.time()
+            }
+            for name, task in tasks.items()
+        }
+        results = {}
+
+        try:
+            while pending:
+                progressed = False
+
+                for name, state in list(pending.items()):
+                    if time.time() - state['started'] > self.task_timeout:
+                        state['task'].close()
+                        results[name] = {'success': False, 'error': f'Превышено время выполнения {self.task_timeout} сек'}
+                        del pending[name]
+                        continue
+
+                    self.driver.switch_to.window(state['handle'])
+
+                    if state['ready'] is not None:
+                        try:
+                            if not state['ready'](self.driver):
+                                continue
+                        except Exception:
+                            # Страница еще переключается
+                            continue
+
+                    progressed = True
+                    try:
+                        state['ready'] = next(state['task'])
+                    except StopIteration as finished:
+                        results[name] = finished.value
+                        del pending[name]
+                    except Exception as e:
+                        logger.error(f"Ошибка в задаче {name}: {e}")
+                        results[name] = {'success': False, 'error': str(e)}
+                        del pending[name]
+
+                if pending and not progressed:
+                    time.sleep(self.poll_interval)
+
+        finally:
+            try:
+                self.driver.switch_to.window(original_handle)
+            except Exception:
+                pass
+
+        return results
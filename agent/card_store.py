@@ -0,0 +1,311 @@
+"""
+Card Store - модуль колоночного хранения карточек отелей
+"""
+
+import re
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Union
+import numpy as np
+import pandas as pd
+
+from .price_stats import parse_prices, describe_prices
+from .filter_explorer import REQUIREMENT_KEYWORDS, parse_number
+
+logger = logging.getLogger(__name__)
+
+# Признаки карточки - биты в колонке flags; совпадают с ключами требований сценариев
+CARD_FLAGS = list(REQUIREMENT_KEYWORDS)
+
+RATING_PATTERN = re.compile(r'(?<![\d.,])(\d{1,2}(?:[.,]\d)?)(?![\d.,]*\d)')
+REVIEWS_PATTERN = re.compile(r'\d+(?:[\s\u00a0]\d{3})*\s*(?:отзыв|review)\w*', re.IGNORECASE)
+DISTANCE_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)\s*(км|km|м|m)\b', re.IGNORECASE)
+AMENITY_SEPARATORS = re.compile(r'[,;·•\n]')
+
+# Колонки с типами: NaN / 0 - значение не найдено в карточке
+NUMERIC_COLUMNS = {
+    'price': np.float64,
+    'stars': np.int8,
+    'rating': np.float32,
+    'distance_km': np.float32,
+    'flags': np.uint16
+}
+
+# Строковые колонки: коды в пуле строк своей колонки
+STRING_COLUMNS = ('hotel', 'name', 'run')  # hotel - ключ отеля (id или ссылка)
+
+class StringPool:
+    """Интернирование строк: каждая строка хранится один раз, в колонках - ее код"""
+
+    def __init__(self):
+        self.codes = {}
+        self.strings = []
+
+    def intern(self, value: str) -> int:
+        """Код строки (новая строка получает следующий код)"""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+class HotelCardStore:
+    """Колоночное хранилище карточек отелей
+
+    Числовые колонки - массивы NumPy с запасом емкости (удвоение при росте),
+    строки интернированы в общем пуле, удобства хранятся как смещения и коды
+    (список на карточку без объектов Python). Экспорт в pandas и Arrow/Parquet
+    использует эти же буферы без копирования.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.pools = {name: StringPool() for name in (*STRING_COLUMNS, 'amenities')}
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()}
+        self.columns.update({name: np.zeros(capacity, dtype=np.int32) for name in STRING_COLUMNS})
+        self.amenity_offsets = np.zeros(capacity + 1, dtype=np.int32)
+        self.amenity_codes = np.zeros(capacity * 4, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, card: Dict[str, Any], run: str = ''):
+        """Добавление карточки (поля ResultsCrawler: id, url, name, price, rating, stars, ...)"""
+        self.extend([card], run)
+
+    def extend(self, cards: Iterable[Dict[str, Any]], run: str = ''):
+        """Добавление пачки карточек (цены разбираются одним проходом)"""
+        cards = list(cards)
+        if not cards:
+            return
+
+        start, end = self.size, self.size + len(cards)
+        self._reserve(end)
+        columns = self.columns
+        columns['price'][start:end] = parse_prices(card.get('price') or '' for card in cards)
+
+        amenity_pool = self.pools['amenities']
+        rows = {'stars': [], 'rating': [], 'distance_km': [], 'flags': [], 'hotel': [], 'name': []}
+        amenity_codes = []
+        amenity_ends = []
+
+        for card in cards:
+            codes = [amenity_pool.intern(item) for item in
+                     (item.strip().lower() for item in AMENITY_SEPARATORS.split(card.get('amenities') or '')) if item]
+            amenity_codes.extend(codes)
+            amenity_ends.append(len(amenity_codes))
+
+            flags = self._flags((card.get('features') or '').lower())
+            for code in codes:
+                flags |= self._flags(amenity_pool.strings[code])
+
+            rows['stars'].append(self._stars(card))
+            rows['rating'].append(self._rating(card.get('rating') or ''))
+            rows['distance_km'].append(self._distance(card.get('distance') or ''))
+            rows['flags'].append(flags)
+            rows['hotel'].append(self.pools['hotel'].intern(card.get('id') or card.get('url') or card.get('name') or ''))
+            rows['name'].append(self.pools['name'].intern(card.get('name') or ''))
+
+        for name, values in rows.items():
+            columns[name][start:end] = values
+        columns['run'][start:end] = self.pools['run'].intern(run)
+
+        offset = self.amenity_offsets[start]
+        self._reserve_amenities(offset + len(amenity_codes))
+        self.amenity_codes[offset:offset + len(amenity_codes)] = amenity_codes
+        self.amenity_offsets[start + 1:end + 1] = offset + np.array(amenity_ends, dtype=np.int32)
+        self.size = end
+
+    @classmethod
+    def from_jsonl(cls, paths: Dict[str, Union[str, Path]]) -> 'HotelCardStore':
+        """Хранилище из JSONL-файлов обхода выдачи ({прогон: путь})"""
+        store = cls()
+        for run, path in paths.items():
+            with open(path, encoding='utf-8') as f:
+                batch = []
+                for line in f:
+                    if line.strip():
+                        batch.append(json.loads(line))
+                    if len(batch) >= 1024:
+                        store.extend(batch, run)
+                        batch = []
+                store.extend(batch, run)
+        return store
+
+    def column(self, name: str) -> np.ndarray:
+        """Колонка без копирования (срез по числу карточек)"""
+        return self.columns[name][:self.size]
+
+    def flag_mask(self, *flags: str) -> np.ndarray:
+        """Карточки, у которых есть все признаки"""
+        bits = sum(1 << CARD_FLAGS.index(flag) for flag in flags)
+        return (self.column('flags') & bits) == bits
+
+    def amenity_mask(self, amenity: str) -> np.ndarray:
+        """Карточки с удобством (по коду в пуле строк, без разбора списков)"""
+        code = self.pools['amenities'].codes.get(amenity.lower())
+        if code is None:
+            return np.zeros(self.size, dtype=bool)
+
+        offsets = self.amenity_offsets[:self.size + 1]
+        hits = np.flatnonzero(self.amenity_codes[:offsets[-1]] == code)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[np.searchsorted(offsets, hits, side='right') - 1] = True
+        return mask
+
+    def match_requirements(self, requirements: Dict[str, Any], rows: Optional[slice] = None) -> np.ndarray:
+        """Карточки, выполняющие требования сценария (звезды, цена, расстояние, признаки)
+
+        Требование, которого нет в карточке (не указаны звезды или расстояние),
+        считается невыполненным.
+        """
+        rows = rows or slice(0, self.size)
+        mask = np.ones(len(range(self.size)[rows]), dtype=bool)
+
+        for key, requirement in requirements.items():
+            if requirement is False or requirement is None:
+                continue
+
+            if key == 'stars':
+                stars = parse_number(requirement)
+                if stars is not None:
+                    mask &= self.column('stars')[rows] >= stars
+            elif key == 'price_limit':
+                limit = parse_number(requirement)
+                if limit:
+                    mask &= self.column('price')[rows] <= limit
+            elif key == 'distance_to_lift' and not np.isnan(self._distance(str(requirement))):
+                # "ski-in/ski-out или до 500м": признак или расстояние не больше указанного
+                within = self.column('distance_km')[rows] <= self._distance(str(requirement))
+                mask &= within | self.flag_mask(key)[rows]
+            elif key in CARD_FLAGS:
+                mask &= self.flag_mask(key)[rows]
+
+        return mask
+
+    def strings(self, name: str) -> List[str]:
+        """Значения строковой колонки по кодам"""
+        strings = self.pools[name].strings
+        return [strings[code] for code in self.column(name)]
+
+    def describe(self, requirements: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Сводка по хранилищу: карточки, отели, прогоны, цены и выполнение требований"""
+        runs, counts = np.unique(self.column('run'), return_counts=True)
+        summary = {
+            'cards': self.size,
+            'unique_hotels': int(np.unique(self.column('hotel')).size),
+            'runs': {self.pools['run'].strings[code]: int(count) for code, count in zip(runs, counts)},
+            'memory_bytes': self.nbytes,
+            'prices': describe_prices(self.column('price')),
+            'flags': {flag: int(self.flag_mask(flag).sum()) for flag in CARD_FLAGS}
+        }
+
+        if requirements:
+            mask = self.match_requirements(requirements)
+            cheapest = self.column('name')[mask][np.argsort(self.column('price')[mask], kind='stable')][:5]
+            summary['requirements_matched'] = int(mask.sum())
+            summary['top_matches'] = [self.pools['name'].strings[code] for code in cheapest]
+
+        return summary
+
+    @property
+    def nbytes(self) -> int:
+        """Занятая колонками память (без пулов строк)"""
+        return (sum(self.column(name).nbytes for name in self.columns)
+                + self.amenity_offsets[:self.size + 1].nbytes
+                + self.amenity_codes[:self.amenity_offsets[self.size]].nbytes)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """DataFrame поверх колонок (числа - без копирования, строки - категории по кодам)"""
+        data = {name: self.column(name) for name in NUMERIC_COLUMNS}
+        for name in STRING_COLUMNS:
+            categories = pd.Index(self.pools[name].strings, dtype=object)
+            data[name] = pd.Categorical.from_codes(self.column(name), categories=categories, validate=False)
+
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """Таблица Arrow поверх колонок (удобства - списки словарных кодов)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise RuntimeError("Для экспорта в Arrow/Parquet нужен пакет pyarrow (pip install pyarrow)")
+
+        def strings(name: str, codes: np.ndarray):
+            return pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(self.pools[name].strings, type=pa.string()))
+
+        offsets = self.amenity_offsets[:self.size + 1]
+
+        return pa.table({
+            **{name: pa.array(self.column(name)) for name in NUMERIC_COLUMNS},
+            **{name: strings(name, self.column(name)) for name in STRING_COLUMNS},
+            'amenities': pa.ListArray.from_arrays(pa.array(offsets),
+                                                  strings('amenities', self.amenity_codes[:offsets[-1]]))
+        })
+
+    def to_parquet(self, path: Union[str, Path]):
+        """Сохранение в Parquet"""
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), str(path))
+
+    def _reserve(self, size: int):
+        """Увеличение емкости колонок (удвоением)"""
+        capacity = len(self.columns['price'])
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+        for name, column in self.columns.items():
+            self.columns[name] = np.resize(column, capacity)
+        self.amenity_offsets = np.resize(self.amenity_offsets, capacity + 1)
+
+    def _reserve_amenities(self, size: int):
+        """Увеличение емкости кодов удобств"""
+        capacity = len(self.amenity_codes)
+        if size > capacity:
+            self.amenity_codes = np.resize(self.amenity_codes, max(size, capacity * 2))
+
+    @staticmethod
+    def _stars(card: Dict[str, Any]) -> int:
+        """Звездность: число из карточки или символы ★ в рейтинге"""
+        stars = card.get('stars')
+        if isinstance(stars, (int, float)):
+            return int(stars)
+        if isinstance(stars, str) and stars.strip():
+            return parse_number(stars) or stars.count('★')
+        return (card.get('rating') or '').count('★')
+
+    @staticmethod
+    def _rating(text: str) -> float:
+        """Оценка - первое число текста не больше 10 (без числа отзывов)"""
+        for match in RATING_PATTERN.finditer(REVIEWS_PATTERN.sub(' ', text)):
+            value = float(match.group(1).replace(',', '.'))
+            if value <= 10:
+                return value
+        return np.nan
+
+    @staticmethod
+    def _distance(text: str) -> float:
+        """Расстояние в километрах"""
+        match = DISTANCE_PATTERN.search(text)
+        if not match:
+            return np.nan
+        value = float(match.group(1).replace(',', '.'))
+        return value if match.group(2).lower() in ('км', 'km') else value / 1000
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _flags(text: str) -> int:
+        """Битовая маска признаков по ключевым словам требований (удобства повторяются - кэш)"""
+        bits = 0
+        for index, flag in enumerate(CARD_FLAGS):
+            if any(keyword in text for keyword in REQUIREMENT_KEYWORDS[flag]):
+                bits |= 1 << index
+        return bits
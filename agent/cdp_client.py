@@ -0,0 +1,206 @@
+"""
+CDP Client - модуль прямого подключения к Chrome DevTools по WebSocket
+"""
+
+import json
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, List, Callable, Optional
+import requests
+import websockets
+from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+class CDPError(Exception):
+    """Ошибка, возвращенная DevTools в ответ на команду"""
+
+class CDPConnection:
+    """Асинхронное соединение с DevTools
+
+    Работает в цикле asyncio вызывающего кода. Поддерживает плоские сессии
+    (Target.attachToTarget с flatten): через одно соединение с браузером
+    можно управлять любым количеством вкладок, указывая session_id.
+    """
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self._ws = None
+        self._reader = None
+        self._next_id = 0
+        self._pending = {}
+        self._handlers = {}
+
+    async def connect(self):
+        """Открытие WebSocket и запуск чтения сообщений"""
+        # Ответы с телами страниц бывают больше ограничения websockets по умолчанию
+        self._ws = await websockets.connect(self.ws_url, max_size=None)
+        self._reader = asyncio.ensure_future(self._read_messages())
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None,
+                   session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Отправка команды и ожидание ответа"""
+        self._next_id += 1
+        message_id = self._next_id
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+
+        await self._ws.send(json.dumps(message))
+        return await future
+
+    def on(self, method: str, handler: Callable[[Dict[str, Any]], Any], session_id: Optional[str] = None):
+        """Подписка на событие (всех сессий или только указанной)"""
+        self._handlers.setdefault((method, session_id), []).append(handler)
+
+    def off(self, method: str, handler: Callable[[Dict[str, Any]], Any], session_id: Optional[str] = None):
+        """Отписка от события"""
+        handlers = self._handlers.get((method, session_id), [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def off_session(self, session_id: str):
+        """Отписка всех обработчиков сессии (после закрытия вкладки)"""
+        for key in [key for key in self._handlers if key[1] == session_id]:
+            del self._handlers[key]
+
+    async def wait_for(self, method: str, session_id: Optional[str] = None,
+                       predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Ожидание события (без опроса)"""
+        future = asyncio.get_running_loop().create_future()
+
+        def handler(params: Dict[str, Any]):
+            if not future.done() and (predicate is None or predicate(params)):
+                future.set_result(params)
+
+        self.on(method, handler, session_id)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.off(method, handler, session_id)
+
+    async def close(self):
+        """Закрытие соединения"""
+        if self._reader:
+            self._reader.cancel()
+        if self._ws:
+            await self._ws.close()
+
+    async def _read_messages(self):
+        """Разбор ответов на команды и событий"""
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+
+                if 'id' in message:
+                    future = self._pending.pop(message['id'], None)
+                    if future is None or future.done():
+                        continue
+                    if 'error' in message:
+                        future.set_exception(CDPError(message['error'].get('message', str(message['error']))))
+                    else:
+                        future.set_result(message.get('result', {}))
+                    continue
+
+                method = message.get('method')
+                params = message.get('params', {})
+                handlers = list(self._handlers.get((method, None), []))
+                if message.get('sessionId'):
+                    handlers += self._handlers.get((method, message['sessionId']), [])
+
+                for handler in handlers:
+                    asyncio.ensure_future(self._dispatch(handler, method, params))
+
+        except websockets.ConnectionClosed:
+            pass
+
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError('Соединение с DevTools закрыто'))
+            self._pending.clear()
+
+    async def _dispatch(self, handler: Callable, method: str, params: Dict[str, Any]):
+        """Вызов обработчика события с перехватом ошибок"""
+        try:
+            result = handler(params)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Ошибка в обработчике события {method}: {e}")
+
+class CDPClient:
+    """Сессия DevTools с собственным циклом asyncio в фоновом потоке
+
+    execute_cdp_cmd драйвера умеет только отправлять команды; события, на которые
+    нужно отвечать сразу (например, Fetch.requestPaused), принимаются здесь.
+    Обработчики событий выполняются в цикле клиента и могут быть корутинами.
+    """
+
+    def __init__(self, ws_url: str, connect_timeout: float = 10):
+        self.ws_url = ws_url
+        self.connect_timeout = connect_timeout
+        self.connection = CDPConnection(ws_url)
+        self.loop = None
+        self._thread = None
+
+    def start(self):
+        """Подключение к DevTools"""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='cdp-client', daemon=True)
+        self._thread.start()
+
+        asyncio.run_coroutine_threadsafe(self.connection.connect(), self.loop).result(self.connect_timeout)
+        logger.info(f"Подключение к DevTools установлено: {self.ws_url}")
+
+    def on(self, method: str, handler: Callable[[Dict[str, Any]], Any]):
+        """Подписка на событие DevTools"""
+        self.connection.on(method, handler)
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Отправка команды из цикла клиента (для обработчиков-корутин)"""
+        return await self.connection.send(method, params)
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = 10) -> Dict[str, Any]:
+        """Отправка команды из любого потока с ожиданием ответа"""
+        return asyncio.run_coroutine_threadsafe(self.send(method, params), self.loop).result(timeout)
+
+    def close(self):
+        """Отключение от DevTools и остановка цикла"""
+        if not self.loop:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.connection.close(), self.loop).result(5)
+        except Exception as e:
+            logger.warning(f"Ошибка при отключении от DevTools: {e}")
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(5)
+        self.loop.close()
+        self.loop = None
+
+def page_websocket_url(driver: WebDriver) -> str:
+    """Адрес WebSocket DevTools для текущей вкладки драйвера"""
+    address = driver.capabilities['goog:chromeOptions']['debuggerAddress']
+    targets: List[Dict[str, Any]] = requests.get(f'http://{address}/json', timeout=5).json()
+
+    # chromedriver использует идентификатор цели как дескриптор окна
+    handle = driver.current_window_handle
+    for target in targets:
+        if target.get('id') == handle:
+            return target['webSocketDebuggerUrl']
+
+    pages = [target for target in targets if target.get('type') == 'page']
+    if not pages:
+        raise RuntimeError(f"Нет вкладок для подключения к DevTools по адресу {address}")
+    return pages[0]['webSocketDebuggerUrl']
+
+def browser_websocket_url(debugger_address: str) -> str:
+    """Адрес WebSocket DevTools всего браузера (host:port отладки)"""
+    return requests.get(f'http://{debugger_address}/json/version', timeout=5).json()['webSocketDebuggerUrl']
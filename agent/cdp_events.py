@@ -0,0 +1,127 @@
+"""
+CDP Events - модуль чтения событий Chrome DevTools из performance-лога
+"""
+
+import json
+import time
+import logging
+import weakref
+from typing import Dict, Any, List, Callable, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+class CDPEventLog:
+    """Буфер событий DevTools одного драйвера
+
+    Chrome пишет события Network.* и Page.* в performance-лог
+    (см. goog:loggingPrefs в browser.py). Лог вычитывается целиком при каждом
+    чтении, поэтому все потребители событий должны работать через общий буфер.
+    """
+
+    def __init__(self, driver: WebDriver):
+        # Слабая ссылка, чтобы буфер не удерживал закрытый драйвер в реестре
+        self._driver_ref = weakref.ref(driver)
+        self.available = True
+        self.inflight = {}
+        self.last_network_activity = time.time()
+        self._listeners = []
+        # Разница между временем эпохи и монотонными часами браузера (timestamp событий Network.*)
+        self._clock_offset = None
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """Подписка на события (вызывается для каждого прочитанного события)"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """Отписка от событий"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Чтение новых событий из лога"""
+        if not self.available:
+            return []
+
+        driver = self._driver_ref()
+        if driver is None:
+            return []
+
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            logger.warning(f"Performance-лог недоступен, события DevTools не отслеживаются: {e}")
+            self.available = False
+            return []
+
+        events = []
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+
+            event = {
+                'method': message.get('method', ''),
+                'params': message.get('params', {}),
+                'timestamp': entry.get('timestamp', 0) / 1000
+            }
+            self._track_network(event)
+            events.append(event)
+
+            for listener in list(self._listeners):
+                try:
+                    listener(event)
+                except Exception as e:
+                    logger.warning(f"Ошибка в обработчике события {event['method']}: {e}")
+
+        return events
+
+    def inflight_count(self, max_age: Optional[float] = None) -> int:
+        """Количество незавершенных запросов (долгие запросы можно не учитывать)"""
+        if max_age is None:
+            return len(self.inflight)
+
+        now = time.time()
+        return len([started for started in self.inflight.values() if now - started < max_age])
+
+    def _event_time(self, event: Dict[str, Any]) -> float:
+        """Время события по часам time.time()
+
+        Лог читается с опозданием, поэтому время чтения не годится: старые
+        запросы выглядели бы свежими. Монотонный timestamp события переводится
+        во время эпохи по паре wallTime/timestamp из Network.requestWillBeSent.
+        """
+        params = event['params']
+        if 'wallTime' in params and 'timestamp' in params:
+            self._clock_offset = params['wallTime'] - params['timestamp']
+
+        if self._clock_offset is not None and 'timestamp' in params:
+            return params['timestamp'] + self._clock_offset
+        # Без пары часов - время записи в лог
+        return event['timestamp'] or time.time()
+
+    def _track_network(self, event: Dict[str, Any]):
+        """Учет запросов "в полете" для определения простоя сети"""
+        method = event['method']
+        params = event['params']
+
+        if method == 'Network.requestWillBeSent':
+            if not params.get('request', {}).get('url', '').startswith('data:'):
+                event_time = self._event_time(event)
+                self.inflight[params.get('requestId')] = event_time
+                self.last_network_activity = max(self.last_network_activity, event_time)
+
+        elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+            if self.inflight.pop(params.get('requestId'), None) is not None:
+                self.last_network_activity = max(self.last_network_activity, self._event_time(event))
+
+_event_logs = weakref.WeakKeyDictionary()
+
+def get_event_log(driver: WebDriver) -> CDPEventLog:
+    """Общий буфер событий для драйвера"""
+    event_log = _event_logs.get(driver)
+    if event_log is None:
+        event_log = CDPEventLog(driver)
+        _event_logs[driver] = event_log
+    return event_log
@@ -0,0 +1,179 @@
+"""
+Checkpoints - модуль контрольных точек сценариев для продолжения после сбоя
+"""
+
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .page_waiter import PageWaiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_CONFIG = {
+    'enabled': False,
+    'directory': 'checkpoints',
+    'retries': 1,  # Повторов упавшего шага с последней контрольной точки
+    'max_age': 6 * 3600  # Более старые контрольные точки не используются, сек
+}
+
+# Поля Network.Cookie, которые принимает Network.setCookies
+COOKIE_PARAMS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires',
+                 'priority', 'sourceScheme', 'sourcePort', 'partitionKey')
+
+CAPTURE_STORAGE_SCRIPT = """
+try {
+    var data = {};
+    for (var i = 0; i < localStorage.length; i++) {
+        var key = localStorage.key(i);
+        data[key] = localStorage.getItem(key);
+    }
+    return data;
+} catch (e) {
+    return null;
+}
+"""
+
+RESTORE_STORAGE_SCRIPT = """
+var data = arguments[0];
+try {
+    localStorage.clear();
+    Object.keys(data).forEach(function (key) {
+        localStorage.setItem(key, data[key]);
+    });
+    return true;
+} catch (e) {
+    return false;
+}
+"""
+
+def capture_browser_state(driver: WebDriver) -> Dict[str, Any]:
+    """Снимок состояния браузера: адрес, cookies всех доменов и localStorage страницы"""
+    try:
+        cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+    except Exception:
+        cookies = driver.get_cookies()
+
+    return {
+        'url': driver.current_url,
+        'cookies': cookies,
+        'local_storage': driver.execute_script(CAPTURE_STORAGE_SCRIPT),
+        'captured_at': time.time()
+    }
+
+def restore_browser_state(driver: WebDriver, state: Dict[str, Any], waiter: Optional[PageWaiter] = None):
+    """Восстановление состояния из снимка (cookies до перехода, localStorage - до перезагрузки)"""
+    waiter = waiter or PageWaiter()
+
+    cookies = []
+    for cookie in state['cookies']:
+        param = {key: cookie[key] for key in COOKIE_PARAMS if key in cookie}
+        # Сессионные cookies приходят с expires = -1
+        if cookie.get('session') or param.get('expires', 0) < 0:
+            param.pop('expires', None)
+        cookies.append(param)
+
+    driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    if cookies:
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+
+    driver.get(state['url'])
+    waiter.wait_for_page(driver)
+
+    # localStorage доступен только на странице своего origin
+    if state.get('local_storage'):
+        driver.execute_script(RESTORE_STORAGE_SCRIPT, state['local_storage'])
+        driver.refresh()
+        waiter.wait_for_page(driver)
+
+    logger.info(f"Состояние восстановлено: {state['url']}")
+
+class ScenarioCheckpoint:
+    """Контрольные точки одного сценария
+
+    После каждого успешного шага сохраняется его результат. Снимок состояния
+    браузера сохраняется только после шагов, состояние которых переживает
+    перезагрузку страницы (переход на новую страницу); незавершенная форма
+    (введенный текст, даты) в снимок не попадает, и такие шаги выполняются заново.
+    """
+
+    def __init__(self, path: Path, fingerprint: str, max_age: float):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.data = {'fingerprint': fingerprint, 'steps': [], 'resume': None}
+
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+                resume = saved.get('resume')
+                if (saved.get('fingerprint') == fingerprint and resume
+                        and time.time() - resume['state']['captured_at'] <= max_age):
+                    # Шаги после последней точки (прогон упал раньше восстановимого шага) не учитываются
+                    saved['steps'] = saved.get('steps', [])[:resume['completed']]
+                    self.data = saved
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Контрольная точка {path} повреждена: {e}")
+
+    @property
+    def has_progress(self) -> bool:
+        """Есть ли сохраненные шаги"""
+        return bool(self.data['resume'] and self.data['resume']['completed'])
+
+    def start(self, state: Dict[str, Any]):
+        """Начальная точка сценария (если продолжать не с чего)"""
+        if not self.data['resume']:
+            self.data['resume'] = {'completed': 0, 'state': state}
+        self.data['steps'] = self.data['steps'][:self.data['resume']['completed']]
+        self._save()
+
+    def record(self, step: Dict[str, Any], state: Optional[Dict[str, Any]] = None):
+        """Сохранение успешного шага (и снимка, если шаг восстановим)"""
+        self.data['steps'].append(step)
+        if state:
+            self.data['resume'] = {'completed': len(self.data['steps']), 'state': state}
+        self._save()
+
+    def resume_point(self) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Шаги до последней восстановимой точки и снимок состояния после них"""
+        resume = self.data['resume']
+        if not resume:
+            return [], None
+
+        # Шаги после точки будут выполнены заново
+        self.data['steps'] = self.data['steps'][:resume['completed']]
+        return list(self.data['steps']), resume['state']
+
+    def clear(self):
+        """Удаление контрольной точки после успешного завершения сценария"""
+        self.path.unlink(missing_ok=True)
+
+    def _save(self):
+        """Запись на диск (через временный файл, чтобы не оставить половину JSON)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, default=str)
+        temp_path.replace(self.path)
+
+class CheckpointStore:
+    """Хранилище контрольных точек сценариев на диске"""
+
+    def __init__(self, checkpoint_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_CHECKPOINT_CONFIG, **(checkpoint_config or {})}
+        self.directory = Path(self.settings['directory'])
+
+    @property
+    def retries(self) -> int:
+        """Повторов упавшего шага"""
+        return self.settings['retries']
+
+    def open(self, kind: str, identity: Dict[str, Any]) -> ScenarioCheckpoint:
+        """Контрольная точка сценария; одинаковые параметры продолжают прошлый прогон"""
+        fingerprint = hashlib.sha1(
+            json.dumps(identity, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()[:16]
+        return ScenarioCheckpoint(self.directory / f'{kind}_{fingerprint}.json', fingerprint, self.settings['max_age'])
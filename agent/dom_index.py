@@ -0,0 +1,180 @@
+"""
+DOM Index - модуль индексации документа за один обход дерева
+"""
+
+import re
+import bisect
+import logging
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Pattern, Union
+from bs4 import BeautifulSoup, Tag
+
+logger = logging.getLogger(__name__)
+
+class NodeList(list):
+    """Результат запроса к индексу: элементы вместе с их номерами в документе"""
+
+    def __init__(self, elements: Iterable[Tag] = (), positions: Optional[List[int]] = None):
+        super().__init__(elements)
+        self.positions = positions if positions is not None else []
+
+class DOMIndex:
+    """Индекс элементов документа по тегу, классу и атрибуту
+
+    Элементы - узлы BeautifulSoup или lxml.html; у обоих есть get() для атрибутов.
+    Документ обходится один раз; каждый элемент получает номер в порядке
+    документа и границу своего поддерева. Поиск по шаблону класса проверяет
+    уникальные классы (их намного меньше, чем элементов), а поиск внутри
+    элемента - бинарный поиск по номерам, без повторного обхода поддерева.
+    """
+
+    def __init__(self, document: Any):
+        self.elements: List[Any] = []
+        self.tags: Dict[str, List[int]] = {}
+        self.classes: Dict[str, List[int]] = {}
+        self.attributes: Dict[str, List[int]] = {}
+        self._positions: Dict[int, int] = {}
+        self._ends: List[int] = []
+        self._pattern_cache: Dict[Any, List[int]] = {}
+        self._text_cache: Dict[int, str] = {}
+
+        # BeautifulSoup или дерево lxml.html (см. PageParser)
+        self._is_soup = isinstance(document, Tag)
+        self._build(self._soup_nodes(document) if self._is_soup else self._lxml_nodes(document))
+
+    def _build(self, nodes: Iterable[tuple]):
+        """Обход документа в прямом порядке с расчетом границ поддеревьев"""
+        open_elements = []
+
+        for element, name, parent, attrs in nodes:
+            position = len(self.elements)
+            # Закрываем элементы, которые не являются предками текущего
+            while open_elements and self.elements[open_elements[-1]] is not parent:
+                self._ends[open_elements.pop()] = position
+
+            self.elements.append(element)
+            self._ends.append(position + 1)
+            self._positions[id(element)] = position
+            open_elements.append(position)
+
+            self.tags.setdefault(name, []).append(position)
+            for attr_name, value in attrs:
+                self.attributes.setdefault(attr_name, []).append(position)
+                if attr_name == 'class':
+                    for class_name in (value if isinstance(value, list) else str(value).split()):
+                        self.classes.setdefault(class_name, []).append(position)
+
+        for position in open_elements:
+            self._ends[position] = len(self.elements)
+
+    @staticmethod
+    def _soup_nodes(soup: BeautifulSoup) -> Iterator[tuple]:
+        """Элементы BeautifulSoup: (элемент, тег, родитель, пары атрибутов)"""
+        for element in soup.descendants:
+            if isinstance(element, Tag):
+                yield element, element.name, element.parent, element.attrs.items()
+
+    @staticmethod
+    def _lxml_nodes(root: Any) -> Iterator[tuple]:
+        """Элементы lxml (комментарии и инструкции пропускаются)"""
+        for element in root.iter():
+            if isinstance(element.tag, str):
+                yield element, element.tag, element.getparent(), element.items()
+
+    @property
+    def size(self) -> int:
+        """Количество элементов"""
+        return len(self.elements)
+
+    def by_tag(self, *names: str) -> NodeList:
+        """Элементы с любым из тегов (в порядке документа)"""
+        return self._resolve(self._tag_positions(names))
+
+    def by_class(self, pattern: Union[str, Pattern]) -> NodeList:
+        """Элементы, у которых хотя бы один класс подходит под шаблон (аналог class_=re.compile(...))"""
+        return self._resolve(self._class_positions(pattern))
+
+    def with_attr(self, name: str, pattern: Union[str, Pattern, None] = None, tag: Optional[str] = None) -> NodeList:
+        """Элементы с атрибутом (значение - по шаблону, если указан)"""
+        positions = self.attributes.get(name, [])
+        if tag:
+            tag_positions = set(self.tags.get(tag, []))
+            positions = [position for position in positions if position in tag_positions]
+        if pattern is not None:
+            regex = re.compile(pattern) if isinstance(pattern, str) else pattern
+            positions = [position for position in positions
+                         if regex.search(self.attr_text(self.elements[position].get(name)))]
+        return self._resolve(positions)
+
+    def first(self, elements: List[Tag]) -> Optional[Tag]:
+        """Первый элемент списка или None"""
+        return elements[0] if elements else None
+
+    def within(self, container: Tag, elements: List[Tag]) -> NodeList:
+        """Элементы из результата запроса, лежащие внутри container (бинарный поиск)"""
+        positions = self._positions_of(elements)
+        start, end = self._range(container)
+        return self._resolve(positions[bisect.bisect_right(positions, start):bisect.bisect_left(positions, end)])
+
+    def first_within(self, container: Tag, elements: List[Tag]) -> Optional[Tag]:
+        """Первый элемент из результата запроса внутри container"""
+        positions = self._positions_of(elements)
+        start, end = self._range(container)
+        index = bisect.bisect_right(positions, start)
+        return self.elements[positions[index]] if index < len(positions) and positions[index] < end else None
+
+    def text(self, element: Tag) -> str:
+        """Текст элемента без пробелов по краям (вычисляется один раз)"""
+        key = id(element)
+        if key not in self._text_cache:
+            self._text_cache[key] = (element.get_text() if self._is_soup else element.text_content()).strip()
+        return self._text_cache[key]
+
+    def texts(self, elements: Iterable[Tag]) -> List[str]:
+        """Непустые тексты элементов"""
+        return [text for text in (self.text(element) for element in elements) if text]
+
+    def class_list(self, element: Tag) -> List[str]:
+        """Классы элемента"""
+        value = element.get('class', [])
+        return value if isinstance(value, list) else str(value).split()
+
+    def _tag_positions(self, names: Iterable[str]) -> List[int]:
+        """Номера элементов с тегами"""
+        names = tuple(names)
+        if len(names) == 1:
+            return self.tags.get(names[0], [])
+        return sorted(position for name in names for position in self.tags.get(name, []))
+
+    def _class_positions(self, pattern: Union[str, Pattern]) -> List[int]:
+        """Номера элементов с подходящим классом (результат кэшируется по шаблону)"""
+        key = pattern.pattern if hasattr(pattern, 'pattern') else pattern
+        if key not in self._pattern_cache:
+            regex = re.compile(pattern) if isinstance(pattern, str) else pattern
+            matched = set()
+            for class_name, positions in self.classes.items():
+                if regex.search(class_name):
+                    matched.update(positions)
+            self._pattern_cache[key] = sorted(matched)
+        return self._pattern_cache[key]
+
+    def _range(self, element: Tag) -> tuple:
+        """Номер элемента и граница его поддерева"""
+        position = self._positions[id(element)]
+        return position, self._ends[position]
+
+    def _resolve(self, positions: List[int]) -> NodeList:
+        """Элементы по номерам"""
+        return NodeList((self.elements[position] for position in positions), positions)
+
+    def _positions_of(self, elements: List[Tag]) -> List[int]:
+        """Номера элементов в порядке документа"""
+        if isinstance(elements, NodeList):
+            return elements.positions
+        return sorted(self._positions[id(element)] for element in elements)
+
+    @staticmethod
+    def attr_text(value: Any) -> str:
+        """Значение атрибута строкой (многозначные атрибуты bs4 - списки)"""
+        if value is None:
+            return ''
+        return ' '.join(value) if isinstance(value, list) else str(value)
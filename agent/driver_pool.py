@@ -0,0 +1,281 @@
+"""
+Driver Pool - модуль пула заранее запущенных веб-драйверов
+"""
+
+import time
+import atexit
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .browser import create_chrome_driver
+
+logger = logging.getLogger(__name__)
+
+class DriverPool:
+    """Пул "тёплых" экземпляров Chrome, общий для нескольких исследований"""
+
+    def __init__(self, config: Dict[str, Any], headless: bool = True):
+        pool_config = config['browser'].get('pool', {})
+
+        self.config = config
+        self.headless = headless
+        self.min_size = pool_config.get('min_size', 1)
+        self.max_size = pool_config.get('max_size', 4)
+        self.max_uses = pool_config.get('max_uses', 50)
+        self.acquire_timeout = pool_config.get('acquire_timeout', 120)
+
+        self._idle = deque()
+        self._in_use = {}
+        self._creating = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {
+            'created': 0,
+            'reused': 0,
+            'discarded': 0,
+            'wait_time': 0.0
+        }
+
+    def warm_up(self, count: Optional[int] = None):
+        """Предварительный запуск драйверов"""
+        count = min(count or self.min_size, self.max_size)
+
+        while True:
+            with self._condition:
+                if self._closed or self._total() >= count:
+                    return
+                self._creating += 1
+
+            entry = self._create_entry()
+
+            with self._condition:
+                if entry:
+                    self._idle.append(entry)
+                self._condition.notify()
+
+            if not entry:
+                return
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """Получение драйвера из пула"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        start_time = time.time()
+
+        while True:
+            entry = None
+            create = False
+
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Пул драйверов закрыт")
+
+                if self._idle:
+                    entry = self._idle.popleft()
+                elif self._total() < self.max_size:
+                    self._creating += 1
+                    create = True
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Нет свободных драйверов в пуле (лимит {self.max_size})")
+                    self._condition.wait(remaining)
+                    continue
+
+            if create:
+                entry = self._create_entry(raise_errors=True)
+            elif not self._is_healthy(entry['driver']):
+                logger.warning("Драйвер из пула не прошел проверку, заменяю новым")
+                self._quit(entry)
+                with self._condition:
+                    self._condition.notify()
+                continue
+            else:
+                with self._condition:
+                    self._stats['reused'] += 1
+
+            entry['uses'] += 1
+            with self._condition:
+                self._in_use[id(entry['driver'])] = entry
+                self._stats['wait_time'] += time.time() - start_time
+
+            return entry['driver']
+
+    def release(self, driver: WebDriver, discard: bool = False):
+        """Возврат драйвера в пул"""
+        with self._condition:
+            entry = self._in_use.pop(id(driver), None)
+
+        if entry is None:
+            logger.warning("Попытка вернуть в пул чужой драйвер")
+            return
+
+        reusable = (not discard
+                    and not self._closed
+                    and entry['uses'] < self.max_uses
+                    and self._reset(driver))
+
+        with self._condition:
+            if reusable and not self._closed:
+                self._idle.append(entry)
+                self._condition.notify()
+                return
+            self._condition.notify()
+
+        self._quit(entry)
+
+    @contextmanager
+    def borrow(self, timeout: Optional[float] = None):
+        """Контекстный менеджер для временного использования драйвера"""
+        driver = self.acquire(timeout)
+        discard = False
+        try:
+            yield driver
+        except Exception:
+            discard = not self._is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, discard=discard)
+
+    def close(self):
+        """Закрытие всех драйверов пула"""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+
+        for entry in idle:
+            self._quit(entry)
+
+        logger.info("Пул драйверов закрыт")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика использования пула"""
+        with self._condition:
+            return {
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'max_size': self.max_size,
+                **self._stats
+            }
+
+    def _total(self) -> int:
+        """Общее количество драйверов (вызывается под блокировкой)"""
+        return len(self._idle) + len(self._in_use) + self._creating
+
+    def _create_entry(self, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
+        """Запуск нового драйвера (слот уже зарезервирован)"""
+        try:
+            start_time = time.time()
+            driver = create_chrome_driver(self.config, self.headless)
+            logger.info(f"Новый драйвер для пула запущен за {time.time() - start_time:.2f} сек")
+
+            with self._condition:
+                self._stats['created'] += 1
+            return {
+                'driver': driver,
+                'created_at': time.time(),
+                'uses': 0
+            }
+
+        except Exception as e:
+            logger.error(f"Ошибка при запуске драйвера для пула: {e}")
+            if raise_errors:
+                raise
+            return None
+
+        finally:
+            with self._condition:
+                self._creating -= 1
+
+    def _is_healthy(self, driver: WebDriver) -> bool:
+        """Проверка работоспособности драйвера"""
+        try:
+            return driver.execute_script('return 1') == 1 and len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def _reset(self, driver: WebDriver) -> bool:
+        """Сброс состояния браузера между использованиями"""
+        try:
+            # Источники, данные которых мог оставить прошлый владелец: история вкладок и cookies
+            origins = set()
+            handles = driver.window_handles
+            for handle in reversed(handles):
+                driver.switch_to.window(handle)
+                origins.update(self._visited_origins(driver))
+                if handle != handles[0]:
+                    # Закрытие лишних вкладок
+                    driver.close()
+            driver.switch_to.window(handles[0])
+
+            for cookie in driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']:
+                domain = cookie['domain'].lstrip('.')
+                origins.update({f'https://{domain}', f'http://{domain}'})
+
+            driver.get('about:blank')
+
+            # localStorage, IndexedDB, Cache Storage и service workers всех посещенных источников
+            for origin in origins:
+                try:
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+                except Exception as e:
+                    logger.debug(f"Не удалось очистить данные {origin}: {e}")
+
+            # Очистка cookies всех доменов и HTTP-кэша
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+
+            return True
+
+        except Exception as e:
+            logger.warning(f"Не удалось сбросить состояние драйвера: {e}")
+            return False
+
+    @staticmethod
+    def _visited_origins(driver: WebDriver) -> set:
+        """Источники (scheme://host) из истории переходов текущей вкладки"""
+        history = driver.execute_cdp_cmd('Page.getNavigationHistory', {})
+        origins = set()
+        for entry in history.get('entries', []):
+            parts = urlsplit(entry.get('url', ''))
+            if parts.scheme in ('http', 'https') and parts.netloc:
+                origins.add(f'{parts.scheme}://{parts.netloc}')
+        return origins
+
+    def _quit(self, entry: Dict[str, Any]):
+        """Завершение работы драйвера"""
+        with self._condition:
+            self._stats['discarded'] += 1
+        try:
+            entry['driver'].quit()
+        except Exception as e:
+            logger.warning(f"Ошибка при закрытии драйвера: {e}")
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+def get_shared_pool(config: Dict[str, Any], headless: bool = True) -> DriverPool:
+    """Общий пул драйверов процесса"""
+    global _shared_pool
+
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool(config, headless=headless)
+            atexit.register(shutdown_shared_pool)
+        return _shared_pool
+
+def shutdown_shared_pool():
+    """Закрытие общего пула драйверов"""
+    global _shared_pool
+
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
+            _shared_pool = None
@@ -0,0 +1,180 @@
+"""
+Driver Resolver - модуль поиска chromedriver без обращения к сети
+"""
+
+import re
+import json
+import time
+import shutil
+import logging
+import platform
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+VERSION_PATTERN = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+CHROME_CANDIDATES = {
+    'Linux': ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'],
+    'Darwin': ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+               '/Applications/Chromium.app/Contents/MacOS/Chromium'],
+    'Windows': [r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+                r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe']
+}
+
+def chrome_binaries(chrome_binary: Optional[str] = None) -> Iterator[str]:
+    """Установленные исполняемые файлы Chrome (явно указанный или стандартные для ОС)"""
+    candidates = [chrome_binary] if chrome_binary else CHROME_CANDIDATES.get(platform.system(), [])
+
+    for candidate in candidates:
+        binary = shutil.which(candidate) or (candidate if Path(candidate).exists() else None)
+        if binary:
+            yield binary
+
+def find_chrome_binary(chrome_binary: Optional[str] = None) -> Optional[str]:
+    """Путь к установленному Chrome (первый найденный)"""
+    return next(chrome_binaries(chrome_binary), None)
+
+class ChromeDriverResolver:
+    """Определение пути к chromedriver с локальным кэшем по версии Chrome"""
+
+    def __init__(self, driver_config: Dict[str, Any]):
+        self.cache_dir = Path(driver_config['cache_dir']).expanduser()
+        self.cache_file = self.cache_dir / 'drivers.json'
+        self.offline = driver_config.get('offline', False)
+        self.chromedriver_path = driver_config.get('chromedriver_path')
+        self.chrome_binary = driver_config.get('chrome_binary')
+
+    def resolve(self) -> Dict[str, Any]:
+        """Определение пути к chromedriver"""
+        start_time = time.time()
+
+        resolution = self._resolve()
+        resolution['duration'] = time.time() - start_time
+
+        logger.info(f"chromedriver: {resolution['path']} "
+                    f"(источник: {resolution['source']}, {resolution['duration']:.3f} сек)")
+
+        return resolution
+
+    def _resolve(self) -> Dict[str, Any]:
+        """Последовательная проверка источников chromedriver"""
+
+        # Явно указанный путь имеет приоритет
+        if self.chromedriver_path:
+            if not Path(self.chromedriver_path).exists():
+                raise RuntimeError(f"chromedriver не найден по пути {self.chromedriver_path}")
+            return {
+                'path': self.chromedriver_path,
+                'chrome_version': None,
+                'driver_version': self.get_binary_version(self.chromedriver_path),
+                'source': 'explicit'
+            }
+
+        chrome_version = self.detect_chrome_version()
+        if not chrome_version:
+            raise RuntimeError("Не удалось определить версию Chrome")
+        major = chrome_version.split('.')[0]
+
+        # Закэшированный драйвер для этой версии Chrome
+        cache = self._load_cache()
+        cached = cache.get(major)
+        if cached and Path(cached['path']).exists():
+            driver_version = self.get_binary_version(cached['path'])
+            if driver_version and driver_version.split('.')[0] == major:
+                return {
+                    'path': cached['path'],
+                    'chrome_version': chrome_version,
+                    'driver_version': driver_version,
+                    'source': 'cache'
+                }
+            logger.warning(f"Закэшированный chromedriver {cached['path']} не совместим с Chrome {chrome_version}")
+
+        # chromedriver, установленный в системе
+        system_driver = shutil.which('chromedriver')
+        if system_driver:
+            driver_version = self.get_binary_version(system_driver)
+            if driver_version and driver_version.split('.')[0] == major:
+                self._store(cache, major, system_driver, driver_version)
+                return {
+                    'path': system_driver,
+                    'chrome_version': chrome_version,
+                    'driver_version': driver_version,
+                    'source': 'system'
+                }
+
+        if self.offline:
+            raise RuntimeError(f"Нет совместимого chromedriver для Chrome {chrome_version} "
+                               f"в кэше {self.cache_dir}, а загрузка отключена (offline)")
+
+        # Однократная загрузка, дальше драйвер берется из кэша
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        driver_path = ChromeDriverManager().install()
+        driver_version = self.get_binary_version(driver_path)
+        self._store(cache, major, driver_path, driver_version)
+
+        return {
+            'path': driver_path,
+            'chrome_version': chrome_version,
+            'driver_version': driver_version,
+            'source': 'download'
+        }
+
+    def detect_chrome_version(self) -> Optional[str]:
+        """Определение версии установленного Chrome"""
+        for binary in chrome_binaries(self.chrome_binary):
+            version = self.get_binary_version(binary)
+            if version:
+                return version
+
+        return None
+
+    def get_binary_version(self, binary: str) -> Optional[str]:
+        """Получение версии исполняемого файла через --version"""
+        try:
+            output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+            match = VERSION_PATTERN.search(output)
+            return match.group() if match else None
+        except Exception as e:
+            logger.warning(f"Не удалось получить версию {binary}: {e}")
+            return None
+
+    def _load_cache(self) -> Dict[str, Any]:
+        """Чтение кэша драйверов"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, cache: Dict[str, Any], major: str, path: str, driver_version: Optional[str]):
+        """Запись драйвера в кэш"""
+        cache[major] = {
+            'path': str(path),
+            'driver_version': driver_version,
+            'resolved_at': time.time()
+        }
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить кэш chromedriver: {e}")
+
+_resolved = {}
+_resolve_lock = threading.Lock()
+
+def resolve_chromedriver(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Путь к chromedriver, проверяемый один раз на процесс"""
+    driver_config = config['browser']['driver']
+    key = json.dumps(driver_config, sort_keys=True, default=str)
+
+    with _resolve_lock:
+        if key not in _resolved:
+            _resolved[key] = ChromeDriverResolver(driver_config).resolve()
+        return _resolved[key]
@@ -0,0 +1,98 @@
+"""
+Element Lookup - модуль поиска элементов с явным бюджетом ожидания
+"""
+
+import time
+import logging
+import weakref
+from typing import Dict, Any, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOOKUP_CONFIG = {
+    'required_timeout': 10,
+    'poll_interval': 0.1
+}
+
+class ElementLookup:
+    """Поиск элементов без неявного ожидания драйвера
+
+    Необязательные элементы ищутся без ожидания (один запрос), обязательные -
+    с явным таймаутом. Время, потраченное на промахи, учитывается по шагам.
+    """
+
+    def __init__(self, lookup_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_LOOKUP_CONFIG, **(lookup_config or {})}
+        self.records = []
+        self._prepared = weakref.WeakSet()
+
+    def find_optional(self, driver: WebDriver, selector: str, by: str = By.CSS_SELECTOR) -> List[WebElement]:
+        """Поиск необязательных элементов без ожидания"""
+        self._prepare(driver)
+        start_time = time.time()
+
+        elements = driver.find_elements(by, selector)
+
+        self._record(selector, bool(elements), time.time() - start_time, required=False)
+        return elements
+
+    def find_first(self, driver: WebDriver, selector: str, by: str = By.CSS_SELECTOR) -> Optional[WebElement]:
+        """Первый необязательный элемент или None"""
+        elements = self.find_optional(driver, selector, by)
+        return elements[0] if elements else None
+
+    def find_required(self, driver: WebDriver, selector: str, timeout: Optional[float] = None,
+                      by: str = By.CSS_SELECTOR) -> WebElement:
+        """Поиск обязательного элемента с ограниченным ожиданием"""
+        self._prepare(driver)
+        timeout = self.settings['required_timeout'] if timeout is None else timeout
+        deadline = time.time() + timeout
+        start_time = time.time()
+
+        while True:
+            elements = driver.find_elements(by, selector)
+            if elements:
+                self._record(selector, True, time.time() - start_time, required=True)
+                return elements[0]
+
+            if time.time() >= deadline:
+                self._record(selector, False, time.time() - start_time, required=True)
+                raise TimeoutException(f"Элемент {selector} не найден за {timeout} сек")
+
+            time.sleep(self.settings['poll_interval'])
+
+    def pop_records(self) -> List[Dict[str, Any]]:
+        """Записи о поисках с момента предыдущего вызова"""
+        records, self.records = self.records, []
+        return records
+
+    @staticmethod
+    def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Сводка по поискам шага"""
+        misses = [record for record in records if not record['found']]
+
+        return {
+            'lookups': len(records),
+            'misses': len(misses),
+            'miss_wait_time': round(sum(record['waited'] for record in misses), 3),
+            'missed_selectors': [record['selector'] for record in misses]
+        }
+
+    def _prepare(self, driver: WebDriver):
+        """Отключение неявного ожидания драйвера (один раз на драйвер)"""
+        if driver not in self._prepared:
+            driver.implicitly_wait(0)
+            self._prepared.add(driver)
+
+    def _record(self, selector: str, found: bool, waited: float, required: bool):
+        """Сохранение записи о поиске"""
+        self.records.append({
+            'selector': selector,
+            'found': found,
+            'waited': round(waited, 3),
+            'required': required
+        })
@@ -0,0 +1,579 @@
+"""
+Filter Explorer - модуль проверки фильтров выдачи в параллельных вкладках
+"""
+
+import re
+import time
+import logging
+from itertools import combinations as subsets
+from typing import Dict, Any, List, Optional, Sequence, Tuple, FrozenSet
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .browser_contexts import BrowserContextManager, TabScheduler, page_loaded, dom_quiet
+from .har_archive import normalize_url
+from .price_stats import parse_prices, describe_prices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPLORATION_CONFIG = {
+    'parallel_tabs': 0,  # 0 - фильтры применяются по очереди на одной странице
+    'task_timeout': 60,  # Ограничение времени одной комбинации, сек
+    'quiet_time': 0.3,  # Выдача считается обновленной после такого затишья DOM, сек
+    'poll_interval': 0.1,
+    'max_combination_size': 6,  # Глубина перебора комбинаций требований
+    'max_combinations': 128,  # Ограничение числа проверяемых комбинаций за один перебор
+    'ignore_query_params': ['_', 'ts', 'timestamp', 'rnd', 'utm_source', 'utm_medium', 'utm_campaign']
+}
+
+# Фильтры, которые проверяет сценарий фильтрации: кандидаты селекторов,
+# текст нужного варианта (для групп) или значение (для полей ввода)
+FILTER_CONTROLS = {
+    'price': {
+        'selectors': ['.price-range input', '.price-filter input', 'input[type="range"]'],
+        'value': '5000'
+    },
+    'stars': {
+        'selectors': ['.star-filter .filter-option', '.rating-filter .filter-option',
+                      '[data-filter="stars"] .filter-option', '.star-filter', '.rating-filter'],
+        'text': ['4']
+    },
+    'amenities': {
+        'selectors': ['.amenity-filter', '.facility-filter', '[data-filter="amenities"] .filter-option'],
+        'text': ['wi-fi', 'wifi']
+    }
+}
+
+# Ключевые слова, по которым требование сценария сопоставляется с вариантом фильтра
+REQUIREMENT_KEYWORDS = {
+    'cancellation': ['отмен', 'cancel'],
+    'ski_storage': ['лыжехранил', 'ski storage', 'ski room'],
+    'ski_equipment': ['прокат', 'снаряжен', 'equipment', 'rental'],
+    'transfer_to_lift': ['трансфер', 'transfer', 'shuttle'],
+    'distance_to_lift': ['подъемник', 'ski-in', 'lift'],
+    'restaurant': ['ресторан', 'restaurant'],
+    'spa': ['спа', 'spa'],
+    'pool': ['бассейн', 'pool']
+}
+
+DEFAULT_FILTER_COMBINATIONS = [
+    ('price',),
+    ('stars',),
+    ('amenities',),
+    ('price', 'stars'),
+    ('stars', 'amenities'),
+    ('price', 'stars', 'amenities')
+]
+
+# Применение одного фильтра за один запрос к драйверу; поле ввода заполняется
+# через нативный сеттер, чтобы обработчики фреймворка увидели изменение
+APPLY_FILTER_SCRIPT = """
+var selectors = arguments[0], texts = arguments[1] || [], value = arguments[2];
+
+function visible(element) {
+    var rect = element.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+for (var i = 0; i < selectors.length; i++) {
+    var nodes;
+    try {
+        nodes = Array.prototype.filter.call(document.querySelectorAll(selectors[i]), visible);
+    } catch (e) {
+        continue;
+    }
+    if (!nodes.length) {
+        continue;
+    }
+
+    var element = nodes[0];
+    if (texts.length) {
+        element = null;
+        for (var j = 0; j < nodes.length && !element; j++) {
+            var text = nodes[j].textContent.toLowerCase();
+            if (texts.some(function (token) { return text.indexOf(token) >= 0; })) {
+                element = nodes[j];
+            }
+        }
+        if (!element) {
+            continue;
+        }
+    }
+
+    if (value !== null && value !== undefined && 'value' in element && element.tagName === 'INPUT') {
+        Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(element, value);
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+    } else {
+        element.click();
+    }
+    return {selector: selectors[i], text: element.textContent.trim().slice(0, 80)};
+}
+return null;
+"""
+
+# Состояние выдачи после фильтров: хэш карточек позволяет узнать уже виденную страницу
+RESULT_PAGE_SCRIPT = """
+var cards = document.querySelectorAll('.hotel-card, .hotel-item, .result-item');
+var hash = 5381;
+for (var i = 0; i < cards.length; i++) {
+    var text = cards[i].textContent;
+    for (var j = 0; j < text.length; j++) {
+        hash = ((hash << 5) + hash + text.charCodeAt(j)) | 0;
+    }
+}
+return {
+    url: location.href,
+    hotels_count: cards.length,
+    active_filters_count: document.querySelectorAll('.active-filter, .applied-filter').length,
+    dom_hash: (hash >>> 0).toString(16) + ':' + cards.length
+};
+"""
+
+# Данные карточек для анализа страницы (выполняется только для новых страниц)
+HOTEL_CARDS_SCRIPT = """
+var cards = document.querySelectorAll('.hotel-card, .hotel-item, .result-item');
+return Array.prototype.map.call(cards, function (card) {
+    var name = card.querySelector('.hotel-name, h3, h2');
+    var price = card.querySelector('.price, .cost');
+    return {
+        name: name ? name.textContent.trim() : '',
+        price: price ? price.textContent.trim() : ''
+    };
+});
+"""
+
+# Варианты фильтров на странице выдачи: вид, значение, подпись и селектор
+DISCOVER_OPTIONS_SCRIPT = """
+var options = [];
+var seen = {};
+
+function kindOf(element) {
+    if (element.dataset.kind) {
+        return element.dataset.kind;
+    }
+    var group = element.closest('[data-filter]');
+    return group ? group.dataset.filter : 'option';
+}
+
+function labelOf(element) {
+    var label = element.closest('label') || (element.id && document.querySelector('label[for="' + CSS.escape(element.id) + '"]'));
+    return (label || element).textContent.replace(/\\s+/g, ' ').trim();
+}
+
+document.querySelectorAll('.filter-option, .filter input[type="checkbox"], .facet input[type="checkbox"], ' +
+                          '[data-filter] input[type="checkbox"]').forEach(function (element) {
+    var kind = kindOf(element), label = labelOf(element);
+    var value = element.dataset.value || (element.type === 'checkbox' ? element.value : '') || label;
+    var selector = null;
+    if (element.dataset.kind && element.dataset.value) {
+        selector = '[data-kind="' + CSS.escape(element.dataset.kind) + '"][data-value="' + CSS.escape(element.dataset.value) + '"]';
+    } else if (element.id) {
+        selector = '#' + CSS.escape(element.id);
+    }
+    var key = kind + ':' + value;
+    if (!seen[key] && label) {
+        seen[key] = true;
+        options.push({kind: kind, value: value, label: label, selector: selector});
+    }
+});
+
+var price = document.querySelector('.price-range input, .price-filter input, input[type="range"]');
+if (price) {
+    options.push({kind: 'price', value: null, label: 'price', selector: null,
+                  min: price.min ? Number(price.min) : null, max: price.max ? Number(price.max) : null});
+}
+return options;
+"""
+
+def parse_number(text: Any) -> Optional[int]:
+    """Первое число в тексте требования ('до 10 000 рублей' -> 10000)"""
+    match = re.search(r'\d[\d\s]*', str(text))
+    return int(re.sub(r'\s', '', match.group())) if match else None
+
+def map_requirements(requirements: Dict[str, Any], options: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Сопоставление требований сценария с вариантами фильтров страницы"""
+    atoms, unmapped = {}, []
+
+    def option_atom(option: Dict[str, Any]) -> Dict[str, Any]:
+        atom = {'name': f"{option['kind']}:{option['value']}"}
+        if option['selector']:
+            atom['selectors'] = [option['selector']]
+        else:
+            atom['selectors'] = ['.filter-option', '.filter input[type="checkbox"]', '.facet input[type="checkbox"]']
+            atom['text'] = [option['label'].lower()]
+        return atom
+
+    for key, requirement in requirements.items():
+        if requirement is False or requirement is None:
+            continue
+
+        atom = None
+        if key == 'stars':
+            stars = parse_number(requirement)
+            for option in options:
+                if option['kind'] in ('stars', 'rating') and stars is not None and (
+                        str(option['value']) == str(stars) or str(stars) in option['label']):
+                    atom = option_atom(option)
+                    break
+
+        elif key == 'price_limit':
+            limit = parse_number(requirement)
+            price = next((option for option in options if option['kind'] == 'price'), None)
+            if price and limit:
+                atom = {'name': f'price<={limit}', 'selectors': FILTER_CONTROLS['price']['selectors'],
+                        'value': str(limit)}
+
+        else:
+            keywords = REQUIREMENT_KEYWORDS.get(key, [])
+            for option in options:
+                label = option['label'].lower()
+                if any(keyword in label for keyword in keywords):
+                    atom = option_atom(option)
+                    break
+
+        if atom:
+            atoms[key] = atom
+        else:
+            unmapped.append(key)
+
+    return {'atoms': atoms, 'unmapped': unmapped}
+
+class ResultPageCache:
+    """Анализ страниц выдачи по каноническому URL и хэшу карточек
+
+    Комбинации, приводящие к той же странице (фильтр без эффекта, другой
+    порядок применения), не анализируются повторно.
+    """
+
+    def __init__(self, ignore_query_params: Sequence[str] = ()):
+        self.ignore_query_params = list(ignore_query_params)
+        self.pages = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, url: str, dom_hash: str) -> Tuple[str, str]:
+        """Ключ страницы"""
+        return normalize_url(url, self.ignore_query_params), dom_hash
+
+    def get(self, url: str, dom_hash: str) -> Optional[Dict[str, Any]]:
+        """Анализ ранее виденной страницы"""
+        analysis = self.pages.get(self.key(url, dom_hash))
+        if analysis is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return analysis
+
+    def put(self, url: str, dom_hash: str, analysis: Dict[str, Any]):
+        """Сохранение анализа страницы"""
+        self.pages[self.key(url, dom_hash)] = analysis
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика попаданий"""
+        return {'pages': len(self.pages), 'hits': self.hits, 'misses': self.misses}
+
+class FilterExplorer:
+    """Применение комбинаций фильтров к выдаче в отдельных вкладках
+
+    Страница выдачи открывается в N вкладках того же окна (общая сессия,
+    как при открытии ссылки в новой вкладке), каждая вкладка применяет
+    свою комбинацию. Вкладки обслуживаются TabScheduler: пока одна выдача
+    обновляется, драйвер применяет фильтры в остальных.
+    """
+
+    def __init__(self, exploration_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_EXPLORATION_CONFIG, **(exploration_config or {})}
+        self.page_cache = ResultPageCache(self.settings['ignore_query_params'])
+        # Результаты комбинаций по выдаче: повторная проверка не открывает вкладку
+        self.combination_cache = {}
+
+    def explore(self, driver: WebDriver, combinations: Optional[Sequence[Sequence[str]]] = None,
+                tabs: Optional[int] = None) -> Dict[str, Any]:
+        """Проверка комбинаций фильтров; текущая вкладка остается без изменений"""
+        combinations = [tuple(combination) for combination in (combinations or DEFAULT_FILTER_COMBINATIONS)]
+        results_url = driver.current_url
+        start_time = time.time()
+
+        jobs = {
+            self.combination_name(combination): (results_url, [{'name': name, **FILTER_CONTROLS[name]}
+                                                               for name in combination])
+            for combination in combinations
+        }
+        explored = self._run_jobs(driver, jobs, tabs)
+
+        return {
+            'results_url': results_url,
+            'tabs': self._tab_count(tabs, len(jobs)),
+            'combinations': explored,
+            'combinations_tested': len(explored),
+            'combinations_succeeded': len([result for result in explored.values() if result.get('success')]),
+            # Ошибки вкладок и ненайденные фильтры по комбинациям
+            'errors': {name: result.get('error') or f"Фильтры не найдены: {', '.join(result.get('missing', []))}"
+                       for name, result in explored.items() if not result.get('success')},
+            'combinations_with_results': len([result for result in explored.values()
+                                              if result.get('hotels_count')]),
+            'wall_time': round(time.time() - start_time, 3),
+            # Сумма времени вкладок - оценка времени последовательной проверки
+            'total_tab_time': round(sum(result.get('duration', 0) for result in explored.values()), 3)
+        }
+
+    def explore_requirements(self, driver: WebDriver, requirement_sets: Dict[str, Dict[str, Any]],
+                             tabs: Optional[int] = None) -> Dict[str, Any]:
+        """Перебор комбинаций фильтров для наборов требований сценариев
+
+        Требования сопоставляются с вариантами фильтров страницы, затем
+        комбинации проверяются по уровням (1, 2, ... фильтра). Комбинация
+        проверяется, только если все ее подмножества на единицу меньше дали
+        результаты: надмножество пустой выдачи тоже пусто.
+        """
+        results_url = driver.current_url
+        base_key = normalize_url(results_url, self.settings['ignore_query_params'])
+        start_time = time.time()
+
+        options = driver.execute_script(DISCOVER_OPTIONS_SCRIPT) or []
+        mappings = {name: map_requirements(requirements, options) for name, requirements in requirement_sets.items()}
+        atoms = {atom['name']: atom for mapping in mappings.values() for atom in mapping['atoms'].values()}
+        groups = [sorted({atom['name'] for atom in mapping['atoms'].values()}) for mapping in mappings.values()]
+
+        logger.info(f"Перебор фильтров для {len(requirement_sets)} наборов требований: "
+                    f"{len(atoms)} вариантов фильтров из {len(options)} на странице")
+
+        explored: Dict[FrozenSet[str], Dict[str, Any]] = {}
+        pruned = set()
+        skipped = set()
+        budget = self.settings['max_combinations']
+        max_size = self.settings['max_combination_size']
+
+        for size in range(1, max_size + 1):
+            candidates = set()
+            for group in groups:
+                for combination in subsets(group, size):
+                    combination = frozenset(combination)
+                    parents = [frozenset(parent) for parent in subsets(sorted(combination), size - 1)] if size > 1 else []
+                    # Отсекаются только надмножества выдачи, которая точно пуста; неудачная проверка
+                    # (таймаут, ошибка, фильтр не найден) ничего не говорит о надмножествах
+                    if any(parent in pruned or (parent in explored and explored[parent].get('success')
+                                                and not explored[parent].get('hotels_count'))
+                           for parent in parents):
+                        pruned.add(combination)
+                    elif all(parent in explored for parent in parents):
+                        candidates.add(combination)
+
+            candidates -= set(explored)
+            if not candidates:
+                break
+            if budget <= 0:
+                skipped.update(candidates)
+                break
+
+            ordered = sorted(candidates, key=sorted)
+            # Комбинации сверх бюджета не проверяются, но попадают в отчет
+            skipped.update(ordered[budget:])
+            jobs, job_combinations = {}, {}
+            for combination in ordered[:budget]:
+                cached = self.combination_cache.get((base_key, combination))
+                if cached:
+                    explored[combination] = {**cached, 'cached': True}
+                    continue
+                name = self.combination_name(sorted(combination))
+                jobs[name] = self._plan(results_url, combination, explored, atoms)
+                job_combinations[name] = combination
+
+            budget -= len(jobs)
+            for name, result in self._run_jobs(driver, jobs, tabs).items():
+                combination = job_combinations[name]
+                result['filters'] = sorted(combination)
+                explored[combination] = result
+                if result.get('success'):
+                    self.combination_cache[(base_key, combination)] = result
+
+        report = {
+            'results_url': results_url,
+            'filter_options': len(options),
+            'requirement_sets': {
+                name: self._requirement_report(requirement_sets[name], mapping, explored, pruned, skipped)
+                for name, mapping in mappings.items()
+            },
+            'combinations_tested': len([result for result in explored.values() if not result.get('cached')]),
+            'combinations_cached': len([result for result in explored.values() if result.get('cached')]),
+            'combinations_pruned': len(pruned),
+            'combinations_succeeded': len([result for result in explored.values() if result.get('success')]),
+            'combinations_failed': len([result for result in explored.values() if not result.get('success')]),
+            # Не проверены из-за ограничения max_combinations
+            'combinations_skipped': sorted(self.combination_name(sorted(combination)) for combination in skipped),
+            'page_cache': self.page_cache.get_stats(),
+            'wall_time': round(time.time() - start_time, 3)
+        }
+        return report
+
+    @staticmethod
+    def requirements_error(report: Dict[str, Any]) -> Optional[str]:
+        """Причина неудачи перебора по требованиям (None, если перебор удался)"""
+        if not report['combinations_succeeded']:
+            return 'Ни одна комбинация фильтров не применена'
+        if not any(item['satisfied'] for item in report['requirement_sets'].values()):
+            if report['combinations_skipped']:
+                return (f"Ни один набор требований не выполнен, не проверено комбинаций "
+                        f"(ограничение max_combinations): {len(report['combinations_skipped'])}")
+            return 'Ни один набор требований не выполним'
+        return None
+
+    @staticmethod
+    def combination_name(combination: Sequence[str]) -> str:
+        """Имя комбинации для отчета"""
+        return '+'.join(combination)
+
+    def _tab_count(self, tabs: Optional[int], jobs: int) -> int:
+        """Число одновременно открытых вкладок"""
+        return max(1, tabs or self.settings['parallel_tabs'] or jobs)
+
+    def _plan(self, results_url: str, combination: FrozenSet[str], explored: Dict[FrozenSet[str], Dict[str, Any]],
+              atoms: Dict[str, Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+        """Стартовая страница и фильтры для комбинации
+
+        Если сайт отражает фильтры в адресе, комбинация начинается со страницы
+        уже проверенного подмножества и применяет только недостающий фильтр.
+        """
+        names = sorted(combination)
+        if len(names) > 1:
+            parent = explored.get(frozenset(names[:-1]), {})
+            # Страница неудачной проверки может не содержать всех фильтров подмножества
+            parent_url = parent.get('url') if parent.get('success') else None
+            if parent_url and normalize_url(parent_url, self.settings['ignore_query_params']) != \
+                    normalize_url(results_url, self.settings['ignore_query_params']):
+                return parent_url, [atoms[names[-1]]]
+
+        return results_url, [atoms[name] for name in names]
+
+    def _run_jobs(self, driver: WebDriver, jobs: Dict[str, Tuple[str, List[Dict[str, Any]]]],
+                  tabs: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Выполнение заданий {имя: (адрес, фильтры)} пачками по числу вкладок"""
+        if not jobs:
+            return {}
+
+        tabs = self._tab_count(tabs, len(jobs))
+        logger.info(f"Проверка {len(jobs)} комбинаций фильтров в {tabs} вкладках")
+
+        contexts = BrowserContextManager(driver)
+        scheduler = TabScheduler(driver, poll_interval=self.settings['poll_interval'],
+                                 task_timeout=self.settings['task_timeout'])
+        names = list(jobs)
+        results = {}
+
+        for offset in range(0, len(names), tabs):
+            tasks = {}
+            try:
+                for name in names[offset:offset + tabs]:
+                    url, filters = jobs[name]
+                    tab = contexts.open_tab(url)
+                    tasks[name] = {'handle': tab['handle'], 'task': self._combination_task(driver, filters)}
+                results.update(scheduler.run(tasks))
+
+            finally:
+                contexts.close_tabs()
+
+        return results
+
+    def _combination_task(self, driver: WebDriver, filters: List[Dict[str, Any]]):
+        """Задача вкладки: дождаться выдачи, применить фильтры, снять результат"""
+        quiet_time = self.settings['quiet_time']
+        start_time = time.time()
+
+        yield page_loaded()
+        yield dom_quiet(quiet_time)
+
+        applied, missing = [], []
+        for control in filters:
+            match = driver.execute_script(APPLY_FILTER_SCRIPT, control['selectors'],
+                                          control.get('text'), control.get('value'))
+            if match:
+                applied.append({'filter': control['name'], **match})
+                yield dom_quiet(quiet_time)
+            else:
+                missing.append(control['name'])
+
+        page = driver.execute_script(RESULT_PAGE_SCRIPT)
+
+        # Та же страница уже анализировалась - повторно карточки не читаются
+        analysis = self.page_cache.get(page['url'], page['dom_hash'])
+        page_cached = analysis is not None
+        if not page_cached:
+            analysis = self._analyze_cards(driver.execute_script(HOTEL_CARDS_SCRIPT) or [])
+            self.page_cache.put(page['url'], page['dom_hash'], analysis)
+
+        return {
+            'filters': [control['name'] for control in filters],
+            'applied': applied,
+            'missing': missing,
+            **page,
+            'analysis': analysis,
+            'page_cached': page_cached,
+            'success': not missing,
+            'duration': round(time.time() - start_time, 3)
+        }
+
+    @staticmethod
+    def _analyze_cards(cards: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Сводка по карточкам выдачи"""
+        prices = describe_prices(parse_prices(card.get('price', '') for card in cards))
+
+        return {
+            'hotels': len(cards),
+            'min_price': prices['min'],
+            'median_price': prices['median'],
+            'max_price': prices['max'],
+            'top_hotels': [card['name'] for card in cards[:5]]
+        }
+
+    def _requirement_report(self, requirements: Dict[str, Any], mapping: Dict[str, Any],
+                            explored: Dict[FrozenSet[str], Dict[str, Any]], pruned: set,
+                            skipped: set) -> Dict[str, Any]:
+        """Какие комбинации фильтров удовлетворяют набору требований"""
+        names = frozenset(atom['name'] for atom in mapping['atoms'].values())
+        full = explored.get(names)
+
+        def describe(combination: FrozenSet[str], result: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                'combination': self.combination_name(sorted(combination)),
+                'filters': len(combination),
+                'hotels_count': result.get('hotels_count', 0),
+                'duration': result.get('duration', 0),
+                'cached': result.get('cached', False)
+            }
+
+        # Подмножества набора: сколько выдачи остается по мере добавления фильтров
+        tested = sorted((describe(combination, result) for combination, result in explored.items()
+                         if combination and combination <= names),
+                        key=lambda item: (item['filters'], -item['hotels_count']))
+
+        # Набор выполняют любые проверенные комбинации, содержащие все его фильтры
+        satisfying = [describe(combination, result) for combination, result in explored.items()
+                      if names and combination >= names and result.get('success') and result.get('hotels_count')]
+
+        # Минимальные пустые комбинации объясняют, почему набор не выполним
+        empty = [combination for combination, result in explored.items()
+                 if combination <= names and result.get('success') and not result.get('hotels_count')]
+        blocking = [self.combination_name(sorted(combination)) for combination in empty
+                    if not any(other < combination for other in empty)]
+
+        # Неудачные проверки (таймаут, ошибка, фильтр не найден) - отдельно от пустой выдачи
+        failed = [{'combination': self.combination_name(sorted(combination)),
+                   'error': result.get('error'), 'missing': result.get('missing', [])}
+                  for combination, result in explored.items() if combination <= names and not result.get('success')]
+
+        return {
+            'filters': {key: atom['name'] for key, atom in mapping['atoms'].items()},
+            'unmapped': mapping['unmapped'],
+            'satisfied': bool(satisfying),
+            'full_combination': self.combination_name(sorted(names)),
+            'full_combination_tested': full is not None,
+            'hotels_count': full.get('hotels_count') if full else None,
+            'pruned': bool(names) and names in pruned,
+            'blocking_combinations': blocking,
+            'failed_combinations': failed,
+            'skipped_combinations': sorted(self.combination_name(sorted(combination)) for combination in skipped
+                                           if combination <= names),
+            'satisfying_combinations': satisfying,
+            'tested_combinations': tested,
+            'duration': round(sum(item['duration'] for item in tested if not item['cached']), 3)
+        }
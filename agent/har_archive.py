@@ -0,0 +1,396 @@
+"""
+HAR Archive - модуль записи и воспроизведения сетевого трафика прогона
+"""
+
+import json
+import time
+import asyncio
+import base64
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .cdp_client import CDPClient, page_websocket_url
+from .browser_contexts import add_target_hook, remove_target_hook
+
+logger = logging.getLogger(__name__)
+
+# Заголовки, которые нельзя отдавать вместе с уже распакованным телом ответа
+SKIPPED_REPLAY_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+# Архивы, уже записанные этим процессом: повторная запись идет в новый файл
+_written_paths = set()
+
+def archive_path(path: str) -> str:
+    """Путь для нового архива: повторный прогон в процессе не затирает предыдущий"""
+    resolved = Path(path).expanduser().resolve()
+    if resolved in _written_paths:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        resolved = resolved.with_name(f'{resolved.stem}_{stamp}{resolved.suffix}')
+    _written_paths.add(resolved)
+    return str(resolved)
+
+def load_har(path: str) -> Dict[str, Any]:
+    """Загрузка архива"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_har(path: str, entries: List[Dict[str, Any]]):
+    """Сохранение записей в архив формата HAR 1.2"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    archive = {
+        'log': {
+            'version': '1.2',
+            'creator': {'name': 'ux-research-agent', 'version': '1.0'},
+            'entries': entries
+        }
+    }
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(archive, f, ensure_ascii=False)
+
+def normalize_url(url: str, ignore_query_params: Iterable[str] = ()) -> str:
+    """URL для сопоставления запросов: без изменчивых параметров, с отсортированным query"""
+    parts = urlsplit(url)
+    ignored = set(ignore_query_params)
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if key not in ignored)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+def _header_list(headers: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Заголовки DevTools (словарь) в формате HAR (список)"""
+    return [{'name': name, 'value': str(value)} for name, value in (headers or {}).items()]
+
+class HarRecorder:
+    """Запись всех HTTP-запросов вкладок драйвера вместе с телами ответов
+
+    К текущей вкладке подключение создается при старте, к вкладкам и
+    контекстам BrowserContextManager - при их открытии (до начала загрузки).
+    """
+
+    def __init__(self, driver: WebDriver, path: str):
+        self.driver = driver
+        self.path = path
+        self.clients = []
+        self.entries = []
+        self._requests = {}
+        self._body_tasks = {}
+
+    def start(self):
+        """Начало записи"""
+        self.attach(self.driver)
+        add_target_hook(self.driver, self.attach)
+        logger.info(f"Запись сетевого трафика в {self.path}")
+
+    def attach(self, driver: WebDriver):
+        """Подключение к текущей вкладке драйвера"""
+        client = CDPClient(page_websocket_url(driver))
+        client.start()
+        self._body_tasks[client] = set()
+
+        client.on('Network.requestWillBeSent', lambda params: self._on_request(client, params))
+        client.on('Network.responseReceived', lambda params: self._on_response(client, params))
+        client.on('Network.loadingFinished', lambda params: self._on_finished(client, params))
+        client.on('Network.loadingFailed', lambda params: self._on_failed(client, params))
+
+        client.call('Network.enable', {})
+        # Без кэша в архив попадает каждый ресурс, а не только первый запрос к нему
+        client.call('Network.setCacheDisabled', {'cacheDisabled': True})
+        self.clients.append(client)
+
+    def stop(self) -> Dict[str, Any]:
+        """Завершение записи и сохранение архива"""
+        remove_target_hook(self.driver, self.attach)
+
+        for client in self.clients:
+            tasks = self._body_tasks.pop(client, set())
+
+            async def drain():
+                if tasks:
+                    await asyncio.wait(list(tasks), timeout=5)
+
+            try:
+                asyncio.run_coroutine_threadsafe(drain(), client.loop).result(10)
+                client.call('Network.setCacheDisabled', {'cacheDisabled': False})
+            except Exception as e:
+                # Вкладка могла быть уже закрыта
+                logger.warning(f"Не удалось завершить запись вкладки {client.ws_url}: {e}")
+
+            client.close()
+        self.clients = []
+
+        self.path = archive_path(self.path)
+        save_har(self.path, self.entries)
+        stats = self.get_stats()
+        logger.info(f"Архив сохранен: {self.path} ({stats['entries']} запросов, {stats['bytes']} байт)")
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика записи"""
+        return {
+            'mode': 'record',
+            'path': self.path,
+            'entries': len(self.entries),
+            'bytes': sum(entry['response']['content']['size'] for entry in self.entries)
+        }
+
+    def _on_request(self, client: CDPClient, params: Dict[str, Any]):
+        """Новый запрос (или редирект существующего)"""
+        request = params['request']
+        if request['url'].startswith('data:'):
+            return
+
+        # Идентификаторы запросов уникальны только внутри вкладки
+        request_id = (client.ws_url, params['requestId'])
+        pending = self._requests.get(request_id)
+
+        # При редиректе DevTools повторно присылает тот же requestId
+        if pending and params.get('redirectResponse'):
+            pending['response'] = params['redirectResponse']
+            self._add_entry(pending, params['timestamp'], body='', base64_encoded=False)
+
+        self._requests[request_id] = {
+            'request': request,
+            'type': params.get('type', 'Other'),
+            'wall_time': params.get('wallTime', time.time()),
+            'timestamp': params['timestamp'],
+            'response': None
+        }
+
+    def _on_response(self, client: CDPClient, params: Dict[str, Any]):
+        """Заголовки ответа"""
+        pending = self._requests.get((client.ws_url, params['requestId']))
+        if pending:
+            pending['response'] = params['response']
+
+    def _on_finished(self, client: CDPClient, params: Dict[str, Any]):
+        """Ответ загружен - запрашиваем тело, пока браузер его не выгрузил"""
+        pending = self._requests.pop((client.ws_url, params['requestId']), None)
+        if not pending or not pending['response']:
+            return
+
+        tasks = self._body_tasks.get(client)
+        task = asyncio.ensure_future(self._fetch_body(client, params['requestId'], pending, params['timestamp']))
+        if tasks is not None:
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    def _on_failed(self, client: CDPClient, params: Dict[str, Any]):
+        """Неуспешные и заблокированные запросы в архив не попадают"""
+        self._requests.pop((client.ws_url, params['requestId']), None)
+
+    async def _fetch_body(self, client: CDPClient, request_id: str, pending: Dict[str, Any], finished: float):
+        """Получение тела ответа"""
+        try:
+            result = await client.send('Network.getResponseBody', {'requestId': request_id})
+            body, base64_encoded = result.get('body', ''), result.get('base64Encoded', False)
+        except Exception as e:
+            logger.debug(f"Тело ответа {pending['request']['url']} недоступно: {e}")
+            body, base64_encoded = '', False
+
+        self._add_entry(pending, finished, body, base64_encoded)
+
+    def _add_entry(self, pending: Dict[str, Any], finished: float, body: str, base64_encoded: bool):
+        """Запись в формате HAR"""
+        request = pending['request']
+        response = pending['response']
+        duration = max(0.0, (finished - pending['timestamp']) * 1000)
+        size = len(base64.b64decode(body)) if base64_encoded else len(body.encode('utf-8'))
+
+        content = {'size': size, 'mimeType': response.get('mimeType', ''), 'text': body}
+        if base64_encoded:
+            content['encoding'] = 'base64'
+
+        entry = {
+            'startedDateTime': datetime.fromtimestamp(pending['wall_time'], timezone.utc).isoformat(),
+            'time': round(duration, 1),
+            'request': {
+                'method': request['method'],
+                'url': request['url'],
+                'httpVersion': response.get('protocol', ''),
+                'headers': _header_list(request.get('headers')),
+                'queryString': [{'name': key, 'value': value}
+                                for key, value in parse_qsl(urlsplit(request['url']).query, keep_blank_values=True)],
+                'headersSize': -1,
+                'bodySize': len(request.get('postData', ''))
+            },
+            'response': {
+                'status': response.get('status', 200),
+                'statusText': response.get('statusText', ''),
+                'httpVersion': response.get('protocol', ''),
+                'headers': _header_list(response.get('headers')),
+                'content': content,
+                'redirectURL': response.get('headers', {}).get('location', response.get('headers', {}).get('Location', '')),
+                'headersSize': -1,
+                'bodySize': response.get('encodedDataLength', -1)
+            },
+            'cache': {},
+            'timings': {'send': 0, 'wait': round(duration, 1), 'receive': 0},
+            '_resourceType': pending['type']
+        }
+
+        if request.get('postData'):
+            entry['request']['postData'] = {
+                'mimeType': request.get('headers', {}).get('Content-Type', ''),
+                'text': request['postData']
+            }
+
+        self.entries.append(entry)
+
+class HarReplayer:
+    """Воспроизведение архива через перехват запросов (CDP Fetch)
+
+    Запросы сопоставляются по методу и URL; повторяющиеся запросы получают
+    записанные ответы по порядку. Задержка добавляется к каждому ответу,
+    не блокируя остальные запросы.
+    """
+
+    def __init__(self, driver: WebDriver, archive: Dict[str, Any], latency_ms: float = 0,
+                 latency_scale: float = 0.0, ignore_query_params: Iterable[str] = (),
+                 unmatched: str = 'fail'):
+        self.driver = driver
+        self.latency_ms = latency_ms
+        self.latency_scale = latency_scale
+        self.ignore_query_params = list(ignore_query_params)
+        self.unmatched = unmatched
+        self.clients = []
+        self._lock = threading.Lock()
+
+        self._index = {}
+        for entry in archive['log']['entries']:
+            key = self._key(entry['request']['method'], entry['request']['url'])
+            self._index.setdefault(key, []).append(entry)
+        self._served = {}
+
+        self.stats = {
+            'served': 0,
+            'missed': 0,
+            'missed_urls': [],
+            'injected_latency': 0.0
+        }
+
+    def start(self):
+        """Включение перехвата (в текущей вкладке и во всех, открытых BrowserContextManager)"""
+        self.attach(self.driver)
+        add_target_hook(self.driver, self.attach)
+
+        logger.info(f"Воспроизведение архива: {sum(len(entries) for entries in self._index.values())} ответов, "
+                    f"задержка {self.latency_ms} мс + {self.latency_scale} × записанное время")
+
+    def attach(self, driver: WebDriver):
+        """Перехват запросов текущей вкладки драйвера"""
+        client = CDPClient(page_websocket_url(driver))
+        client.start()
+
+        client.on('Fetch.requestPaused', lambda params: self._on_request_paused(client, params))
+        client.call('Fetch.enable', {'patterns': [{'urlPattern': '*', 'requestStage': 'Request'}]})
+        self.clients.append(client)
+
+    def stop(self) -> Dict[str, Any]:
+        """Отключение перехвата"""
+        remove_target_hook(self.driver, self.attach)
+
+        for client in self.clients:
+            try:
+                client.call('Fetch.disable')
+            except Exception as e:
+                logger.warning(f"Не удалось отключить перехват запросов {client.ws_url}: {e}")
+            client.close()
+        self.clients = []
+
+        stats = self.get_stats()
+        logger.info(f"Воспроизведение завершено: {stats['served']} ответов из архива, {stats['missed']} промахов")
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика воспроизведения"""
+        return {
+            'mode': 'replay',
+            'served': self.stats['served'],
+            'missed': self.stats['missed'],
+            'missed_urls': list(self.stats['missed_urls']),
+            'injected_latency': round(self.stats['injected_latency'], 3)
+        }
+
+    def _key(self, method: str, url: str) -> tuple:
+        """Ключ сопоставления запроса"""
+        return method.upper(), normalize_url(url, self.ignore_query_params)
+
+    def _match(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        """Следующий записанный ответ на запрос (последний повторяется)"""
+        key = self._key(method, url)
+        entries = self._index.get(key)
+        if not entries:
+            return None
+
+        # Вкладки обслуживаются в своих потоках: порядок повторов - под блокировкой
+        with self._lock:
+            position = self._served.get(key, 0)
+            self._served[key] = position + 1
+        return entries[min(position, len(entries) - 1)]
+
+    async def _on_request_paused(self, client: CDPClient, params: Dict[str, Any]):
+        """Ответ на перехваченный запрос"""
+        request_id = params['requestId']
+        request = params['request']
+        entry = self._match(request['method'], request['url'])
+
+        if entry is None:
+            with self._lock:
+                self.stats['missed'] += 1
+                if len(self.stats['missed_urls']) < 50:
+                    self.stats['missed_urls'].append(request['url'])
+
+            if self.unmatched == 'continue':
+                await client.send('Fetch.continueRequest', {'requestId': request_id})
+            else:
+                await client.send('Fetch.failRequest', {'requestId': request_id,
+                                                        'errorReason': 'InternetDisconnected'})
+            return
+
+        delay = (self.latency_ms + entry['time'] * self.latency_scale) / 1000
+        if delay > 0:
+            with self._lock:
+                self.stats['injected_latency'] += delay
+            await asyncio.sleep(delay)
+
+        response = entry['response']
+        content = response['content']
+        body = content.get('text', '')
+        if content.get('encoding') != 'base64':
+            body = base64.b64encode(body.encode('utf-8')).decode('ascii')
+
+        await client.send('Fetch.fulfillRequest', {
+            'requestId': request_id,
+            'responseCode': response['status'],
+            'responseHeaders': [header for header in response['headers']
+                                if header['name'].lower() not in SKIPPED_REPLAY_HEADERS],
+            'body': body
+        })
+        with self._lock:
+            self.stats['served'] += 1
+
+def start_har_session(driver: WebDriver, har_config: Dict[str, Any]):
+    """Запуск записи или воспроизведения по конфигурации (None, если режим выключен)"""
+    mode = har_config.get('mode', 'off')
+
+    if mode == 'record':
+        session = HarRecorder(driver, har_config['path'])
+    elif mode == 'replay':
+        session = HarReplayer(driver, load_har(har_config['path']),
+                              latency_ms=har_config['latency_ms'],
+                              latency_scale=har_config['latency_scale'],
+                              ignore_query_params=har_config['ignore_query_params'],
+                              unmatched=har_config['unmatched'])
+    elif mode == 'off':
+        return None
+    else:
+        raise ValueError(f"Неизвестный режим HAR: {mode}")
+
+    session.start()
+    return session
@@ -0,0 +1,390 @@
+"""
+In-Page Analyzer - модуль анализа страниц внутри браузера без передачи page_source
+"""
+
+import json
+import time
+import logging
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .web_analyzer import WebAnalyzer
+from .price_stats import price_range_report, average_price
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IN_PAGE_CONFIG = {
+    'enabled': True,
+    # Каждый N-й анализ повторяется в WebAnalyzer по page_source и сравнивается (0 - никогда)
+    'cross_check_every': 10
+}
+
+# Те же проверки, что в WebAnalyzer (шаблоны классов, порядок документа); тексты цен
+# возвращаются как есть и разбираются в Python. Расхождения ловит перекрестная проверка
+ANALYSIS_SCRIPT = """
+var kind = arguments[0];
+var started = performance.now();
+var classCache = {};
+
+function text(el) {
+    return (el.textContent || '').trim();
+}
+
+function texts(elements) {
+    var result = [];
+    for (var i = 0; i < elements.length; i++) {
+        var value = text(elements[i]);
+        if (value) {
+            result.push(value);
+        }
+    }
+    return result;
+}
+
+function matchesClass(el, regex) {
+    var classes = el.classList;
+    for (var i = 0; i < classes.length; i++) {
+        if (regex.test(classes[i])) {
+            return true;
+        }
+    }
+    return false;
+}
+
+// Элементы с классом по шаблону: во всем документе (с кэшем) или внутри root
+function byClass(pattern, root) {
+    if (!root && classCache[pattern]) {
+        return classCache[pattern];
+    }
+    var regex = new RegExp(pattern);
+    var nodes = (root || document).querySelectorAll('[class]');
+    var result = [];
+    for (var i = 0; i < nodes.length; i++) {
+        if (matchesClass(nodes[i], regex)) {
+            result.push(nodes[i]);
+        }
+    }
+    if (!root) {
+        classCache[pattern] = result;
+    }
+    return result;
+}
+
+function firstByClass(pattern, root) {
+    var regex = new RegExp(pattern);
+    var nodes = root.querySelectorAll('[class]');
+    for (var i = 0; i < nodes.length; i++) {
+        if (matchesClass(nodes[i], regex)) {
+            return nodes[i];
+        }
+    }
+    return null;
+}
+
+function all(selector, root) {
+    return Array.prototype.slice.call((root || document).querySelectorAll(selector));
+}
+
+function attr(el, name, fallback) {
+    var value = el.getAttribute(name);
+    return value === null ? fallback : value;
+}
+
+function linksWithin(pattern) {
+    var result = [];
+    byClass(pattern).forEach(function (el) {
+        result = result.concat(texts(all('a', el)));
+    });
+    return result;
+}
+
+function sectionTexts(sectionPattern, itemPattern) {
+    var section = byClass(sectionPattern)[0];
+    return section ? texts(byClass(itemPattern, section)) : [];
+}
+
+function searchResults() {
+    var cards = byClass('hotel|card');
+    var cardsAnalysis = {total_cards: cards.length, cards_with_images: 0, cards_with_prices: 0,
+                         cards_with_ratings: 0, average_price: 0};
+    var cardPriceTexts = [];
+
+    cards.forEach(function (card) {
+        if (card.querySelector('img')) {
+            cardsAnalysis.cards_with_images++;
+        }
+        var priceElement = firstByClass('price|cost', card);
+        if (priceElement) {
+            cardsAnalysis.cards_with_prices++;
+            cardPriceTexts.push(text(priceElement));
+        }
+        if (firstByClass('rating|star', card)) {
+            cardsAnalysis.cards_with_ratings++;
+        }
+    });
+    var pagination = {has_pagination: false, current_page: 1, total_pages: 1, next_page_available: false};
+    var paginationElement = byClass('pagination|pages')[0];
+    if (paginationElement) {
+        pagination.has_pagination = true;
+        var current = firstByClass('current|active', paginationElement);
+        var pageMatch = current ? text(current).match(/\\d+/) : null;
+        if (pageMatch) {
+            pagination.current_page = parseInt(pageMatch[0], 10);
+        }
+        var next = firstByClass('next|forward', paginationElement);
+        if (next && !next.classList.contains('disabled')) {
+            pagination.next_page_available = true;
+        }
+    }
+
+    return {
+        hotels_count: byClass('hotel|card|item').length,
+        filters_available: texts(byClass('filter|facet')),
+        sorting_options: texts(byClass('sort|order')),
+        hotel_cards: cardsAnalysis,
+        pagination: pagination,
+        // Цены разбираются и сводятся в Python (price_stats), как в WebAnalyzer
+        price_range: null,
+        card_price_texts: cardPriceTexts,
+        price_texts: texts(byClass('price|cost'))
+    };
+}
+
+function homepage() {
+    var title = document.querySelector('title');
+    var searchBox = all('input[name]').filter(function (el) {
+        return /query|search|destination/.test(el.getAttribute('name'));
+    })[0];
+    var dateElements = all('input').filter(function (el) { return el.getAttribute('type') === 'date'; })
+        .concat(byClass('date|calendar'));
+
+    var hero = {found: false, title: '', subtitle: '', cta_button: ''};
+    var heroElement = byClass('hero|banner|main')[0];
+    if (heroElement) {
+        hero.found = true;
+        [['title', 'h1, h2'], ['subtitle', 'h3, h4, p'], ['cta_button', 'button']].forEach(function (pair) {
+            var el = heroElement.querySelector(pair[1]);
+            if (el) {
+                hero[pair[0]] = text(el);
+            }
+        });
+    }
+
+    var footer = document.querySelector('footer');
+    var images = all('img');
+    var imagesWithAlt = images.filter(function (img) { return !!img.getAttribute('alt'); }).length;
+    var ariaElements = all('[aria-label]');
+    var semantic = {};
+    ['header', 'nav', 'main', 'section', 'article', 'aside', 'footer'].forEach(function (name) {
+        semantic[name] = document.getElementsByTagName(name).length;
+    });
+
+    return {
+        page_title: title ? text(title) : 'Заголовок не найден',
+        search_elements: {
+            search_box: searchBox ? {
+                found: true,
+                placeholder: attr(searchBox, 'placeholder', ''),
+                type: attr(searchBox, 'type', 'text'),
+                required: searchBox.hasAttribute('required')
+            } : {found: false},
+            destination_suggestions: texts(byClass('suggestion|autocomplete|dropdown')),
+            date_inputs: dateElements.map(function (el) {
+                return {type: attr(el, 'type', 'text'), placeholder: attr(el, 'placeholder', ''),
+                        required: el.hasAttribute('required')};
+            }),
+            guest_inputs: byClass('guest|person|traveler').map(function (el) {
+                return {text: text(el), type: attr(el, 'type', 'text')};
+            })
+        },
+        navigation: {
+            main_menu: linksWithin('menu|nav|header'),
+            breadcrumbs: linksWithin('breadcrumb|bread'),
+            footer_links: footer ? texts(all('a', footer)) : []
+        },
+        content_sections: {
+            hero_section: hero,
+            featured_destinations: sectionTexts('destination|popular|featured', 'city|destination|place'),
+            special_offers: sectionTexts('offer|deal|promotion', 'offer|deal'),
+            testimonials: sectionTexts('testimonial|review|feedback', 'testimonial|review')
+        },
+        // Время загрузки добавляется в Python из Navigation Timing
+        performance_indicators: {
+            images_count: images.length,
+            scripts_count: all('script').length,
+            css_files_count: all('link').filter(function (link) {
+                return (link.getAttribute('rel') || '').split(/\\s+/).indexOf('stylesheet') !== -1;
+            }).length
+        },
+        accessibility: {
+            alt_texts: {
+                total_images: images.length,
+                images_with_alt: imagesWithAlt,
+                alt_coverage: images.length > 0 ? imagesWithAlt / images.length : 0
+            },
+            aria_labels: {
+                elements_with_aria: ariaElements.length,
+                aria_labels: ariaElements.map(function (el) { return el.getAttribute('aria-label'); })
+            },
+            semantic_elements: semantic
+        }
+    };
+}
+
+var analysis = kind === 'homepage' ? homepage() : searchResults();
+var scriptTime = performance.now() - started;
+
+// Размер страницы, которую пришлось бы передать как page_source
+var html = document.documentElement.outerHTML;
+var pageBytes = window.TextEncoder ? new TextEncoder().encode(html).length : html.length;
+
+return {analysis: analysis, page_bytes: pageBytes, script_time: scriptTime};
+"""
+
+def analysis_mismatches(actual: Any, expected: Any, path: str = '', limit: int = 20) -> List[str]:
+    """Пути, по которым результаты анализа различаются"""
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        mismatches = []
+        for key in list(expected) + [key for key in actual if key not in expected]:
+            mismatches.extend(analysis_mismatches(actual.get(key), expected.get(key), f'{path}.{key}'.lstrip('.'), limit))
+        return mismatches[:limit]
+
+    if isinstance(actual, list) and isinstance(expected, list) and len(actual) == len(expected):
+        mismatches = []
+        for index, (left, right) in enumerate(zip(actual, expected)):
+            mismatches.extend(analysis_mismatches(left, right, f'{path}[{index}]', limit))
+        return mismatches[:limit]
+
+    return [] if actual == expected else [path or '.']
+
+class InPageAnalyzer:
+    """Анализ главной страницы и выдачи скриптом в странице
+
+    Из браузера возвращается только компактный JSON с результатом вместо
+    page_source, который пришлось бы передать через WebDriver и разобрать.
+    WebAnalyzer остается запасным вариантом (ошибка скрипта) и периодически
+    повторяет анализ для сверки; при расхождении используется его результат.
+    """
+
+    def __init__(self, web_analyzer: WebAnalyzer, in_page_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_IN_PAGE_CONFIG, **(in_page_config or {})}
+        self.web_analyzer = web_analyzer
+        self.analyses = 0
+        self.seconds_per_byte = None  # Стоимость разбора page_source по последней сверке без кэша
+
+    def analyze_homepage(self, driver: WebDriver,
+                         navigation_timing: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Анализ главной страницы: (результат, статистика передачи)"""
+        def complete(analysis: Dict[str, Any]) -> Dict[str, Any]:
+            analysis['performance_indicators'] = {**WebAnalyzer.timing_indicators(navigation_timing),
+                                                  **analysis['performance_indicators']}
+            return analysis
+
+        return self._analyze(driver, 'homepage', complete,
+                             lambda html: self.web_analyzer.analyze_homepage(html, navigation_timing))
+
+    def analyze_search_results(self, driver: WebDriver) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Анализ выдачи: (результат, статистика передачи)"""
+        def complete(analysis: Dict[str, Any]) -> Dict[str, Any]:
+            analysis['hotel_cards']['average_price'] = average_price(analysis.pop('card_price_texts'))
+            analysis['price_range'] = price_range_report(analysis.pop('price_texts'))
+            return analysis
+
+        return self._analyze(driver, 'search_results', complete, self.web_analyzer.analyze_search_results)
+
+    @staticmethod
+    def summarize(steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Сводка передачи по всем шагам сценария (для отчета)"""
+        transfers = [step['page_transfer'] for step in steps if step.get('page_transfer')]
+        in_page = [transfer for transfer in transfers if transfer['mode'] == 'in_page']
+
+        return {
+            'analyses': len(transfers),
+            'in_page': len(in_page),
+            'fallbacks': len([transfer for transfer in transfers if transfer.get('fallback_reason')]),
+            'cross_checks': len([transfer for transfer in in_page if transfer['cross_checked']]),
+            'mismatches': len([transfer for transfer in in_page if transfer.get('mismatches')]),
+            'bytes_saved': sum(transfer['bytes_saved'] for transfer in in_page),
+            'time_saved': round(sum(transfer['time_saved'] for transfer in in_page
+                                    if transfer['time_saved'] is not None), 3)
+        }
+
+    def _analyze(self, driver: WebDriver, kind: str, complete: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 python_analysis: Callable[[str], Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Анализ в странице со сверкой и запасным вариантом через page_source"""
+        if not self.settings['enabled']:
+            analysis, transfer = self._python(driver, python_analysis)
+            return analysis, self._round({'mode': 'python', **transfer})
+
+        self.analyses += 1
+        start_time = time.perf_counter()
+        try:
+            result = driver.execute_script(ANALYSIS_SCRIPT, kind)
+            analysis = complete(result['analysis'])
+        except Exception as e:
+            logger.warning(f"Анализ в странице не выполнен ({kind}), используется page_source: {e}")
+            analysis, transfer = self._python(driver, python_analysis)
+            return analysis, self._round({'mode': 'python', 'fallback_reason': str(e), **transfer})
+
+        in_page_time = time.perf_counter() - start_time
+        transferred_bytes = len(json.dumps(result, ensure_ascii=False).encode('utf-8'))
+        transfer = {
+            'mode': 'in_page',
+            'page_bytes': result['page_bytes'],
+            'transferred_bytes': transferred_bytes,
+            'bytes_saved': result['page_bytes'] - transferred_bytes,
+            'in_page_time': in_page_time,
+            'script_time': result['script_time'] / 1000
+        }
+
+        estimated_saving = {
+            'time_saved': (self.seconds_per_byte * result['page_bytes'] - in_page_time
+                           if self.seconds_per_byte is not None else None),
+            'time_saved_estimated': True
+        }
+
+        every = self.settings['cross_check_every']
+        if every and (self.analyses - 1) % every == 0:
+            reference, python_transfer = self._python(driver, python_analysis)
+            mismatches = analysis_mismatches(analysis, reference)
+            transfer.update({
+                'cross_checked': True,
+                'python_time': python_transfer['python_time'],
+                'python_cached': python_transfer['python_cached'],
+                'mismatches': mismatches
+            })
+            if python_transfer['python_cached']:
+                # Эталон из кэша: измерен поиск в кэше, а не разбор - экономия по последней калибровке
+                transfer.update(estimated_saving)
+            else:
+                transfer.update({'time_saved': python_transfer['python_time'] - in_page_time,
+                                 'time_saved_estimated': False})
+            if mismatches:
+                logger.warning(f"Анализ в странице расходится с WebAnalyzer ({kind}): {', '.join(mismatches)}")
+                analysis = reference
+        else:
+            # Без сверки экономия оценивается по стоимости байта page_source на последней сверке
+            transfer.update({'cross_checked': False, **estimated_saving})
+
+        return analysis, self._round(transfer)
+
+    def _python(self, driver: WebDriver,
+                python_analysis: Callable[[str], Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Анализ через page_source и WebAnalyzer"""
+        start_time = time.perf_counter()
+        html = driver.page_source
+        analysis = python_analysis(html)
+        python_time = time.perf_counter() - start_time
+
+        page_bytes = len(html.encode('utf-8'))
+        cached = self.web_analyzer.last_cache_hit
+        if not cached:
+            # Калибруется только настоящий разбор: попадание в кэш почти ничего не стоит
+            self.seconds_per_byte = python_time / page_bytes if page_bytes else None
+
+        return analysis, {'page_bytes': page_bytes, 'python_time': python_time, 'python_cached': cached}
+
+    @staticmethod
+    def _round(transfer: Dict[str, Any]) -> Dict[str, Any]:
+        """Округление времени в статистике"""
+        return {key: round(value, 4) if isinstance(value, float) else value for key, value in transfer.items()}
@@ -0,0 +1,118 @@
+"""
+Network Blocker - модуль блокировки запросов через Chrome DevTools Protocol
+"""
+
+import logging
+import weakref
+from typing import Dict, Any, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .cdp_events import get_event_log
+from .browser_contexts import add_target_hook
+
+logger = logging.getLogger(__name__)
+
+class NetworkBlocker:
+    """Блокировка шрифтов, трекеров, аналитики и медиа по именованному профилю"""
+
+    def __init__(self, network_config: Dict[str, Any], profile_name: Optional[str] = None):
+        self.profile_name = profile_name or network_config['profile']
+        if self.profile_name not in network_config['profiles']:
+            raise ValueError(f"Неизвестный профиль блокировки: {self.profile_name}")
+
+        self.profile = network_config['profiles'][self.profile_name]
+        self.patterns = [
+            pattern
+            for category in self.profile['block']
+            for pattern in network_config['blocking_patterns'][category]
+        ]
+        self.default_sizes = network_config['average_resource_bytes']
+
+        self._request_types = {}
+        self._observed = {}
+        self._reset_stats()
+
+    def apply(self, driver: WebDriver):
+        """Включение блокировки в браузере"""
+        get_event_log(driver).subscribe(self._on_event)
+
+        if not self.patterns:
+            logger.info(f"Профиль сети '{self.profile_name}': блокировка отключена")
+            return
+
+        # Network.setBlockedURLs действует на одну вкладку: новые вкладки и контексты
+        # BrowserContextManager получают те же шаблоны до начала загрузки
+        self.apply_to_tab(driver)
+        add_target_hook(driver, self.apply_to_tab)
+
+        logger.info(f"Профиль сети '{self.profile_name}': блокируется {len(self.patterns)} шаблонов URL")
+
+    def apply_to_tab(self, driver: WebDriver):
+        """Блокировка в текущей вкладке драйвера"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+
+    def pop_stats(self) -> Dict[str, Any]:
+        """Статистика блокировки с момента предыдущего вызова"""
+        stats = {
+            'profile': self.profile_name,
+            'blocked_requests': self._stats['blocked_requests'],
+            'bytes_saved_estimate': int(self._stats['bytes_saved']),
+            'blocked_by_type': dict(self._stats['blocked_by_type'])
+        }
+        self._reset_stats()
+        return stats
+
+    def _reset_stats(self):
+        """Сброс счетчиков шага"""
+        self._stats = {
+            'blocked_requests': 0,
+            'bytes_saved': 0.0,
+            'blocked_by_type': {}
+        }
+
+    def _on_event(self, event: Dict[str, Any]):
+        """Учет заблокированных и загруженных запросов"""
+        method = event['method']
+        params = event['params']
+        request_id = params.get('requestId')
+
+        if method == 'Network.requestWillBeSent':
+            self._request_types[request_id] = params.get('type', 'Other')
+
+        elif method == 'Network.loadingFinished':
+            resource_type = self._request_types.pop(request_id, 'Other')
+            total, count = self._observed.get(resource_type, (0, 0))
+            self._observed[resource_type] = (total + params.get('encodedDataLength', 0), count + 1)
+
+        elif method == 'Network.loadingFailed':
+            resource_type = self._request_types.pop(request_id, params.get('type', 'Other'))
+            if params.get('blockedReason'):
+                self._stats['blocked_requests'] += 1
+                self._stats['bytes_saved'] += self._estimate_size(resource_type)
+                by_type = self._stats['blocked_by_type']
+                by_type[resource_type] = by_type.get(resource_type, 0) + 1
+
+    def _estimate_size(self, resource_type: str) -> float:
+        """Оценка размера заблокированного ресурса
+
+        Заблокированный ответ не загружается, поэтому размер берется как средний
+        для этого типа ресурса в текущей сессии или из конфигурации.
+        """
+        total, count = self._observed.get(resource_type, (0, 0))
+        if count:
+            return total / count
+        return self.default_sizes.get(resource_type, self.default_sizes['Other'])
+
+_blockers = weakref.WeakKeyDictionary()
+
+def attach_network_blocker(driver: WebDriver, network_config: Dict[str, Any]) -> NetworkBlocker:
+    """Применение профиля блокировки к драйверу"""
+    blocker = NetworkBlocker(network_config)
+    blocker.apply(driver)
+    _blockers[driver] = blocker
+    return blocker
+
+def get_network_blocker(driver: WebDriver) -> Optional[NetworkBlocker]:
+    """Блокировщик, примененный к драйверу (если есть)"""
+    return _blockers.get(driver)
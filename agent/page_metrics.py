@@ -0,0 +1,278 @@
+"""
+Page Metrics - модуль сбора Navigation/Resource Timing и Core Web Vitals по шагам
+"""
+
+import logging
+import weakref
+from typing import Dict, Any, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_CONFIG = {
+    'enabled': True,
+    'event_duration_threshold': 16,  # Минимальная длительность события для INP, мс
+    'slowest_resources': 5  # Сколько самых медленных ресурсов сохранять в шаге
+}
+
+# Пороги "хорошо" / "требует улучшения" (web.dev), все кроме CLS - в мс
+VITALS_THRESHOLDS = {
+    'ttfb': (800, 1800),
+    'fcp': (1800, 3000),
+    'lcp': (2500, 4000),
+    'cls': (0.1, 0.25),
+    'inp': (200, 500)
+}
+
+# Наблюдатели устанавливаются в каждый новый документ до выполнения скриптов страницы
+OBSERVER_SCRIPT = """
+(function () {
+    if (window.__uxMetrics || !window.PerformanceObserver) {
+        return;
+    }
+    var metrics = window.__uxMetrics = {
+        fcp: null, lcp: null, lcpElement: null,
+        cls: 0, clsStep: 0,
+        interactions: {}, inpStep: 0,
+        longTaskStepCount: 0, longTaskStepTime: 0,
+        resourceCursor: 0
+    };
+    var session = {value: 0, first: 0, last: 0};
+
+    if (performance.setResourceTimingBufferSize) {
+        performance.setResourceTimingBufferSize(2000);
+    }
+
+    function observe(type, callback, options) {
+        try {
+            new PerformanceObserver(function (list) {
+                list.getEntries().forEach(callback);
+            }).observe(Object.assign({type: type, buffered: true}, options || {}));
+        } catch (e) {
+            // Тип записей не поддерживается браузером
+        }
+    }
+
+    observe('paint', function (entry) {
+        if (entry.name === 'first-contentful-paint') {
+            metrics.fcp = entry.startTime;
+        }
+    });
+    observe('largest-contentful-paint', function (entry) {
+        metrics.lcp = entry.startTime;
+        var element = entry.element;
+        metrics.lcpElement = element ? element.tagName.toLowerCase() +
+            (typeof element.className === 'string' && element.className ? '.' + element.className.split(' ')[0] : '') : null;
+    });
+    // CLS - максимальное "окно" сдвигов (не дольше 5 сек, с паузами меньше 1 сек)
+    observe('layout-shift', function (entry) {
+        if (entry.hadRecentInput) {
+            return;
+        }
+        if (session.value && entry.startTime - session.last < 1000 && entry.startTime - session.first < 5000) {
+            session.value += entry.value;
+            session.last = entry.startTime;
+        } else {
+            session = {value: entry.value, first: entry.startTime, last: entry.startTime};
+        }
+        metrics.cls = Math.max(metrics.cls, session.value);
+        metrics.clsStep += entry.value;
+    });
+    observe('longtask', function (entry) {
+        metrics.longTaskStepCount += 1;
+        metrics.longTaskStepTime += entry.duration;
+    });
+    observe('event', function (entry) {
+        if (!entry.interactionId) {
+            return;
+        }
+        var previous = metrics.interactions[entry.interactionId] || 0;
+        metrics.interactions[entry.interactionId] = Math.max(previous, entry.duration);
+        metrics.inpStep = Math.max(metrics.inpStep, entry.duration);
+    }, {durationThreshold: __THRESHOLD__});
+})();
+"""
+
+# Снимок метрик документа; счетчики шага сбрасываются после чтения
+COLLECT_SCRIPT = """
+var maxResources = arguments[0];
+var metrics = window.__uxMetrics;
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var fresh = resources.slice(metrics ? metrics.resourceCursor : 0);
+
+var byType = {}, transferSize = 0;
+fresh.forEach(function (entry) {
+    byType[entry.initiatorType] = (byType[entry.initiatorType] || 0) + 1;
+    transferSize += entry.transferSize || 0;
+});
+var slowest = fresh.slice().sort(function (a, b) { return b.duration - a.duration; })
+    .slice(0, maxResources)
+    .map(function (entry) {
+        return {url: entry.name, type: entry.initiatorType, duration: entry.duration, size: entry.transferSize || 0};
+    });
+
+// INP - почти худшее взаимодействие (одно исключение на каждые 50)
+var durations = [];
+if (metrics) {
+    for (var id in metrics.interactions) {
+        durations.push(metrics.interactions[id]);
+    }
+    durations.sort(function (a, b) { return b - a; });
+}
+
+var result = {
+    url: location.href,
+    time_origin: performance.timeOrigin,
+    observed: !!metrics,
+    navigation: nav ? {
+        type: nav.type,
+        ttfb: nav.responseStart,
+        dom_interactive: nav.domInteractive,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd || null,
+        transfer_size: nav.transferSize
+    } : null,
+    resources: {count: fresh.length, transfer_size: transferSize, by_type: byType, slowest: slowest},
+    fcp: metrics ? metrics.fcp : null,
+    lcp: metrics ? metrics.lcp : null,
+    lcp_element: metrics ? metrics.lcpElement : null,
+    cls: metrics ? metrics.cls : null,
+    cls_step: metrics ? metrics.clsStep : null,
+    inp: durations.length ? durations[Math.min(durations.length - 1, Math.floor(durations.length / 50))] : null,
+    inp_step: metrics && metrics.inpStep ? metrics.inpStep : null,
+    interactions: durations.length,
+    long_tasks: metrics ? {count: metrics.longTaskStepCount, total_time: metrics.longTaskStepTime} : null,
+    dom_nodes: document.getElementsByTagName('*').length
+};
+
+if (metrics) {
+    metrics.resourceCursor = resources.length;
+    metrics.clsStep = 0;
+    metrics.inpStep = 0;
+    metrics.longTaskStepCount = 0;
+    metrics.longTaskStepTime = 0;
+}
+return result;
+"""
+
+NAVIGATION_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+return nav ? {ttfb: nav.responseStart, dom_content_loaded: nav.domContentLoadedEventEnd, load: nav.loadEventEnd} : null;
+"""
+
+def rate_vital(name: str, value: Optional[float]) -> Optional[str]:
+    """Оценка метрики: good / needs-improvement / poor"""
+    if value is None or name not in VITALS_THRESHOLDS:
+        return None
+    good, poor = VITALS_THRESHOLDS[name]
+    if value <= good:
+        return 'good'
+    return 'needs-improvement' if value <= poor else 'poor'
+
+class PageMetrics:
+    """Метрики производительности страницы, собираемые в браузере
+
+    Наблюдатели PerformanceObserver добавляются в каждый новый документ
+    (Page.addScriptToEvaluateOnNewDocument), а в конце шага снимаются
+    накопленные значения: Navigation Timing (если шаг открыл новую страницу),
+    новые ресурсы, LCP, CLS, INP и длинные задачи.
+    """
+
+    def __init__(self, metrics_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_METRICS_CONFIG, **(metrics_config or {})}
+        self._prepared = weakref.WeakSet()
+        self._origins = weakref.WeakKeyDictionary()
+
+    def prepare(self, driver: WebDriver):
+        """Установка наблюдателей (один раз на драйвер)"""
+        if not self.settings['enabled'] or driver in self._prepared:
+            return
+
+        script = OBSERVER_SCRIPT.replace('__THRESHOLD__', str(int(self.settings['event_duration_threshold'])))
+
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': script})
+            # Текущий документ уже загружен - наблюдатели с buffered получат прошлые записи
+            driver.execute_script(script)
+        except Exception as e:
+            logger.warning(f"Не удалось установить сбор метрик страницы: {e}")
+
+        self._prepared.add(driver)
+
+    def collect(self, driver: WebDriver) -> Optional[Dict[str, Any]]:
+        """Метрики шага (None, если сбор выключен или страница недоступна)"""
+        if not self.settings['enabled']:
+            return None
+
+        try:
+            data = driver.execute_script(COLLECT_SCRIPT, self.settings['slowest_resources'])
+        except Exception as e:
+            logger.debug(f"Метрики страницы недоступны: {e}")
+            return None
+
+        # Новый timeOrigin означает, что шаг открыл новый документ
+        previous_origin = self._origins.get(driver)
+        self._origins[driver] = data['time_origin']
+        data['navigated'] = previous_origin != data['time_origin']
+        if not data['navigated']:
+            data['navigation'] = None
+
+        return self._round(data)
+
+    def navigation_timing(self, driver: WebDriver) -> Optional[Dict[str, Any]]:
+        """Navigation Timing текущего документа"""
+        try:
+            return self._round(driver.execute_script(NAVIGATION_SCRIPT))
+        except Exception as e:
+            logger.debug(f"Navigation Timing недоступен: {e}")
+            return None
+
+    @staticmethod
+    def summarize(steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Сводка метрик по всем шагам сценария (для отчета)"""
+        samples = [step['page_metrics'] for step in steps if step.get('page_metrics')]
+
+        # Значения LCP/CLS/INP накапливаются по документу - берется последний снимок
+        documents = {}
+        for sample in samples:
+            document = documents.setdefault(sample['time_origin'], {'url': sample['url']})
+            if sample.get('navigation'):
+                document.update(sample['navigation'])
+            for name in ('fcp', 'lcp', 'cls', 'inp'):
+                if sample.get(name) is not None:
+                    document[name] = sample[name]
+
+        pages = list(documents.values())
+
+        def worst(name: str) -> Optional[float]:
+            values = [page[name] for page in pages if page.get(name) is not None]
+            return max(values) if values else None
+
+        summary = {
+            'pages': pages,
+            'ttfb': worst('ttfb'),
+            'fcp': worst('fcp'),
+            'lcp': worst('lcp'),
+            'cls': worst('cls'),
+            'inp': worst('inp'),
+            'long_tasks': sum((sample.get('long_tasks') or {}).get('count', 0) for sample in samples),
+            'long_task_time': round(sum((sample.get('long_tasks') or {}).get('total_time', 0) for sample in samples), 1),
+            'requests': sum(sample['resources']['count'] for sample in samples),
+            'transfer_size': sum(sample['resources']['transfer_size'] for sample in samples)
+        }
+        summary['ratings'] = {name: rate_vital(name, summary[name]) for name in VITALS_THRESHOLDS}
+
+        return summary
+
+    @classmethod
+    def _round(cls, value: Any) -> Any:
+        """Округление миллисекунд до десятых (CLS - до тысячных)"""
+        if isinstance(value, dict):
+            return {key: round(item, 3) if key in ('cls', 'cls_step') and isinstance(item, float)
+                    else cls._round(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [cls._round(item) for item in value]
+        if isinstance(value, float) and not isinstance(value, bool):
+            return round(value, 1)
+        return value
@@ -0,0 +1,77 @@
+"""
+Page Parser - модуль разбора HTML для анализа страниц
+"""
+
+import re
+import time
+import logging
+from typing import Dict, Any, Optional, Union
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .dom_index import DOMIndex
+
+logger = logging.getLogger(__name__)
+
+# html.parser - BeautifulSoup на стандартном парсере (медленно, но без зависимостей),
+# lxml - BeautifulSoup на lxml, lxml.html - дерево lxml без BeautifulSoup (быстрее всего)
+PARSER_BACKENDS = ('html.parser', 'lxml', 'lxml.html')
+
+DEFAULT_PARSER_CONFIG = {
+    'backend': 'lxml.html',
+    'strainers': True  # Разбирать только нужные анализу области страницы
+}
+
+# Области страницы для каждого анализа: элементы с подходящим классом разбираются
+# вместе со всем поддеревом, остальная разметка пропускается. Шаблоны покрывают
+# все запросы WebAnalyzer к странице; None - нужна вся страница.
+PARSE_ONLY = {
+    'homepage': None,
+    'search_results': r'hotel|card|item|filter|facet|sort|order|price|cost|rating|star|pagination|pages'
+}
+
+class PageParser:
+    """Разбор HTML выбранным парсером с построением DOMIndex"""
+
+    def __init__(self, parser_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_PARSER_CONFIG, **(parser_config or {})}
+        self.backend = self.settings['backend']
+        if self.backend not in PARSER_BACKENDS:
+            raise ValueError(f"Неизвестный парсер {self.backend}, доступны: {', '.join(PARSER_BACKENDS)}")
+
+        self.last_timing = {}
+
+    def parse(self, html_content: str, region: Optional[str] = None) -> Union[BeautifulSoup, lxml.html.HtmlElement]:
+        """Разбор страницы (region - ключ PARSE_ONLY, разбирается только эта область)
+
+        Для lxml.html ограничение не применяется: дерево строится в C целиком,
+        и пропуск разметки на стороне Python ничего не дает.
+        """
+        if self.backend == 'lxml.html':
+            return lxml.html.document_fromstring(html_content) if html_content.strip() else lxml.html.Element('html')
+
+        return BeautifulSoup(html_content, self.backend, parse_only=self.strainer(region))
+
+    def strainer(self, region: Optional[str]) -> Optional[SoupStrainer]:
+        """Ограничение разбора для области страницы"""
+        pattern = PARSE_ONLY.get(region) if self.settings['strainers'] else None
+        return SoupStrainer(class_=re.compile(pattern)) if pattern else None
+
+    def index(self, html_content: str, region: Optional[str] = None) -> DOMIndex:
+        """Индекс страницы (время разбора и индексации - в last_timing)"""
+        start_time = time.perf_counter()
+        document = self.parse(html_content, region)
+        parsed_time = time.perf_counter()
+        index = DOMIndex(document)
+
+        self.last_timing = {
+            'backend': self.backend,
+            'region': region if self.backend != 'lxml.html' and self.strainer(region) else None,
+            'parse': parsed_time - start_time,
+            'index': time.perf_counter() - parsed_time,
+            'elements': index.size
+        }
+        logger.debug(f"Разбор страницы ({self.backend}): {self.last_timing['parse']:.3f} сек, "
+                     f"{index.size} элементов")
+
+        return index
@@ -0,0 +1,202 @@
+"""
+Page Waiter - модуль ожиданий по реальным сигналам готовности страницы
+"""
+
+import time
+import logging
+from typing import Dict, Any, List, Callable, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .cdp_events import get_event_log
+
+logger = logging.getLogger(__name__)
+
+# Наблюдатель за изменениями DOM; возвращает время (мс) с последней мутации
+DOM_QUIET_SCRIPT = """
+if (!window.__uxMutationObserver) {
+    window.__uxLastMutation = performance.now();
+    window.__uxMutationObserver = new MutationObserver(function() {
+        window.__uxLastMutation = performance.now();
+    });
+    window.__uxMutationObserver.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+return performance.now() - window.__uxLastMutation;
+"""
+
+# Метка перед действием: после нее страница либо сменилась (метки нет), либо менялся DOM
+MARK_PAGE_SCRIPT = DOM_QUIET_SCRIPT.replace('return performance.now() - window.__uxLastMutation;',
+                                            'window.__uxPageMark = performance.now();')
+PAGE_CHANGED_SCRIPT = """
+return !window.__uxPageMark || window.__uxLastMutation > window.__uxPageMark;
+"""
+
+RESOURCE_COUNT_SCRIPT = "return performance.getEntriesByType('resource').length;"
+
+DEFAULT_WAIT_CONFIG = {
+    'default_timeout': 10,
+    'poll_interval': 0.1,
+    'network_idle_time': 0.5,
+    'max_inflight_requests': 0,
+    'max_request_age': 4,  # Меньше default_timeout: долгие запросы исключаются до таймаута
+    'dom_quiet_time': 0.3
+}
+
+class PageWaiter:
+    """Ожидание готовности страницы вместо фиксированных пауз"""
+
+    def __init__(self, wait_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_WAIT_CONFIG, **(wait_config or {})}
+        self.records = []
+
+    def wait_for_ready_state(self, driver: WebDriver, timeout: Optional[float] = None,
+                             state: str = 'complete') -> Dict[str, Any]:
+        """Ожидание document.readyState"""
+        accepted = ('interactive', 'complete') if state == 'interactive' else ('complete',)
+
+        def check():
+            return driver.execute_script('return document.readyState') in accepted
+
+        return self._wait(f'ready_state:{state}', check, timeout)
+
+    def wait_for_network_idle(self, driver: WebDriver, timeout: Optional[float] = None,
+                              idle_time: Optional[float] = None) -> Dict[str, Any]:
+        """Ожидание простоя сети по событиям Network.* из DevTools"""
+        idle_time = self.settings['network_idle_time'] if idle_time is None else idle_time
+        event_log = get_event_log(driver)
+
+        if not event_log.available:
+            return self._wait_for_resource_idle(driver, timeout, idle_time)
+
+        # Запрос старше половины таймаута считается долгим, даже если max_request_age больше
+        max_age = min(self.settings['max_request_age'], self.settings['default_timeout'] / 2)
+
+        def check():
+            event_log.poll()
+            if not event_log.available:
+                return True
+            busy = event_log.inflight_count(max_age) > self.settings['max_inflight_requests']
+            return not busy and time.time() - event_log.last_network_activity >= idle_time
+
+        record = self._wait('network_idle', check, timeout)
+
+        if not event_log.available:
+            # Лог оказался недоступен - повтор по Resource Timing
+            self.records.remove(record)
+            return self._wait_for_resource_idle(driver, timeout, idle_time)
+
+        return record
+
+    def wait_for_dom_quiet(self, driver: WebDriver, timeout: Optional[float] = None,
+                           quiet_time: Optional[float] = None) -> Dict[str, Any]:
+        """Ожидание прекращения изменений DOM"""
+        quiet_time = self.settings['dom_quiet_time'] if quiet_time is None else quiet_time
+
+        def check():
+            return driver.execute_script(DOM_QUIET_SCRIPT) >= quiet_time * 1000
+
+        return self._wait('dom_quiet', check, timeout)
+
+    def wait_for_navigation(self, driver: WebDriver, previous_url: str,
+                            timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Ожидание смены адреса страницы после перехода"""
+
+        def check():
+            return driver.current_url != previous_url
+
+        return self._wait('navigation', check, timeout)
+
+    def wait_for_page(self, driver: WebDriver, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Ожидание загрузки страницы: readyState, простой сети и стабильный DOM"""
+        return self._wait_all('page_ready', driver, timeout, [
+            self.wait_for_ready_state,
+            self.wait_for_network_idle,
+            self.wait_for_dom_quiet
+        ])
+
+    def wait_for_update(self, driver: WebDriver, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Ожидание реакции страницы на действие пользователя (без перезагрузки)"""
+        return self._wait_all('page_update', driver, timeout, [
+            self.wait_for_network_idle,
+            self.wait_for_dom_quiet
+        ])
+
+    def mark_page(self, driver: WebDriver):
+        """Метка состояния страницы перед действием (см. page_changed)"""
+        driver.execute_script(MARK_PAGE_SCRIPT)
+
+    def page_changed(self, driver: WebDriver) -> bool:
+        """Был ли после mark_page переход на другую страницу или изменение DOM"""
+        try:
+            return bool(driver.execute_script(PAGE_CHANGED_SCRIPT))
+        except Exception:
+            # Документ еще загружается - переход был
+            return True
+
+    def pop_records(self) -> List[Dict[str, Any]]:
+        """Записи об ожиданиях с момента предыдущего вызова"""
+        records, self.records = self.records, []
+        return records
+
+    def _wait_all(self, name: str, driver: WebDriver, timeout: Optional[float],
+                  waits: List[Callable[..., Dict[str, Any]]]) -> Dict[str, Any]:
+        """Последовательные ожидания с общим таймаутом"""
+        timeout = self.settings['default_timeout'] if timeout is None else timeout
+        deadline = time.time() + timeout
+        start_time = time.time()
+
+        parts = []
+        for wait in waits:
+            result = wait(driver, timeout=max(0.0, deadline - time.time()))
+            self.records.remove(result)
+            parts.append(result)
+
+        record = self._record(name, time.time() - start_time, timeout, all(p['satisfied'] for p in parts))
+        record['parts'] = parts
+        return record
+
+    def _wait_for_resource_idle(self, driver: WebDriver, timeout: Optional[float],
+                                idle_time: float) -> Dict[str, Any]:
+        """Запасной вариант: число ресурсов в Resource Timing не меняется idle_time секунд"""
+        state = {'count': -1, 'changed_at': time.time()}
+
+        def check():
+            count = driver.execute_script(RESOURCE_COUNT_SCRIPT)
+            if count != state['count']:
+                state['count'] = count
+                state['changed_at'] = time.time()
+            return time.time() - state['changed_at'] >= idle_time
+
+        return self._wait('resource_idle', check, timeout)
+
+    def _wait(self, name: str, check: Callable[[], bool], timeout: Optional[float]) -> Dict[str, Any]:
+        """Опрос условия до выполнения или таймаута"""
+        timeout = self.settings['default_timeout'] if timeout is None else timeout
+        deadline = time.time() + timeout
+        start_time = time.time()
+
+        while True:
+            try:
+                if check():
+                    return self._record(name, time.time() - start_time, timeout, True)
+            except Exception:
+                # Страница могла смениться во время проверки - повторяем
+                pass
+
+            if time.time() >= deadline:
+                logger.warning(f"Ожидание {name} прервано по таймауту {timeout} сек")
+                return self._record(name, time.time() - start_time, timeout, False)
+
+            time.sleep(self.settings['poll_interval'])
+
+    def _record(self, name: str, waited: float, timeout: float, satisfied: bool) -> Dict[str, Any]:
+        """Сохранение записи об ожидании"""
+        record = {
+            'condition': name,
+            'waited': round(waited, 3),
+            'timeout': timeout,
+            'satisfied': satisfied
+        }
+        self.records.append(record)
+        return record
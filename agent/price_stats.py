@@ -0,0 +1,124 @@
+"""
+Price Stats - модуль разбора цен и статистики по ним (NumPy)
+"""
+
+import re
+import logging
+from typing import Dict, Any, List, Optional, Iterable, Union
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Первое число строки: разряды через пробел / неразрывный пробел ("5 000 ₽", "12 345,50"),
+# у диапазона ("5 000 – 7 500 ₽", "от 3 200") берется нижняя граница
+PRICE_LINE_PATTERN = re.compile(
+    r'^[^\d\n]*'
+    r'(?:(\d{1,3}(?:[ \u00a0\u202f\u2009]\d{3})+|\d+)(?:[.,](\d{1,2})(?!\d))?)?'
+    r'[^\n]*$',
+    re.MULTILINE
+)
+DIGIT_SEPARATORS = str.maketrans('', '', ' \u00a0\u202f\u2009')
+
+PERCENTILES = (10, 25, 75, 90)
+OUTLIER_IQR_FACTOR = 1.5  # Выбросы по Тьюки: за пределами [Q1 - k*IQR, Q3 + k*IQR]
+
+def parse_prices(texts: Iterable[str]) -> np.ndarray:
+    """Цены из текстов одним проходом регулярного выражения (NaN - цены в тексте нет)"""
+    lines = [' '.join(text.split('\n')) for text in texts]
+    if not lines:
+        return np.empty(0)
+
+    matches = PRICE_LINE_PATTERN.findall('\n'.join(lines))
+    return np.array([float(f"{whole.translate(DIGIT_SEPARATORS)}.{fraction or 0}") if whole else np.nan
+                     for whole, fraction in matches], dtype=float)
+
+def outlier_mask(prices: np.ndarray) -> np.ndarray:
+    """Признак выброса для каждой цены"""
+    if prices.size < 4:
+        return np.zeros(prices.shape, dtype=bool)
+
+    q1, q3 = np.percentile(prices, [25, 75])
+    spread = OUTLIER_IQR_FACTOR * (q3 - q1)
+    return (prices < q1 - spread) | (prices > q3 + spread)
+
+def histogram(prices: np.ndarray, buckets: int = 5) -> Dict[str, int]:
+    """Распределение по равным диапазонам от минимума до максимума (максимум - в последнем)"""
+    if prices.size == 0 or prices.max() <= prices.min():
+        return {}
+
+    counts, edges = np.histogram(prices, bins=buckets)
+    return {f'{int(start)}-{int(end)}': int(count) for start, end, count in zip(edges[:-1], edges[1:], counts)}
+
+def describe_prices(prices: np.ndarray, buckets: int = 5) -> Dict[str, Any]:
+    """Статистика цен (NaN не учитываются)"""
+    prices = prices[~np.isnan(prices)]
+    if prices.size == 0:
+        return {'count': 0, 'min': None, 'max': None, 'mean': None, 'median': None,
+                'percentiles': {}, 'histogram': {}, 'outliers': {'count': 0, 'low': [], 'high': []}}
+
+    mask = outlier_mask(prices)
+    median = np.median(prices)
+
+    return {
+        'count': int(prices.size),
+        'min': _number(prices.min()),
+        'max': _number(prices.max()),
+        'mean': _number(prices.mean()),
+        'median': _number(median),
+        'percentiles': {f'p{q}': _number(value) for q, value in zip(PERCENTILES, np.percentile(prices, PERCENTILES))},
+        'histogram': histogram(prices, buckets),
+        'outliers': {
+            'count': int(mask.sum()),
+            'low': [_number(value) for value in np.sort(prices[mask & (prices < median)])],
+            'high': [_number(value) for value in np.sort(prices[mask & (prices > median)])]
+        }
+    }
+
+def price_range_report(texts: Iterable[str]) -> Dict[str, Any]:
+    """Раздел price_range анализа выдачи по текстам цен"""
+    stats = describe_prices(parse_prices(texts))
+
+    return {
+        'min_price': stats['min'],
+        'max_price': stats['max'],
+        'median_price': stats['median'],
+        'percentiles': stats['percentiles'],
+        'price_distribution': stats['histogram'],
+        'outliers': stats['outliers']
+    }
+
+def average_price(texts: Iterable[str]) -> Union[int, float]:
+    """Средняя цена по текстам (0, если цен нет)"""
+    prices = parse_prices(texts)
+    prices = prices[~np.isnan(prices)]
+    return float(prices.mean()) if prices.size else 0
+
+def summarize_runs(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Сравнение цен выдачи между прогонами (медиана каждого прогона, выбросы среди прогонов)"""
+    jobs = []
+    for record in records:
+        for step in record.get('steps', []):
+            price_range = (step.get('analysis') or {}).get('price_range')
+            if price_range and price_range.get('median_price') is not None:
+                jobs.append((record.get('job_id'), price_range))
+                break
+
+    if not jobs:
+        return {'jobs_with_prices': 0}
+
+    medians = np.array([price_range['median_price'] for _, price_range in jobs], dtype=float)
+    mask = outlier_mask(medians)
+
+    return {
+        'jobs_with_prices': len(jobs),
+        'median_of_medians': _number(np.median(medians)),
+        'median_spread': describe_prices(medians)['percentiles'],
+        'min_price': _number(np.min([price_range['min_price'] for _, price_range in jobs])),
+        'max_price': _number(np.max([price_range['max_price'] for _, price_range in jobs])),
+        'outlier_jobs': [job_id for (job_id, _), outlier in zip(jobs, mask) if outlier]
+    }
+
+def _number(value: Any) -> Optional[Union[int, float]]:
+    """Число NumPy как int (целые цены) или float"""
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 2)
@@ -0,0 +1,278 @@
+"""
+Results Crawler - модуль обхода всей выдачи (бесконечная прокрутка и пагинация)
+"""
+
+import json
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable
+import numpy as np
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .page_waiter import PageWaiter
+from .price_stats import parse_prices, describe_prices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CRAWL_CONFIG = {
+    'enabled': False,
+    'max_pages': 20,  # Страниц пагинации (и нажатий "Показать еще")
+    'max_cards': 2000,  # Уникальных отелей за обход
+    'max_scrolls': 200,  # Прокруток за обход
+    'stall_rounds': 2,  # Прокруток без новых карточек до перехода на следующую страницу
+    'card_selector': '.hotel-card, .hotel-item, .result-item',
+    'next_selectors': ['.pagination a.next', 'a[rel="next"]', '.pagination .next', '.load-more', '.show-more'],
+    'output': None,  # Папка для JSONL с карточками (None - карточки не сохраняются)
+    'sample_size': 10  # Карточек в результате шага
+}
+
+# Наблюдатель за выдачей: новые карточки попадают в очередь, прочитанные помечаются
+# атрибутом и больше не возвращаются. При перерисовке выдачи (SPA) наблюдатель
+# подхватывает новые узлы; после перехода на другую страницу ставится заново.
+INSTALL_TRACKER_SCRIPT = """
+var selector = arguments[0];
+var tracker = window.__uxCrawler;
+if (tracker && tracker.selector === selector && tracker.root === document.body) {
+    return false;
+}
+if (tracker) {
+    tracker.observer.disconnect();
+}
+
+tracker = window.__uxCrawler = {selector: selector, root: document.body, queue: []};
+
+function collect(node) {
+    if (node.nodeType !== 1) {
+        return;
+    }
+    var cards = node.matches(selector) ? [node] : node.querySelectorAll(selector);
+    for (var i = 0; i < cards.length; i++) {
+        if (!cards[i].hasAttribute('data-ux-crawled')) {
+            cards[i].setAttribute('data-ux-crawled', '0');
+            tracker.queue.push(cards[i]);
+        }
+    }
+}
+
+tracker.observer = new MutationObserver(function (mutations) {
+    for (var i = 0; i < mutations.length; i++) {
+        for (var j = 0; j < mutations[i].addedNodes.length; j++) {
+            collect(mutations[i].addedNodes[j]);
+        }
+    }
+});
+tracker.observer.observe(document.body, {childList: true, subtree: true});
+collect(document.body);
+return true;
+"""
+
+# Карточки, добавленные с прошлого чтения (очередь очищается)
+READ_NEW_CARDS_SCRIPT = """
+var tracker = window.__uxCrawler;
+if (!tracker) {
+    return null;
+}
+
+function text(card, selector) {
+    var element = card.querySelector(selector);
+    return element ? element.textContent.trim() : '';
+}
+
+function stars(card) {
+    var element = card.querySelector('[class*="stars-"]');
+    var match = element && element.className.match(/stars-(\\d)/);
+    return match ? Number(match[1]) : null;
+}
+
+var queue = tracker.queue;
+tracker.queue = [];
+var cards = [];
+for (var i = 0; i < queue.length; i++) {
+    var card = queue[i];
+    if (!card.isConnected) {
+        continue;
+    }
+    card.setAttribute('data-ux-crawled', '1');
+    var link = card.dataset.href || card.getAttribute('href') || '';
+    if (!link) {
+        var anchor = card.querySelector('a[href]');
+        link = anchor ? anchor.getAttribute('href') : '';
+    }
+    cards.push({
+        id: card.dataset.id || card.dataset.hotelId || '',
+        url: link ? new URL(link, location.href).href : '',
+        name: text(card, '.hotel-name, h3, h2'),
+        price: text(card, '.price, .cost'),
+        rating: text(card, '.rating, .stars'),
+        stars: stars(card),
+        distance: text(card, '.distance, .location-distance'),
+        amenities: text(card, '.amenities, .facilities'),
+        features: text(card, '.badges, .badge, .cancellation, .free-cancellation')
+    });
+}
+return cards;
+"""
+
+# Прокрутка к концу выдачи: высота документа нужна, чтобы заметить догрузку
+SCROLL_SCRIPT = """
+var cards = document.querySelectorAll(arguments[0]);
+if (cards.length) {
+    cards[cards.length - 1].scrollIntoView({block: 'end'});
+}
+window.scrollTo(0, document.documentElement.scrollHeight);
+return document.documentElement.scrollHeight;
+"""
+
+# Переход на следующую страницу выдачи или догрузка кнопкой
+NEXT_PAGE_SCRIPT = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var nodes = document.querySelectorAll(selectors[i]);
+    for (var j = 0; j < nodes.length; j++) {
+        var element = nodes[j];
+        var rect = element.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0 || element.disabled ||
+                element.classList.contains('disabled') || element.getAttribute('aria-disabled') === 'true') {
+            continue;
+        }
+        element.click();
+        return {selector: selectors[i], href: element.getAttribute('href') || ''};
+    }
+}
+return null;
+"""
+
+class ResultsCrawler:
+    """Обход выдачи целиком с извлечением только новых карточек
+
+    Карточки передаются в sink (и в JSONL-файл) по мере чтения и не копятся
+    в памяти: для дедупликации хранятся только ключи отелей, для статистики -
+    массив цен.
+    """
+
+    def __init__(self, crawl_config: Optional[Dict[str, Any]] = None, waiter: Optional[PageWaiter] = None):
+        self.settings = {**DEFAULT_CRAWL_CONFIG, **(crawl_config or {})}
+        self.waiter = waiter or PageWaiter()
+
+    def crawl(self, driver: WebDriver, sink: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Обход выдачи с текущей страницы до исчерпания или ограничений"""
+        start_time = time.time()
+        seen = set()
+        prices = []
+        sample = []
+        stats = {'pages_visited': 1, 'scrolls': 0, 'reads': 0, 'cards_read': 0, 'duplicates': 0, 'largest_batch': 0}
+        stop_reason = 'exhausted'
+
+        output_path = self._output_path()
+        output = open(output_path, 'w', encoding='utf-8') if output_path else None
+
+        try:
+            driver.execute_script(INSTALL_TRACKER_SCRIPT, self.settings['card_selector'])
+            stalled = 0
+
+            while True:
+                batch = driver.execute_script(READ_NEW_CARDS_SCRIPT)
+                if batch is None:
+                    # Страница сменилась без нашего участия - наблюдатель ставится заново
+                    driver.execute_script(INSTALL_TRACKER_SCRIPT, self.settings['card_selector'])
+                    batch = driver.execute_script(READ_NEW_CARDS_SCRIPT) or []
+
+                stats['reads'] += 1
+                stats['cards_read'] += len(batch)
+                stats['largest_batch'] = max(stats['largest_batch'], len(batch))
+
+                fresh = []
+                for card in batch:
+                    key = card['id'] or card['url'] or f"{card['name']}|{card['price']}"
+                    if key in seen:
+                        stats['duplicates'] += 1
+                        continue
+                    seen.add(key)
+                    fresh.append(card)
+
+                    if sink:
+                        sink(card)
+                    if output:
+                        output.write(json.dumps(card, ensure_ascii=False) + '\n')
+                    if len(sample) < self.settings['sample_size']:
+                        sample.append(card)
+
+                    if len(seen) >= self.settings['max_cards']:
+                        break
+
+                if fresh:
+                    prices.append(parse_prices(card['price'] for card in fresh))
+
+                if len(seen) >= self.settings['max_cards']:
+                    stop_reason = 'max_cards'
+                    break
+
+                # Повторно отданные (перерисованные) карточки не считаются догрузкой
+                stalled = 0 if fresh else stalled + 1
+
+                if stalled < self.settings['stall_rounds']:
+                    if stats['scrolls'] >= self.settings['max_scrolls']:
+                        stop_reason = 'max_scrolls'
+                        break
+                    # Прокрутка: бесконечная выдача догружает карточки сама
+                    driver.execute_script(SCROLL_SCRIPT, self.settings['card_selector'])
+                    stats['scrolls'] += 1
+                    self.waiter.wait_for_update(driver)
+                    continue
+
+                if stats['pages_visited'] >= self.settings['max_pages']:
+                    stop_reason = 'max_pages'
+                    break
+
+                if not self._next_page(driver):
+                    break
+
+                stats['pages_visited'] += 1
+                stalled = 0
+
+        finally:
+            if output:
+                output.close()
+
+        all_prices = np.concatenate(prices) if prices else np.empty(0)
+        logger.info(f"Обход выдачи: {len(seen)} отелей на {stats['pages_visited']} страницах ({stop_reason})")
+
+        return {
+            **stats,
+            'unique_hotels': len(seen),
+            'stop_reason': stop_reason,
+            'prices': describe_prices(all_prices),
+            'sample': sample,
+            'output': str(output_path) if output_path else None,
+            'duration': time.time() - start_time
+        }
+
+    def _next_page(self, driver: WebDriver) -> bool:
+        """Нажатие "Далее" / "Показать еще" и ожидание новой выдачи"""
+        url = driver.current_url
+        clicked = driver.execute_script(NEXT_PAGE_SCRIPT, self.settings['next_selectors'])
+        if not clicked:
+            return False
+
+        logger.debug(f"Следующая страница выдачи: {clicked['selector']} {clicked['href']}")
+
+        if clicked['href'] and not clicked['href'].startswith('#'):
+            # Обычная пагинация: ждем смены документа, затем ставим наблюдатель заново
+            self.waiter.wait_for_navigation(driver, url)
+            self.waiter.wait_for_page(driver)
+            driver.execute_script(INSTALL_TRACKER_SCRIPT, self.settings['card_selector'])
+        else:
+            self.waiter.wait_for_update(driver)
+
+        return True
+
+    def _output_path(self) -> Optional[Path]:
+        """Файл JSONL для карточек обхода"""
+        if not self.settings['output']:
+            return None
+
+        directory = Path(self.settings['output'])
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f'hotels_{datetime.now().strftime("%Y%m%d_%H%M%S_%f")}.jsonl'
@@ -4,58 +4,64 @@ Scenario Executor - модуль для выполнения пользоват
 
 import time
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional, Tuple
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
+
+from .page_waiter import PageWaiter
+from .selector_probe import SelectorProbe
+from .selector_index import SelectorIndex
+from .element_lookup import ElementLookup
+from .page_metrics import PageMetrics
+from .step_instrumentation import StepInstrumentation
+from .filter_explorer import FilterExplorer
+from .results_crawler import ResultsCrawler
+from .checkpoints import CheckpointStore, ScenarioCheckpoint, capture_browser_state, restore_browser_state
 
 logger = logging.getLogger(__name__)
 
 class ScenarioExecutor:
     """Исполнитель сценариев пользовательского опыта"""
     
-    def __init__(self):
+    def __init__(self, waiter: Optional[PageWaiter] = None, lookup: Optional[ElementLookup] = None,
+                 metrics: Optional[PageMetrics] = None, checkpoints: Optional[CheckpointStore] = None,
+                 filter_explorer: Optional[FilterExplorer] = None, crawler: Optional[ResultsCrawler] = None,
+                 selector_index: Optional[SelectorIndex] = None, selectors: Optional[Dict[str, str]] = None):
         self.wait_timeout = 10
+        self.waiter = waiter or PageWaiter()
+        self.lookup = lookup or ElementLookup()
+        self.metrics = metrics or PageMetrics()
+        self.probe = SelectorProbe(self.waiter.settings['poll_interval'], selector_index)
+        self.instrumentation = StepInstrumentation(self.waiter, self.lookup, self.metrics, self.probe)
+        self.selectors = selectors or {}
+        self.checkpoints = checkpoints
+        self.filter_explorer = filter_explorer or FilterExplorer()
+        self.crawler = crawler
         
     def execute_search_scenario(self, driver: WebDriver, scenario_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Выполнение сценария поиска отелей"""
         
+        # Последний элемент - переживает ли состояние после шага перезагрузку страницы
+        plan = [
+            (self._search_destination, (scenario_config['destination'],), False),
+            (self._select_dates, (scenario_config['check_in'], scenario_config['check_out']), False),
+            (self._configure_guests, (scenario_config['guests'], scenario_config['rooms']), False),
+            (self._search_hotels, (), True),
+            (self._analyze_results, (), True)
+        ]
+        
+        # Обход всей выдачи уводит со страницы результатов, поэтому идет последним
+        if self.crawler:
+            plan.append((self._crawl_results, (), False))
+        
+        checkpoint = self._open_checkpoint('search', scenario_config, plan)
+        
         steps = []
         
         try:
-            # Шаг 1: Поиск направления
-            step1 = self._search_destination(driver, scenario_config['destination'])
-            steps.append(step1)
-            
-            if not step1['success']:
-                return steps
-                
-            # Шаг 2: Выбор дат
-            step2 = self._select_dates(driver, scenario_config['check_in'], scenario_config['check_out'])
-            steps.append(step2)
-            
-            if not step2['success']:
-                return steps
-                
-            # Шаг 3: Настройка гостей
-            step3 = self._configure_guests(driver, scenario_config['guests'], scenario_config['rooms'])
-            steps.append(step3)
-            
-            if not step3['success']:
-                return steps
-                
-            # Шаг 4: Поиск отелей
-            step4 = self._search_hotels(driver)
-            steps.append(step4)
-            
-            if not step4['success']:
-                return steps
-                
-            # Шаг 5: Анализ результатов
-            step5 = self._analyze_results(driver)
-            steps.append(step5)
+            self._execute_plan(driver, plan, steps, checkpoint)
             
         except Exception as e:
             logger.error(f"Ошибка при выполнении сценария поиска: {e}")
@@ -68,30 +74,49 @@ class ScenarioExecutor:
             
         return steps
         
-    def execute_filtering_scenario(self, driver: WebDriver) -> List[Dict[str, Any]]:
-        """Выполнение сценария работы с фильтрами"""
+    def execute_filtering_scenario(self, driver: WebDriver, parallel_tabs: Optional[int] = None,
+                                   combinations: Optional[List[List[str]]] = None,
+                                   requirement_sets: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Выполнение сценария работы с фильтрами
+        
+        С parallel_tabs (или config['filter_exploration']['parallel_tabs']) фильтры
+        и их комбинации применяются одновременно в отдельных вкладках выдачи.
+        requirement_sets ({сценарий: requirements}) добавляет перебор комбинаций
+        фильтров, выполняющих требования сценариев.
+        """
         
         steps = []
+        parallel_tabs = self.filter_explorer.settings['parallel_tabs'] if parallel_tabs is None else parallel_tabs
         
         try:
             # Шаг 1: Анализ доступных фильтров
-            step1 = self._analyze_available_filters(driver)
+            step1 = self._run_step(self._analyze_available_filters, driver)
             steps.append(step1)
             
+            if requirement_sets:
+                # Перебор комбинаций под требования сценариев
+                steps.append(self._run_step(self._explore_requirements, driver, requirement_sets, parallel_tabs))
+                
+            if parallel_tabs:
+                # Шаг 2: Все комбинации фильтров в параллельных вкладках
+                step2 = self._run_step(self._explore_filters, driver, parallel_tabs, combinations)
+                steps.append(step2)
+                return steps
+                
             # Шаг 2: Применение фильтра по цене
-            step2 = self._apply_price_filter(driver)
+            step2 = self._run_step(self._apply_price_filter, driver)
             steps.append(step2)
             
             # Шаг 3: Применение фильтра по звездам
-            step3 = self._apply_star_filter(driver)
+            step3 = self._run_step(self._apply_star_filter, driver)
             steps.append(step3)
             
             # Шаг 4: Применение фильтра по удобствам
-            step4 = self._apply_amenity_filter(driver)
+            step4 = self._run_step(self._apply_amenity_filter, driver)
             steps.append(step4)
             
             # Шаг 5: Анализ результатов фильтрации
-            step5 = self._analyze_filtered_results(driver)
+            step5 = self._run_step(self._analyze_filtered_results, driver)
             steps.append(step5)
             
         except Exception as e:
@@ -108,33 +133,20 @@ class ScenarioExecutor:
     def execute_booking_scenario(self, driver: WebDriver) -> List[Dict[str, Any]]:
         """Выполнение сценария бронирования"""
         
+        plan = [
+            (self._select_hotel, (), True),
+            (self._select_room, (), True),
+            (self._fill_guest_info, (), False),
+            (self._analyze_payment_process, (), False)
+        ]
+        
+        # Бронирование продолжает выдачу, с которой оно началось
+        checkpoint = self._open_checkpoint('booking', {'url': driver.current_url}, plan)
+        
         steps = []
         
         try:
-            # Шаг 1: Выбор отеля
-            step1 = self._select_hotel(driver)
-            steps.append(step1)
-            
-            if not step1['success']:
-                return steps
-                
-            # Шаг 2: Выбор номера
-            step2 = self._select_room(driver)
-            steps.append(step2)
-            
-            if not step2['success']:
-                return steps
-                
-            # Шаг 3: Заполнение данных гостей
-            step3 = self._fill_guest_info(driver)
-            steps.append(step3)
-            
-            if not step3['success']:
-                return steps
-                
-            # Шаг 4: Анализ процесса оплаты
-            step4 = self._analyze_payment_process(driver)
-            steps.append(step4)
+            self._execute_plan(driver, plan, steps, checkpoint)
             
         except Exception as e:
             logger.error(f"Ошибка при выполнении сценария бронирования: {e}")
@@ -147,6 +159,94 @@ class ScenarioExecutor:
             
         return steps
         
+    def _open_checkpoint(self, kind: str, identity: Dict[str, Any],
+                         plan: List[Tuple[Callable[..., Dict[str, Any]], tuple, bool]]) -> Optional[ScenarioCheckpoint]:
+        """Контрольная точка сценария с этими параметрами и этим набором шагов
+        
+        Состав плана зависит от настроек (например, обхода выдачи), поэтому
+        точка, сохраненная для другого плана, не продолжается.
+        """
+        if not self.checkpoints:
+            return None
+        actions = [step_func.__name__ for step_func, _, _ in plan]
+        return self.checkpoints.open(kind, {'identity': identity, 'plan': actions})
+        
+    def _execute_plan(self, driver: WebDriver, plan: List[Tuple[Callable[..., Dict[str, Any]], tuple, bool]],
+                      steps: List[Dict[str, Any]], checkpoint: Optional[ScenarioCheckpoint] = None):
+        """Последовательное выполнение шагов (в steps) до первой ошибки
+        
+        С контрольной точкой выполнение продолжается с последнего восстановимого
+        шага прошлого прогона, а упавший шаг повторяется с этой точки.
+        """
+        if checkpoint:
+            if checkpoint.has_progress:
+                resumed, state = checkpoint.resume_point()
+                restore_browser_state(driver, state, self.waiter)
+                steps[:] = [{**step, 'resumed': True} for step in resumed]
+                logger.info(f"Продолжение сценария с контрольной точки: пропущено шагов - {len(steps)}")
+            else:
+                checkpoint.start(capture_browser_state(driver))
+        
+        retries_left = self.checkpoints.retries if checkpoint else 0
+        failed_attempts = []
+        
+        while len(steps) < len(plan):
+            step_func, args, restorable = plan[len(steps)]
+            step = self._run_step(step_func, driver, *args)
+            
+            if step['success']:
+                if failed_attempts:
+                    step['failed_attempts'] = failed_attempts
+                    failed_attempts = []
+                steps.append(step)
+                if checkpoint:
+                    checkpoint.record(step, capture_browser_state(driver) if restorable else None)
+                continue
+                
+            if retries_left <= 0:
+                if failed_attempts:
+                    step['failed_attempts'] = failed_attempts
+                steps.append(step)
+                return
+                
+            # Повтор с последней контрольной точки вместо перезапуска всего сценария
+            retries_left -= 1
+            failed_attempts.append({'error': step.get('error'), 'duration': step.get('duration')})
+            logger.warning(f"Шаг {step['action']} не выполнен, повтор с контрольной точки")
+            
+            resumed, state = checkpoint.resume_point()
+            restore_browser_state(driver, state, self.waiter)
+            # Шаги до точки в этой попытке не выполнялись - как и при продолжении прошлого прогона
+            steps[:] = [{**step, 'resumed': True} for step in resumed]
+            
+        if checkpoint:
+            checkpoint.clear()
+        
+    def _candidates(self, target: str, selectors: List[str]) -> List[str]:
+        """Кандидаты цели: селектор из config['selectors'] первым, затем запасные"""
+        configured = self.selectors.get(target)
+        return list(dict.fromkeys([configured, *selectors])) if configured else selectors
+        
+    def _click(self, driver: WebDriver, element, target: str, wait: Callable[[WebDriver], Any]) -> None:
+        """Клик по элементу цели и ожидание реакции
+        
+        Если элемент найден эвристикой, его селектор запоминается, только когда
+        клик привел к переходу или изменению страницы.
+        """
+        pending = self.probe.has_pending_learn(target)
+        if pending:
+            self.waiter.mark_page(driver)
+        element.click()
+        wait(driver)
+        if pending:
+            self.probe.confirm_learn(target, self.waiter.page_changed(driver))
+        
+    def _run_step(self, step_func: Callable[..., Dict[str, Any]], driver: WebDriver, *args) -> Dict[str, Any]:
+        """Выполнение шага с учетом ожиданий, поисков элементов и сетевой активности"""
+        self.instrumentation.begin(driver)
+        step = step_func(driver, *args)
+        return self.instrumentation.end(driver, step)
+        
     def _search_destination(self, driver: WebDriver, destination: str) -> Dict[str, Any]:
         """Поиск направления"""
         start_time = time.time()
@@ -163,15 +263,10 @@ class ScenarioExecutor:
                 '#search-input'
             ]
             
-            search_box = None
-            for selector in search_selectors:
-                try:
-                    search_box = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    break
-                except:
-                    continue
+            # Все кандидаты проверяются одним запросом на итерацию ожидания
+            match = self.probe.wait_for(driver, self._candidates('search_box', search_selectors), timeout=5,
+                                        target='search_box')
+            search_box = match['element']
                     
             if not search_box:
                 return {
@@ -186,22 +281,22 @@ class ScenarioExecutor:
             # Очистка поля и ввод направления
             search_box.clear()
             search_box.send_keys(destination)
-            time.sleep(1)
+            if self.probe.has_pending_learn('search_box'):
+                # Поле найдено эвристикой: подтверждается, если приняло введенный текст
+                self.probe.confirm_learn('search_box', destination in (search_box.get_attribute('value') or ''))
             
             # Ожидание появления предложений
-            try:
-                suggestions = WebDriverWait(driver, 3).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, '.suggestion, .autocomplete-item, .dropdown-item'))
-                )
+            suggestion = self.probe.wait_for(driver, ['.suggestion', '.autocomplete-item', '.dropdown-item'], timeout=3,
+                                             target='suggestion')
+            
+            if suggestion['found']:
+                suggestion['element'].click()
+                self.waiter.wait_for_update(driver)
                 
-                if suggestions:
-                    suggestions[0].click()
-                    time.sleep(1)
-                    
-            except:
+            else:
                 # Если предложения не появились, нажимаем Enter
                 search_box.send_keys(Keys.ENTER)
-                time.sleep(1)
+                self.waiter.wait_for_update(driver)
                 
             return {
                 'action': 'search_destination',
@@ -240,7 +335,7 @@ class ScenarioExecutor:
             date_inputs = []
             for selector in date_selectors:
                 try:
-                    inputs = driver.find_elements(By.CSS_SELECTOR, selector)
+                    inputs = self.lookup.find_optional(driver, selector)
                     date_inputs.extend(inputs)
                 except:
                     continue
@@ -249,12 +344,12 @@ class ScenarioExecutor:
                 # Заполнение даты заезда
                 date_inputs[0].clear()
                 date_inputs[0].send_keys(check_in)
-                time.sleep(0.5)
+                self.waiter.wait_for_dom_quiet(driver)
                 
                 # Заполнение даты выезда
                 date_inputs[1].clear()
                 date_inputs[1].send_keys(check_out)
-                time.sleep(0.5)
+                self.waiter.wait_for_dom_quiet(driver)
                 
             else:
                 # Альтернативный способ - клик по календарю
@@ -264,14 +359,10 @@ class ScenarioExecutor:
                     '.date-selector'
                 ]
                 
-                for selector in calendar_selectors:
-                    try:
-                        calendar = driver.find_element(By.CSS_SELECTOR, selector)
-                        calendar.click()
-                        time.sleep(1)
-                        break
-                    except:
-                        continue
+                match = self.probe.probe(driver, self._candidates('date_picker', calendar_selectors),
+                                         target='date_picker')
+                if match['found']:
+                    self._click(driver, match['element'], 'date_picker', self.waiter.wait_for_dom_quiet)
                         
             return {
                 'action': 'select_dates',
@@ -309,29 +400,24 @@ class ScenarioExecutor:
                 '.rooms-input'
             ]
             
-            for selector in guest_selectors:
-                try:
-                    guest_element = driver.find_element(By.CSS_SELECTOR, selector)
-                    guest_element.click()
-                    time.sleep(1)
+            match = self.probe.probe(driver, self._candidates('guests_selector', guest_selectors),
+                                     target='guests_selector')
+            if match['found']:
+                self._click(driver, match['element'], 'guests_selector', self.waiter.wait_for_dom_quiet)
+                
+                # Попытка установить количество гостей
+                guest_inputs = self.lookup.find_optional(driver, 'input[type="number"], .guest-count')
+                if guest_inputs:
+                    guest_inputs[0].clear()
+                    guest_inputs[0].send_keys(str(guests))
+                    self.waiter.wait_for_dom_quiet(driver)
                     
-                    # Попытка установить количество гостей
-                    guest_inputs = driver.find_elements(By.CSS_SELECTOR, 'input[type="number"], .guest-count')
-                    if guest_inputs:
-                        guest_inputs[0].clear()
-                        guest_inputs[0].send_keys(str(guests))
-                        time.sleep(0.5)
-                        
-                    # Попытка установить количество комнат
-                    room_inputs = driver.find_elements(By.CSS_SELECTOR, '.room-count, .rooms-count')
-                    if room_inputs:
-                        room_inputs[0].clear()
-                        room_inputs[0].send_keys(str(rooms))
-                        time.sleep(0.5)
-                        
-                    break
-                except:
-                    continue
+                # Попытка установить количество комнат
+                room_inputs = self.lookup.find_optional(driver, '.room-count, .rooms-count')
+                if room_inputs:
+                    room_inputs[0].clear()
+                    room_inputs[0].send_keys(str(rooms))
+                    self.waiter.wait_for_dom_quiet(driver)
                     
             return {
                 'action': 'configure_guests',
@@ -369,24 +455,19 @@ class ScenarioExecutor:
                 '.search-btn'
             ]
             
-            search_button = None
-            for selector in search_button_selectors:
-                try:
-                    search_button = driver.find_element(By.CSS_SELECTOR, selector)
-                    break
-                except:
-                    continue
+            search_button = self.probe.probe(driver, self._candidates('search_button', search_button_selectors),
+                                             target='search_button')['element']
                     
             if search_button:
-                search_button.click()
+                self._click(driver, search_button, 'search_button', self.waiter.wait_for_page)
             else:
                 # Альтернатива - нажатие Enter в поле поиска
-                search_inputs = driver.find_elements(By.CSS_SELECTOR, 'input[name*="query"], input[placeholder*="поиск"]')
+                search_inputs = self.lookup.find_optional(driver, 'input[name*="query"], input[placeholder*="поиск"]')
                 if search_inputs:
                     search_inputs[0].send_keys(Keys.ENTER)
                     
             # Ожидание загрузки результатов
-            time.sleep(3)
+            self.waiter.wait_for_page(driver)
             
             return {
                 'action': 'search_hotels',
@@ -416,13 +497,13 @@ class ScenarioExecutor:
             page_source = driver.page_source
             
             # Подсчет отелей
-            hotel_cards = driver.find_elements(By.CSS_SELECTOR, '.hotel-card, .hotel-item, .result-item')
+            hotel_cards = self.lookup.find_optional(driver, '.hotel-card, .hotel-item, .result-item')
             
             # Анализ фильтров
-            filters = driver.find_elements(By.CSS_SELECTOR, '.filter, .facet, .filter-option')
+            filters = self.lookup.find_optional(driver, '.filter, .facet, .filter-option')
             
             # Анализ сортировки
-            sort_options = driver.find_elements(By.CSS_SELECTOR, '.sort, .sort-option, .order-by')
+            sort_options = self.lookup.find_optional(driver, '.sort, .sort-option, .order-by')
             
             analysis = {
                 'hotels_count': len(hotel_cards),
@@ -450,6 +531,32 @@ class ScenarioExecutor:
                 'duration': time.time() - start_time
             }
             
+    def _crawl_results(self, driver: WebDriver) -> Dict[str, Any]:
+        """Обход всей выдачи с прокруткой и пагинацией"""
+        start_time = time.time()
+        
+        try:
+            logger.info("Обход всей выдачи")
+            crawl = self.crawler.crawl(driver)
+            
+            return {
+                'action': 'crawl_results',
+                'analysis': crawl,
+                'success': True,
+                'timestamp': time.time(),
+                'duration': time.time() - start_time
+            }
+            
+        except Exception as e:
+            logger.error(f"Ошибка при обходе выдачи: {e}")
+            return {
+                'action': 'crawl_results',
+                'success': False,
+                'error': str(e),
+                'timestamp': time.time(),
+                'duration': time.time() - start_time
+            }
+            
     def _analyze_available_filters(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ доступных фильтров"""
         start_time = time.time()
@@ -465,7 +572,7 @@ class ScenarioExecutor:
             }
             
             # Поиск различных типов фильтров
-            filter_elements = driver.find_elements(By.CSS_SELECTOR, '.filter, .facet, .filter-option')
+            filter_elements = self.lookup.find_optional(driver, '.filter, .facet, .filter-option')
             
             for element in filter_elements:
                 filter_text = element.text.strip()
@@ -497,6 +604,67 @@ class ScenarioExecutor:
                 'duration': time.time() - start_time
             }
             
+    def _explore_filters(self, driver: WebDriver, parallel_tabs: int,
+                         combinations: Optional[List[List[str]]]) -> Dict[str, Any]:
+        """Применение комбинаций фильтров в отдельных вкладках"""
+        start_time = time.time()
+        
+        try:
+            exploration = self.filter_explorer.explore(driver, combinations, parallel_tabs)
+            
+            step = {
+                'action': 'explore_filters',
+                'analysis': exploration,
+                'success': exploration['combinations_succeeded'] > 0,
+                'timestamp': time.time(),
+                'duration': time.time() - start_time
+            }
+            if exploration['errors']:
+                step['errors'] = exploration['errors']
+            if not step['success']:
+                step['error'] = 'Ни одна комбинация фильтров не проверена'
+            return step
+            
+        except Exception as e:
+            logger.error(f"Ошибка при проверке комбинаций фильтров: {e}")
+            return {
+                'action': 'explore_filters',
+                'success': False,
+                'error': str(e),
+                'timestamp': time.time(),
+                'duration': time.time() - start_time
+            }
+            
+    def _explore_requirements(self, driver: WebDriver, requirement_sets: Dict[str, Dict[str, Any]],
+                              parallel_tabs: int) -> Dict[str, Any]:
+        """Поиск комбинаций фильтров, выполняющих наборы требований"""
+        start_time = time.time()
+        
+        try:
+            exploration = self.filter_explorer.explore_requirements(driver, requirement_sets, parallel_tabs or None)
+            error = self.filter_explorer.requirements_error(exploration)
+            
+            step = {
+                'action': 'explore_requirements',
+                'analysis': exploration,
+                'success': error is None,
+                'timestamp': time.time(),
+                'duration': time.time() - start_time
+            }
+            if error:
+                step['error'] = error
+            return step
+            
+        except Exception as e:
+            logger.error(f"Ошибка при переборе фильтров по требованиям: {e}")
+            return {
+                'action': 'explore_requirements',
+                'success': False,
+                'error': str(e),
+                'timestamp': time.time(),
+                'duration': time.time() - start_time
+            }
+            
     def _apply_price_filter(self, driver: WebDriver) -> Dict[str, Any]:
         """Применение фильтра по цене"""
         start_time = time.time()
@@ -511,22 +679,16 @@ class ScenarioExecutor:
                 '[data-filter="price"]'
             ]
             
-            for selector in price_filter_selectors:
-                try:
-                    price_filter = driver.find_element(By.CSS_SELECTOR, selector)
-                    price_filter.click()
-                    time.sleep(1)
-                    
-                    # Попытка установить диапазон цен
-                    price_inputs = driver.find_elements(By.CSS_SELECTOR, 'input[type="range"], .price-range input')
-                    if price_inputs:
-                        # Установка максимальной цены
-                        price_inputs[0].send_keys("5000")
-                        time.sleep(0.5)
-                        
-                    break
-                except:
-                    continue
+            match = self.probe.probe(driver, price_filter_selectors, target='price_filter')
+            if match['found']:
+                self._click(driver, match['element'], 'price_filter', self.waiter.wait_for_update)
+                
+                # Попытка установить диапазон цен
+                price_inputs = self.lookup.find_optional(driver, 'input[type="range"], .price-range input')
+                if price_inputs:
+                    # Установка максимальной цены
+                    price_inputs[0].send_keys("5000")
+                    self.waiter.wait_for_update(driver)
                     
             return {
                 'action': 'apply_price_filter',
@@ -559,16 +721,10 @@ class ScenarioExecutor:
                 '[data-filter="stars"]'
             ]
             
-            for selector in star_filter_selectors:
-                try:
-                    star_filters = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if star_filters:
-                        # Выбор 4-5 звезд
-                        star_filters[0].click()
-                        time.sleep(1)
-                        break
-                except:
-                    continue
+            match = self.probe.probe(driver, star_filter_selectors, target='star_filter')
+            if match['found']:
+                # Выбор 4-5 звезд
+                self._click(driver, match['element'], 'star_filter', self.waiter.wait_for_update)
                     
             return {
                 'action': 'apply_star_filter',
@@ -601,19 +757,13 @@ class ScenarioExecutor:
                 '[data-filter="amenities"]'
             ]
             
-            for selector in amenity_filter_selectors:
-                try:
-                    amenity_filters = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if amenity_filters:
-                        # Выбор Wi-Fi
-                        for filter in amenity_filters:
-                            if 'wi-fi' in filter.text.lower() or 'wifi' in filter.text.lower():
-                                filter.click()
-                                time.sleep(1)
-                                break
-                        break
-                except:
-                    continue
+            match = self.probe.probe(driver, amenity_filter_selectors, all_matches=True, target='amenity_filter')
+            
+            # Выбор Wi-Fi
+            for filter in match['elements']:
+                if 'wi-fi' in filter.text.lower() or 'wifi' in filter.text.lower():
+                    self._click(driver, filter, 'amenity_filter', self.waiter.wait_for_update)
+                    break
                     
             return {
                 'action': 'apply_amenity_filter',
@@ -640,13 +790,13 @@ class ScenarioExecutor:
             logger.info("Анализ результатов после фильтрации")
             
             # Ожидание обновления результатов
-            time.sleep(2)
+            self.waiter.wait_for_update(driver)
             
             # Подсчет отфильтрованных отелей
-            hotel_cards = driver.find_elements(By.CSS_SELECTOR, '.hotel-card, .hotel-item, .result-item')
+            hotel_cards = self.lookup.find_optional(driver, '.hotel-card, .hotel-item, .result-item')
             
             # Анализ активных фильтров
-            active_filters = driver.find_elements(By.CSS_SELECTOR, '.active-filter, .applied-filter')
+            active_filters = self.lookup.find_optional(driver, '.active-filter, .applied-filter')
             
             analysis = {
                 'filtered_hotels_count': len(hotel_cards),
@@ -679,13 +829,16 @@ class ScenarioExecutor:
         try:
             logger.info("Выбор отеля")
             
-            # Поиск карточек отелей
-            hotel_cards = driver.find_elements(By.CSS_SELECTOR, '.hotel-card, .hotel-item, .result-item')
+            # Поиск карточек отелей (обязательный элемент - ждем ограниченное время)
+            try:
+                hotel_card = self.lookup.find_required(driver, '.hotel-card, .hotel-item, .result-item')
+            except TimeoutException:
+                hotel_card = None
             
-            if hotel_cards:
+            if hotel_card:
                 # Клик по первой карточке
-                hotel_cards[0].click()
-                time.sleep(2)
+                hotel_card.click()
+                self.waiter.wait_for_page(driver)
                 
                 return {
                     'action': 'select_hotel',
@@ -730,16 +883,11 @@ class ScenarioExecutor:
             ]
             
             room_selected = False
-            for selector in room_selectors:
-                try:
-                    room_buttons = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if room_buttons:
-                        room_buttons[0].click()
-                        time.sleep(2)
-                        room_selected = True
-                        break
-                except:
-                    continue
+            match = self.probe.probe(driver, self._candidates('booking_button', room_selectors),
+                                     target='booking_button')
+            if match['found']:
+                self._click(driver, match['element'], 'booking_button', self.waiter.wait_for_page)
+                room_selected = True
                     
             return {
                 'action': 'select_room',
@@ -767,7 +915,7 @@ class ScenarioExecutor:
             logger.info("Заполнение данных гостей")
             
             # Поиск полей формы
-            form_fields = driver.find_elements(By.CSS_SELECTOR, 'input[type="text"], input[type="email"]')
+            form_fields = self.lookup.find_optional(driver, 'input[type="text"], input[type="email"]')
             
             if form_fields:
                 # Заполнение имени
@@ -804,10 +952,10 @@ class ScenarioExecutor:
             logger.info("Анализ процесса оплаты")
             
             # Поиск элементов оплаты
-            payment_elements = driver.find_elements(By.CSS_SELECTOR, '.payment, .payment-method, .payment-option')
+            payment_elements = self.lookup.find_optional(driver, '.payment, .payment-method, .payment-option')
             
             # Поиск кнопок оплаты
-            payment_buttons = driver.find_elements(By.CSS_SELECTOR, '.pay-button, .payment-button, .checkout-button')
+            payment_buttons = self.lookup.find_optional(driver, '.pay-button, .payment-button, .checkout-button')
             
             analysis = {
                 'payment_methods_count': len(payment_elements),
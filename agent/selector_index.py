@@ -0,0 +1,176 @@
+"""
+Selector Index - модуль статистики селекторов по сайтам и типам страниц
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SELECTOR_INDEX_CONFIG = {
+    'enabled': True,
+    'path': None,  # JSON-файл статистики (None - только в памяти процесса)
+    'heuristics': True,  # Поиск по роли, подписи и placeholder, если ни один селектор не подошел
+    'min_attempts': 3  # Порядок кандидатов меняется, когда по селектору накоплено столько проверок
+}
+
+# Ключ статистики: сайт, тип страницы и цель поиска (search_box, search_button, ...)
+IndexKey = Tuple[str, str, str]
+
+def page_type(url: str) -> str:
+    """Тип страницы по адресу: первый сегмент пути без чисел (/hotel/123 -> hotel, / -> home)"""
+    for segment in urlparse(url).path.split('/'):
+        segment = re.sub(r'\d+', '', segment.split('.')[0]).strip('-_')
+        if segment:
+            return segment.lower()
+    return 'home'
+
+def index_key(url: str, target: str) -> IndexKey:
+    """Ключ статистики для цели поиска на текущей странице"""
+    return urlparse(url).netloc or 'local', page_type(url), target
+
+class SelectorIndex:
+    """Статистика попаданий селекторов с сохранением между прогонами
+
+    Для каждой цели поиска на странице сайта хранится, сколько раз каждый
+    селектор нашел элемент, сколько раз не нашел и сколько длились проверки.
+    Кандидаты упорядочиваются по сглаженной доле попаданий, так что первым
+    проверяется селектор, который чаще срабатывал на этом сайте. Селекторы,
+    найденные эвристическим поиском и подтвержденные действием, добавляются
+    к кандидатам.
+
+    В файл записываются приращения поверх его текущего содержимого, поэтому
+    статистика процессов пакетного режима не затирает друг друга.
+    """
+
+    def __init__(self, index_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_SELECTOR_INDEX_CONFIG, **(index_config or {})}
+        self.path = Path(self.settings['path']).expanduser() if self.settings['path'] else None
+        self.entries = self._load()
+        self.pending = {}
+        self.stats = {'probes': 0, 'reordered': 0, 'first_candidate_hits': 0,
+                      'heuristic_hits': 0, 'heuristic_misses': 0}
+        self._lock = threading.Lock()
+
+    def order(self, key: IndexKey, selectors: List[str]) -> List[str]:
+        """Кандидаты в порядке вероятности попадания (с изученными селекторами)"""
+        with self._lock:
+            entry = self.entries.get(self._name(key), {})
+            candidates = list(dict.fromkeys([*selectors, *(s for s, data in entry.items() if data.get('learned'))]))
+
+            def score(position_selector: Tuple[int, str]) -> Tuple[float, float, int]:
+                position, selector = position_selector
+                data = entry.get(selector)
+                attempts = data['hits'] + data['misses'] if data else 0
+                if attempts < self.settings['min_attempts']:
+                    # Мало данных: исходный порядок, изученные селекторы - после заданных
+                    return (-0.5, 0.0, position)
+                hit_rate = (data['hits'] + 1) / (attempts + 2)
+                return (-hit_rate, data['time'] / attempts, position)
+
+            ordered = [selector for _, selector in sorted(enumerate(candidates), key=score)]
+
+            self.stats['probes'] += 1
+            if ordered[:1] != selectors[:1]:
+                self.stats['reordered'] += 1
+            return ordered
+
+    def record(self, key: IndexKey, selectors: List[str], index: Optional[int], duration: float):
+        """Результат проверки: кандидаты до index - промахи, index - попадание
+
+        Без совпадения промахом считаются все кандидаты.
+        """
+        tried = selectors if index is None else selectors[:index + 1]
+        share = duration / len(tried) if tried else 0.0
+
+        with self._lock:
+            for position, selector in enumerate(tried):
+                self._apply(key, selector, {'hits': int(position == index), 'misses': int(position != index),
+                                            'time': share, 'last_hit': time.time() if position == index else 0})
+            if index == 0:
+                self.stats['first_candidate_hits'] += 1
+
+    def learn(self, key: IndexKey, selector: Optional[str], found: bool, duration: float):
+        """Результат эвристического поиска (найденный селектор становится кандидатом)"""
+        with self._lock:
+            self.stats['heuristic_hits' if found else 'heuristic_misses'] += 1
+            if found and selector:
+                self._apply(key, selector, {'hits': 1, 'misses': 0, 'time': duration,
+                                            'last_hit': time.time(), 'learned': True})
+                logger.info(f"Найден новый селектор для {key[2]} ({key[0]}, {key[1]}): {selector}")
+
+    def save(self):
+        """Запись накопленных изменений в файл (поверх записанного другими процессами)"""
+        if not self.path:
+            return
+
+        with self._lock:
+            if not self.pending:
+                return
+
+            merged = self._load()
+            for name, selectors in self.pending.items():
+                for selector, delta in selectors.items():
+                    self._merge(merged.setdefault(name, {}), selector, delta)
+
+            temp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path.write_text(json.dumps({'version': 1, 'entries': merged}, ensure_ascii=False), encoding='utf-8')
+                temp_path.replace(self.path)
+            except OSError as e:
+                logger.warning(f"Не удалось сохранить статистику селекторов {self.path}: {e}")
+                return
+
+            self.entries = merged
+            self.pending = {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика использования индекса"""
+        with self._lock:
+            return {
+                **self.stats,
+                'targets': len(self.entries),
+                'learned_selectors': sum(1 for entry in self.entries.values()
+                                         for data in entry.values() if data.get('learned'))
+            }
+
+    def _apply(self, key: IndexKey, selector: str, delta: Dict[str, Any]):
+        """Изменение статистики в памяти и в очереди на запись"""
+        name = self._name(key)
+        self._merge(self.entries.setdefault(name, {}), selector, delta)
+        self._merge(self.pending.setdefault(name, {}), selector, delta)
+
+    @staticmethod
+    def _merge(entry: Dict[str, Dict[str, Any]], selector: str, delta: Dict[str, Any]):
+        """Сложение счетчиков селектора"""
+        data = entry.setdefault(selector, {'hits': 0, 'misses': 0, 'time': 0.0, 'last_hit': 0})
+        data['hits'] += delta['hits']
+        data['misses'] += delta['misses']
+        data['time'] += delta['time']
+        data['last_hit'] = max(data['last_hit'], delta.get('last_hit', 0))
+        if delta.get('learned'):
+            data['learned'] = True
+
+    @staticmethod
+    def _name(key: IndexKey) -> str:
+        """Ключ в JSON: сайт|тип страницы|цель"""
+        return '|'.join(key)
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Статистика из файла"""
+        if not self.path or not self.path.exists():
+            return {}
+
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8')).get('entries', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Не удалось прочитать статистику селекторов {self.path}: {e}")
+            return {}
@@ -0,0 +1,309 @@
+"""
+Selector Probe - модуль проверки списка селекторов за один запрос к браузеру
+"""
+
+import time
+import logging
+from typing import Dict, Any, List, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .selector_index import SelectorIndex, index_key
+
+logger = logging.getLogger(__name__)
+
+# Перебор кандидатов внутри страницы; возвращает первое видимое совпадение
+PROBE_SCRIPT = """
+var selectors = arguments[0], visibleOnly = arguments[1], allMatches = arguments[2];
+
+function isVisible(el) {
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || parseFloat(style.opacity) === 0) {
+        return false;
+    }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+for (var i = 0; i < selectors.length; i++) {
+    var nodes;
+    try {
+        nodes = document.querySelectorAll(selectors[i]);
+    } catch (e) {
+        continue;
+    }
+
+    var matches = [];
+    for (var j = 0; j < nodes.length; j++) {
+        if (!visibleOnly || isVisible(nodes[j])) {
+            matches.push(nodes[j]);
+            if (!allMatches) {
+                break;
+            }
+        }
+    }
+
+    if (matches.length) {
+        return {elements: matches, index: i, selector: selectors[i]};
+    }
+}
+return null;
+"""
+
+# Подсказки эвристического поиска для целей: теги, роли ARIA и слова в подписи,
+# placeholder, aria-label, name или тексте кнопки. Элемент подходит, только если
+# совпало хотя бы одно слово: цели без слов (подсказки автодополнения) не ищутся
+TARGET_HINTS = {
+    'search_box': {'tags': ['input', 'textarea'], 'roles': ['searchbox', 'combobox', 'textbox'],
+                   'keywords': ['поиск', 'куда', 'направлен', 'город', 'search', 'destination', 'where']},
+    'search_button': {'tags': ['button', 'input[type="submit"]'], 'roles': ['button'],
+                      'keywords': ['найти', 'искать', 'поиск', 'search', 'find']},
+    'date_picker': {'tags': ['input', 'button', 'div'], 'roles': ['button', 'combobox'],
+                    'keywords': ['дата', 'заезд', 'выезд', 'календар', 'check-in', 'date', 'calendar']},
+    'guests_selector': {'tags': ['button', 'input', 'div'], 'roles': ['button', 'combobox'],
+                        'keywords': ['гост', 'взросл', 'номер', 'guest', 'traveler', 'room']},
+    'price_filter': {'tags': ['fieldset', 'div', 'button'], 'roles': ['group', 'slider'],
+                     'keywords': ['цена', 'стоимость', 'бюджет', 'price', 'budget']},
+    'star_filter': {'tags': ['fieldset', 'div', 'label', 'button'], 'roles': ['group', 'checkbox'],
+                    'keywords': ['звезд', 'star']},
+    'amenity_filter': {'tags': ['fieldset', 'div', 'label', 'button'], 'roles': ['group', 'checkbox'],
+                       'keywords': ['удобств', 'wi-fi', 'wifi', 'amenit', 'facilit']},
+    'booking_button': {'tags': ['button', 'a'], 'roles': ['button'],
+                    'keywords': ['выбрать', 'забронировать', 'select', 'book', 'reserve']}
+}
+
+# Поиск элемента по роли, подписи и placeholder, когда известные селекторы не подошли;
+# возвращает элемент и уникальный CSS-селектор для него (если удалось построить)
+HEURISTIC_LOCATOR_SCRIPT = """
+var hint = arguments[0];
+
+function isVisible(el) {
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || parseFloat(style.opacity) === 0) {
+        return false;
+    }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+function describe(el) {
+    var parts = [el.getAttribute('aria-label'), el.getAttribute('placeholder'), el.getAttribute('title'),
+                 el.getAttribute('name'), el.id];
+    if (el.labels) {
+        for (var i = 0; i < el.labels.length; i++) {
+            parts.push(el.labels[i].textContent);
+        }
+    }
+    var labelledBy = el.getAttribute('aria-labelledby');
+    if (labelledBy) {
+        var label = document.getElementById(labelledBy);
+        parts.push(label ? label.textContent : '');
+    }
+    if (el.tagName !== 'INPUT' && el.tagName !== 'TEXTAREA' && el.textContent.length < 80) {
+        parts.push(el.textContent);
+    } else if (el.type === 'submit' || el.type === 'button') {
+        parts.push(el.value);
+    }
+    return parts.filter(Boolean).join(' ').toLowerCase();
+}
+
+function unique(selector, el) {
+    try {
+        return document.querySelectorAll(selector).length === 1 && document.querySelector(selector) === el;
+    } catch (e) {
+        return false;
+    }
+}
+
+function selectorFor(el) {
+    var tag = el.tagName.toLowerCase();
+    if (el.id && unique('#' + CSS.escape(el.id), el)) {
+        return '#' + CSS.escape(el.id);
+    }
+    var attributes = ['name', 'placeholder', 'aria-label', 'data-testid', 'data-test', 'role', 'type'];
+    for (var i = 0; i < attributes.length; i++) {
+        var value = el.getAttribute(attributes[i]);
+        var selector = tag + '[' + attributes[i] + '="' + (value || '').replace(/"/g, '\\\\"') + '"]';
+        if (value && unique(selector, el)) {
+            return selector;
+        }
+    }
+    var classes = Array.prototype.slice.call(el.classList, 0, 3).map(function (name) { return '.' + CSS.escape(name); });
+    if (classes.length && unique(tag + classes.join(''), el)) {
+        return tag + classes.join('');
+    }
+    return null;
+}
+
+var query = hint.tags.concat(hint.roles.map(function (role) { return '[role="' + role + '"]'; })).join(', ');
+var best = null, bestScore = 0;
+var nodes = document.querySelectorAll(query);
+for (var i = 0; i < nodes.length; i++) {
+    var el = nodes[i];
+    if (!isVisible(el) || el.disabled) {
+        continue;
+    }
+    var text = describe(el);
+    var score = 0;
+    for (var j = 0; j < hint.keywords.length; j++) {
+        if (text.indexOf(hint.keywords[j]) >= 0) {
+            score += 2;
+        }
+    }
+    if (score && hint.roles.indexOf(el.getAttribute('role')) >= 0) {
+        score += 1;
+    }
+    if (score > bestScore) {
+        best = el;
+        bestScore = score;
+    }
+}
+return best ? {elements: [best], selector: selectorFor(best), score: bestScore} : null;
+"""
+
+class SelectorProbe:
+    """Поиск первого подходящего селектора из списка кандидатов
+
+    С индексом (SelectorIndex) и целью поиска кандидаты проверяются в порядке
+    прошлых попаданий на этом сайте, результат записывается в индекс, а при
+    неудаче всех селекторов элемент ищется эвристически по подсказкам цели.
+    """
+
+    def __init__(self, poll_interval: float = 0.1, index: Optional[SelectorIndex] = None):
+        self.poll_interval = poll_interval
+        self.index = index
+        self.records = []
+        self.pending_learns = []  # Найденные эвристикой селекторы до подтверждения шагом
+
+    def probe(self, driver: WebDriver, selectors: List[str], visible_only: bool = True,
+              all_matches: bool = False, target: Optional[str] = None) -> Dict[str, Any]:
+        """Однократная проверка всех кандидатов (один запрос к WebDriver)"""
+        start_time = time.time()
+        key, selectors = self._prepare(driver, selectors, target)
+
+        match = driver.execute_script(PROBE_SCRIPT, selectors, visible_only, all_matches)
+
+        return self._finish(driver, key, selectors, match, start_time, round_trips=1)
+
+    def wait_for(self, driver: WebDriver, selectors: List[str], timeout: float,
+                 visible_only: bool = True, all_matches: bool = False, target: Optional[str] = None) -> Dict[str, Any]:
+        """Ожидание появления любого из кандидатов (один запрос на итерацию опроса)"""
+        start_time = time.time()
+        deadline = start_time + timeout
+        round_trips = 0
+        key, selectors = self._prepare(driver, selectors, target)
+
+        while True:
+            round_trips += 1
+            try:
+                match = driver.execute_script(PROBE_SCRIPT, selectors, visible_only, all_matches)
+            except Exception:
+                # Страница перезагружается - пробуем еще раз
+                match = None
+
+            if match or time.time() >= deadline:
+                return self._finish(driver, key, selectors, match, start_time, round_trips)
+
+            time.sleep(self.poll_interval)
+
+    def pop_records(self) -> List[Dict[str, Any]]:
+        """Записи о проверках с момента предыдущего вызова"""
+        records, self.records = self.records, []
+        return records
+
+    def has_pending_learn(self, target: str) -> bool:
+        """Есть ли найденный эвристикой и еще не подтвержденный селектор цели"""
+        return any(key[2] == target for key, _, _ in self.pending_learns)
+
+    def confirm_learn(self, target: str, confirmed: bool):
+        """Подтверждение селектора цели по результату действия с элементом
+
+        Селектор становится кандидатом, только если действие дало эффект
+        (переход, изменение страницы, введенное значение).
+        """
+        pending = []
+        for key, selector, duration in self.pending_learns:
+            if key[2] != target:
+                pending.append((key, selector, duration))
+                continue
+            if not confirmed:
+                logger.debug(f"Селектор {selector} для {target} не подтвержден: действие без эффекта")
+            self.index.learn(key, selector if confirmed else None, confirmed, duration)
+        self.pending_learns = pending
+
+    def discard_learns(self):
+        """Отказ от неподтвержденных селекторов (шаг завершен без проверки эффекта)"""
+        for key, selector, duration in self.pending_learns:
+            logger.debug(f"Селектор {selector} для {key[2]} не подтвержден")
+            self.index.learn(key, None, False, duration)
+        self.pending_learns = []
+
+    def _prepare(self, driver: WebDriver, selectors: List[str], target: Optional[str]):
+        """Ключ индекса и порядок кандидатов для цели поиска"""
+        if not self.index or not target:
+            return None, list(selectors)
+
+        key = index_key(driver.current_url, target)
+        return key, self.index.order(key, list(selectors))
+
+    def _finish(self, driver: WebDriver, key, selectors: List[str], match: Optional[Dict[str, Any]],
+                start_time: float, round_trips: int) -> Dict[str, Any]:
+        """Запись результата в индекс и эвристический поиск при неудаче"""
+        heuristic = None
+
+        if key:
+            self.index.record(key, selectors, match['index'] if match else None, time.time() - start_time)
+
+            if not match and self.index.settings['heuristics'] and key[2] in TARGET_HINTS:
+                heuristic_start = time.time()
+                try:
+                    match = driver.execute_script(HEURISTIC_LOCATOR_SCRIPT, TARGET_HINTS[key[2]])
+                except Exception as e:
+                    logger.debug(f"Эвристический поиск {key[2]} не выполнен: {e}")
+                    match = None
+                round_trips += 1
+                heuristic = bool(match)
+                if match:
+                    match['index'] = None
+                    # Селектор становится кандидатом после подтверждения эффекта (confirm_learn)
+                    self.pending_learns.append((key, match['selector'], time.time() - heuristic_start))
+                else:
+                    self.index.learn(key, None, False, time.time() - heuristic_start)
+
+        return self._result(selectors, match, start_time, round_trips, key[2] if key else None, heuristic)
+
+    def _result(self, selectors: List[str], match: Dict[str, Any], start_time: float,
+                round_trips: int, target: Optional[str] = None, heuristic: Optional[bool] = None) -> Dict[str, Any]:
+        """Формирование результата проверки"""
+        record = {
+            'candidates': len(selectors),
+            'selector': match['selector'] if match else None,
+            'index': match['index'] if match else None,
+            'duration': round(time.time() - start_time, 3),
+            'round_trips': round_trips
+        }
+        if target:
+            record['target'] = target
+        if heuristic is not None:
+            record['heuristic'] = heuristic
+        self.records.append(record)
+
+        if not match:
+            return {
+                'found': False,
+                'element': None,
+                'elements': [],
+                'selector': None,
+                'index': None,
+                'duration': time.time() - start_time,
+                'round_trips': round_trips
+            }
+
+        return {
+            'found': True,
+            'element': match['elements'][0],
+            'elements': match['elements'],
+            'selector': match['selector'],
+            'index': match['index'],
+            'duration': time.time() - start_time,
+            'round_trips': round_trips
+        }
@@ -0,0 +1,59 @@
+"""
+Step Instrumentation - модуль сбора статистики шага сценария
+"""
+
+from typing import Dict, Any, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .page_waiter import PageWaiter
+from .element_lookup import ElementLookup
+from .page_metrics import PageMetrics
+from .selector_probe import SelectorProbe
+from .cdp_events import get_event_log
+from .network_blocker import get_network_blocker
+
+class StepInstrumentation:
+    """Ожидания, поиски элементов, метрики страницы и сетевая активность шага
+
+    begin() сбрасывает записи, накопленные до шага, end() добавляет в результат
+    шага все, что было записано во время его выполнения.
+    """
+
+    def __init__(self, waiter: PageWaiter, lookup: ElementLookup, metrics: PageMetrics,
+                 probe: Optional[SelectorProbe] = None):
+        self.waiter = waiter
+        self.lookup = lookup
+        self.metrics = metrics
+        self.probe = probe
+        self._blocker = None
+
+    def begin(self, driver: WebDriver):
+        """Начало шага"""
+        self.waiter.pop_records()
+        self.lookup.pop_records()
+        if self.probe:
+            self.probe.pop_records()
+        self.metrics.prepare(driver)
+
+        self._blocker = get_network_blocker(driver)
+        if self._blocker:
+            get_event_log(driver).poll()
+            self._blocker.pop_stats()
+
+    def end(self, driver: WebDriver, step: Dict[str, Any]) -> Dict[str, Any]:
+        """Завершение шага: статистика добавляется в его результат"""
+        waits = self.waiter.pop_records()
+        step['waits'] = waits
+        step['wait_time'] = sum(record['waited'] for record in waits)
+        if self.probe:
+            step['selector_probes'] = self.probe.pop_records()
+            self.probe.discard_learns()
+        step['lookups'] = ElementLookup.summarize(self.lookup.pop_records())
+        step['page_metrics'] = self.metrics.collect(driver)
+
+        if self._blocker:
+            get_event_log(driver).poll()
+            step['network'] = self._blocker.pop_stats()
+            self._blocker = None
+
+        return step
@@ -0,0 +1,193 @@
+"""
+Typing Engine - модуль ввода текста с человеческим ритмом за один запрос к браузеру
+"""
+
+import time
+import random
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TYPING_CONFIG = {
+    'typing_speed': (0.1, 0.3),  # Пауза между символами, сек
+    'suggestion_selector': '.suggestion, .suggestion-item, .autocomplete-item, .dropdown-item',
+    'suggestion_timeout': 3,  # Сколько ждать подсказок после последнего символа, сек
+    'settle_time': 0.15  # Подсказки считаются обновленными, если не менялись столько секунд
+}
+
+# Печать по расписанию внутри страницы. Для каждого символа генерируются
+# keydown/keypress/input/keyup, значение выставляется через нативный сеттер
+# (его видят React и подобные фреймворки). MutationObserver фиксирует, через
+# сколько миллисекунд после нажатия изменился список подсказок.
+TYPING_SCRIPT = """
+var element = arguments[0], text = arguments[1], delays = arguments[2], selector = arguments[3],
+    settleTime = arguments[4], timeout = arguments[5], clear = arguments[6], done = arguments[arguments.length - 1];
+
+var proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype :
+    element instanceof HTMLInputElement ? HTMLInputElement.prototype : null;
+if (!proto) {
+    done(null);
+    return;
+}
+var setValue = Object.getOwnPropertyDescriptor(proto, 'value').set;
+
+function suggestionsState() {
+    var nodes = selector ? document.querySelectorAll(selector) : [], visible = 0, content = '';
+    for (var i = 0; i < nodes.length; i++) {
+        var rect = nodes[i].getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0) {
+            visible += 1;
+            content += nodes[i].textContent + '|';
+        }
+    }
+    return {visible: visible, signature: visible + ':' + content};
+}
+
+var start = performance.now(), keystrokes = [], state = suggestionsState(),
+    firstSuggestion = null, lastChange = null;
+
+var observer = new MutationObserver(function () {
+    var current = suggestionsState();
+    if (current.signature === state.signature) {
+        return;
+    }
+    var now = performance.now();
+    state = current;
+    lastChange = now;
+    if (current.visible && firstSuggestion === null) {
+        firstSuggestion = now - start;
+    }
+    var last = keystrokes[keystrokes.length - 1];
+    if (last && last.latency === null && current.visible) {
+        last.latency = now - start - last.at;
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+
+function finish() {
+    observer.disconnect();
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    done({
+        value: element.value,
+        duration: performance.now() - start,
+        keystrokes: keystrokes,
+        first_suggestion: firstSuggestion,
+        suggestions: state.visible
+    });
+}
+
+function waitForSuggestions() {
+    var deadline = performance.now() + timeout;
+    (function check() {
+        var now = performance.now(), last = keystrokes[keystrokes.length - 1];
+        var settled = last && last.latency !== null && now - lastChange >= settleTime;
+        if (!selector || settled || now >= deadline) {
+            finish();
+        } else {
+            setTimeout(check, 20);
+        }
+    })();
+}
+
+element.focus();
+if (clear) {
+    setValue.call(element, '');
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+}
+
+var index = 0;
+function typeNext() {
+    if (index >= text.length) {
+        waitForSuggestions();
+        return;
+    }
+    var ch = text[index], key = {key: ch, bubbles: true, cancelable: true};
+    var allowed = element.dispatchEvent(new KeyboardEvent('keydown', key));
+    element.dispatchEvent(new KeyboardEvent('keypress', key));
+    if (allowed) {
+        setValue.call(element, element.value + ch);
+        element.dispatchEvent(new InputEvent('input', {bubbles: true, data: ch, inputType: 'insertText'}));
+    }
+    element.dispatchEvent(new KeyboardEvent('keyup', key));
+    keystrokes.push({char: ch, at: performance.now() - start, latency: null});
+    setTimeout(typeNext, delays[index++] || 0);
+}
+typeNext();
+"""
+
+class TypingEngine:
+    """Ввод текста с паузами между символами за один вызов execute_async_script
+
+    Вместо send_keys на каждый символ (отдельный HTTP-запрос к драйверу)
+    вся последовательность нажатий с расписанием выполняется в странице.
+    """
+
+    def __init__(self, typing_config: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_TYPING_CONFIG, **(typing_config or {})}
+        self.records = []
+
+    def schedule(self, text: str, typing_speed: Optional[Tuple[float, float]] = None) -> List[float]:
+        """Паузы после каждого символа, сек"""
+        low, high = typing_speed or self.settings['typing_speed']
+        return [random.uniform(low, high) for _ in text]
+
+    def type_text(self, driver: WebDriver, element: WebElement, text: str,
+                  delays: Optional[List[float]] = None, clear: bool = True) -> Dict[str, Any]:
+        """Ввод текста по расписанию с замером задержки подсказок"""
+        delays = self.schedule(text) if delays is None else delays
+        start_time = time.time()
+
+        # Ограничение времени скрипта должно покрыть всю печать и ожидание подсказок
+        script_timeout = sum(delays) + self.settings['suggestion_timeout'] + 10
+        previous_timeout = driver.timeouts.script
+        driver.set_script_timeout(script_timeout)
+
+        try:
+            data = driver.execute_async_script(
+                TYPING_SCRIPT, element, text, [delay * 1000 for delay in delays],
+                self.settings['suggestion_selector'], self.settings['settle_time'] * 1000,
+                self.settings['suggestion_timeout'] * 1000, clear)
+        finally:
+            driver.set_script_timeout(previous_timeout)
+
+        if data is None:
+            # Не поле ввода (например, contenteditable) - обычный ввод
+            if clear:
+                element.clear()
+            element.send_keys(text)
+            data = {'value': text, 'duration': (time.time() - start_time) * 1000,
+                    'keystrokes': [], 'first_suggestion': None, 'suggestions': 0}
+
+        record = self._record(text, data, time.time() - start_time)
+        self.records.append(record)
+        return record
+
+    def pop_records(self) -> List[Dict[str, Any]]:
+        """Записи о вводе с момента предыдущего вызова"""
+        records, self.records = self.records, []
+        return records
+
+    def _record(self, text: str, data: Dict[str, Any], wall_time: float) -> Dict[str, Any]:
+        """Сводка ввода: время печати и задержка подсказок"""
+        latencies = [key['latency'] for key in data['keystrokes'] if key.get('latency') is not None]
+        last_key = data['keystrokes'][-1] if data['keystrokes'] else {}
+
+        return {
+            'text': text,
+            'typed_correctly': data['value'] == text,
+            'keystrokes': len(data['keystrokes']),
+            'round_trips': 1,
+            'typing_time': round(data['duration'] / 1000, 3),
+            'wall_time': round(wall_time, 3),
+            'suggestions': data['suggestions'],
+            'suggestion_latency': {
+                'first_suggestion': round(data['first_suggestion'], 1) if data['first_suggestion'] is not None else None,
+                'after_last_key': round(last_key['latency'], 1) if last_key.get('latency') is not None else None,
+                'mean': round(sum(latencies) / len(latencies), 1) if latencies else None,
+                'max': round(max(latencies), 1) if latencies else None,
+                'per_key': [round(latency, 1) for latency in latencies]
+            }
+        }
@@ -5,18 +5,33 @@ User Simulator - модуль для симуляции поведения ре
 import time
 import random
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 
+from .page_waiter import PageWaiter
+from .typing_engine import TypingEngine
+
 logger = logging.getLogger(__name__)
 
 class UserSimulator:
-    """Симулятор поведения реального пользователя"""
+    """Симулятор поведения реального пользователя
+    
+    В режиме виртуальных часов (virtual_clock) человеческие паузы не выполняются,
+    а только учитываются: браузер ждет лишь готовности страницы (через waiter)
+    или min_real_pause, а время "пользователя" накапливается для отчета.
+    """
     
-    def __init__(self):
+    def __init__(self, virtual_clock: bool = False, min_real_pause: float = 0.0,
+                 waiter: Optional[PageWaiter] = None, typing_engine: Optional[TypingEngine] = None):
+        self.virtual_clock = virtual_clock
+        self.min_real_pause = min_real_pause
+        self.waiter = waiter
+        self.typing_engine = typing_engine or TypingEngine()
+        self.simulated_time = 0.0
+        self.slept_time = 0.0
         self.user_behavior = {
             'reading_time': (2, 5),  # Время на чтение (сек)
             'thinking_time': (1, 3),  # Время на размышление (сек)
@@ -31,7 +46,7 @@ class UserSimulator:
         
         # Случайная задержка перед действием
         thinking_time = random.uniform(*self.user_behavior['thinking_time'])
-        time.sleep(thinking_time)
+        self._pause(thinking_time)
         
         # Симуляция конкретного действия
         if action == 'type':
@@ -54,16 +69,21 @@ class UserSimulator:
             
         # Очистка поля
         element.clear()
-        time.sleep(0.5)
+        self._pause(0.5)
         
-        # Печать текста с человеческой скоростью
-        for char in text:
-            element.send_keys(char)
-            typing_delay = random.uniform(*self.user_behavior['typing_speed'])
-            time.sleep(typing_delay)
+        # Вся печать выполняется в браузере одним запросом; паузы между символами
+        # сохраняются (на них реагирует автодополнение), кроме режима виртуальных часов
+        delays = self.typing_engine.schedule(text, self.user_behavior['typing_speed'])
+        self.simulated_time += sum(delays)
+        
+        if self.virtual_clock:
+            delays = [0.0] * len(delays)
+            
+        typing = self.typing_engine.type_text(driver, element, text, delays, clear=False)
+        self.slept_time += min(sum(delays), typing['wall_time'])
             
-        # Пауза после печати
-        time.sleep(random.uniform(0.5, 1.5))
+        # Пауза после печати (подсказки успевают появиться)
+        self._pause(random.uniform(0.5, 1.5), driver)
         
     def _simulate_click(self, driver: WebDriver, element):
         """Симуляция человеческого клика"""
@@ -73,32 +93,32 @@ class UserSimulator:
         # Наведение мыши перед кликом
         actions = ActionChains(driver)
         actions.move_to_element(element)
-        actions.pause(random.uniform(0.2, 0.8))
+        actions.pause(self._action_pause(random.uniform(0.2, 0.8)))
         actions.click()
         actions.perform()
         
         # Пауза после клика
-        time.sleep(random.uniform(0.5, 2.0))
+        self._pause(random.uniform(0.5, 2.0), driver)
         
     def _simulate_scroll(self, driver: WebDriver):
         """Симуляция прокрутки страницы"""
         if random.random() < self.user_behavior['scroll_probability']:
             scroll_amount = random.randint(300, 800)
             driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-            time.sleep(random.uniform(1, 3))
+            self._pause(random.uniform(1, 3), driver)
             
     def _simulate_hover(self, driver: WebDriver, element):
         """Симуляция наведения мыши"""
         if element and random.random() < self.user_behavior['hover_probability']:
             actions = ActionChains(driver)
             actions.move_to_element(element)
-            actions.pause(random.uniform(0.5, 2.0))
+            actions.pause(self._action_pause(random.uniform(0.5, 2.0)))
             actions.perform()
             
     def _simulate_reading(self, driver: WebDriver, duration: int = 3):
         """Симуляция чтения контента"""
         reading_time = random.uniform(duration * 0.7, duration * 1.3)
-        time.sleep(reading_time)
+        self._pause(reading_time)
         
     def _simulate_exploration(self, driver: WebDriver):
         """Симуляция исследования страницы"""
@@ -171,12 +191,50 @@ class UserSimulator:
         elif behavior == 'page_refresh':
             # Обновление страницы
             driver.refresh()
-            time.sleep(random.uniform(2, 4))
+            self._pause(random.uniform(2, 4), driver, page_load=True)
             
         elif behavior == 'go_back':
             # Возврат назад
             driver.back()
-            time.sleep(random.uniform(1, 3))
+            self._pause(random.uniform(1, 3), driver, page_load=True)
+            
+    def pop_timing(self) -> Dict[str, float]:
+        """Время пользователя и реальных пауз с момента предыдущего вызова"""
+        timing = {
+            'simulated': round(self.simulated_time, 3),
+            'slept': round(self.slept_time, 3)
+        }
+        self.simulated_time = 0.0
+        self.slept_time = 0.0
+        return timing
+        
+    def _pause(self, seconds: float, driver: Optional[WebDriver] = None, page_load: bool = False):
+        """Человеческая пауза: реальная или учтенная по виртуальным часам
+        
+        Если передан driver, в режиме виртуальных часов вместо паузы выполняется
+        ожидание, которое действительно нужно странице (DOM или загрузка).
+        """
+        self.simulated_time += seconds
+        start_time = time.time()
+        
+        if not self.virtual_clock:
+            time.sleep(seconds)
+        elif driver is not None and self.waiter:
+            if page_load:
+                self.waiter.wait_for_page(driver)
+            else:
+                self.waiter.wait_for_dom_quiet(driver)
+        elif self.min_real_pause:
+            time.sleep(min(seconds, self.min_real_pause))
+            
+        self.slept_time += time.time() - start_time
+        
+    def _action_pause(self, seconds: float) -> float:
+        """Длительность паузы внутри ActionChains (выполняется браузером)"""
+        self.simulated_time += seconds
+        real_pause = min(seconds, self.min_real_pause) if self.virtual_clock else seconds
+        self.slept_time += real_pause
+        return real_pause
             
     def generate_user_feedback(self, journey_data: Dict[str, Any]) -> Dict[str, Any]:
         """Генерация фидбэка от лица пользователя"""
@@ -4,34 +4,72 @@ AI UX Research Agent - основной класс для исследовани
 
 import time
 import logging
-from typing import Dict, Any, List
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from typing import Dict, Any, List, Callable, Optional
+from selenium.webdriver.common.keys import Keys
 from fake_useragent import UserAgent
 
 from .web_analyzer import WebAnalyzer
+from .in_page_analyzer import InPageAnalyzer
+from .analysis_cache import AnalysisCache
 from .ai_analyzer import AIAnalyzer
 from .scenario_executor import ScenarioExecutor
 from .user_simulator import UserSimulator
+from .browser import create_chrome_driver
+from .driver_pool import DriverPool
+from .page_waiter import PageWaiter
+from .element_lookup import ElementLookup
+from .page_metrics import PageMetrics
+from .step_instrumentation import StepInstrumentation
+from .typing_engine import TypingEngine
+from .har_archive import start_har_session
+from .checkpoints import CheckpointStore
+from .filter_explorer import FilterExplorer
+from .results_crawler import ResultsCrawler
+from .card_store import HotelCardStore
+from .selector_index import SelectorIndex
+from .browser_contexts import BrowserContextManager, TabScheduler, page_loaded, page_settled, dom_quiet
 
 logger = logging.getLogger(__name__)
 
 class UXResearchAgent:
     """AI агент для UX-исследования"""
     
-    def __init__(self, config: Dict[str, Any], headless: bool = False):
+    def __init__(self, config: Dict[str, Any], headless: bool = False, driver_pool: Optional[DriverPool] = None):
         self.config = config
         self.headless = headless
         self.driver = None
-        self.web_analyzer = WebAnalyzer()
+        self.driver_pool = driver_pool
+        self._pooled_driver = False
+        self.har_session = None
+        self.lookup = ElementLookup(config.get('lookup'))
+        cache_config = config.get('analysis_cache', {})
+        self.analysis_cache = AnalysisCache(cache_config) if cache_config.get('enabled') else None
+        self.web_analyzer = WebAnalyzer(lookup=self.lookup, parser_config=config.get('parser'), cache=self.analysis_cache)
+        self.in_page_analyzer = InPageAnalyzer(self.web_analyzer, config.get('in_page_analysis'))
         self.ai_analyzer = AIAnalyzer(config['ai'])
-        self.scenario_executor = ScenarioExecutor()
-        self.user_simulator = UserSimulator()
+        self.waiter = PageWaiter(config.get('waits'))
+        self.page_metrics = PageMetrics(config.get('page_metrics'))
+        self.instrumentation = StepInstrumentation(self.waiter, self.lookup, self.page_metrics)
+        checkpoint_config = config.get('checkpoints', {})
+        crawl_config = config.get('crawl', {})
+        self.card_store = HotelCardStore() if crawl_config.get('enabled') else None
+        index_config = config.get('selector_index', {})
+        self.selector_index = SelectorIndex(index_config) if index_config.get('enabled') else None
+        self.scenario_executor = ScenarioExecutor(waiter=self.waiter, lookup=self.lookup, metrics=self.page_metrics,
+                                                  checkpoints=CheckpointStore(checkpoint_config)
+                                                  if checkpoint_config.get('enabled') else None,
+                                                  filter_explorer=FilterExplorer(config.get('filter_exploration')),
+                                                  crawler=ResultsCrawler(crawl_config, self.waiter)
+                                                  if crawl_config.get('enabled') else None,
+                                                  selector_index=self.selector_index,
+                                                  selectors=config.get('selectors'))
+        
+        simulation = config.get('user_simulation', {})
+        self.human_behavior = simulation.get('human_behavior', False)
+        self.user_simulator = UserSimulator(virtual_clock=simulation.get('virtual_clock', False),
+                                            min_real_pause=simulation.get('min_real_pause', 0.0),
+                                            waiter=self.waiter,
+                                            typing_engine=TypingEngine(config.get('typing')))
         
     def __enter__(self):
         self.setup_driver()
@@ -43,28 +81,18 @@ class UXResearchAgent:
     def setup_driver(self):
         """Настройка веб-драйвера"""
         try:
-            chrome_options = Options()
-            
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument(f'--user-agent={self.config["user_agent"]}')
-            
-            # Отключение изображений для ускорения
-            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Настройка таймаутов
-            self.driver.implicitly_wait(self.config['browser']['implicit_wait'])
-            self.driver.set_page_load_timeout(self.config['browser']['page_load_timeout'])
-            
-            logger.info("Веб-драйвер успешно инициализирован")
+            if self.driver_pool:
+                # Заимствование готового драйвера из пула
+                self.driver = self.driver_pool.acquire()
+                self._pooled_driver = True
+                logger.info("Веб-драйвер получен из пула")
+            else:
+                self.driver = create_chrome_driver(self.config, self.headless)
+                self._pooled_driver = False
+                logger.info("Веб-драйвер успешно инициализирован")
+                
+            self.page_metrics.prepare(self.driver)
+            self.har_session = start_har_session(self.driver, self.config.get('har', {}))
             
         except Exception as e:
             logger.error(f"Ошибка при инициализации драйвера: {e}")
@@ -72,16 +100,33 @@ class UXResearchAgent:
             
     def cleanup(self):
         """Очистка ресурсов"""
-        if self.driver:
-            self.driver.quit()
-            logger.info("Веб-драйвер закрыт")
+        if self.har_session:
+            try:
+                self.har_session.stop()
+            except Exception as e:
+                logger.error(f"Ошибка при завершении записи/воспроизведения HAR: {e}")
+            self.har_session = None
             
-    def run_scenario(self, scenario_name: str) -> Dict[str, Any]:
-        """Выполнение сценария исследования"""
+        if self.driver:
+            if self._pooled_driver:
+                self.driver_pool.release(self.driver)
+                logger.info("Веб-драйвер возвращен в пул")
+            else:
+                self.driver.quit()
+                logger.info("Веб-драйвер закрыт")
+            self.driver = None
+            self._pooled_driver = False
+            
+    def run_scenario(self, scenario_name: str, scenario_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Выполнение сценария исследования
+        
+        scenario_config позволяет передать сценарий, которого нет в config['scenarios']
+        (например, из get_advanced_scenarios() с другим направлением).
+        """
         
         logger.info(f"Запуск сценария: {scenario_name}")
         
-        scenario_config = self.config['scenarios'].get(scenario_name)
+        scenario_config = scenario_config or self.config['scenarios'].get(scenario_name)
         if not scenario_config:
             raise ValueError(f"Неизвестный сценарий: {scenario_name}")
             
@@ -94,80 +139,266 @@ class UXResearchAgent:
             'screenshots': []
         }
         
+        # Драйвер берется на время сценария, если агент не был открыт заранее
+        owns_driver = self.driver is None
+        
         try:
+            if owns_driver:
+                self.setup_driver()
+                
             # Переход на главную страницу
             self.navigate_to_homepage()
             
             # Выполнение сценария
-            if scenario_name == 'sochi_winter':
-                results = self.execute_sochi_scenario(results)
-            elif scenario_name == 'andorra':
-                results = self.execute_andorra_scenario(results)
-            elif scenario_name == 'full_analysis':
+            if scenario_name == 'full_analysis':
                 results = self.execute_full_analysis(results)
+            elif 'destination' in scenario_config:
+                results = self.execute_destination_scenario(results, scenario_config)
                 
+            # Сводка метрик производительности для отчета
+            results['performance'] = PageMetrics.summarize(results['steps'])
+            results['page_transfer'] = InPageAnalyzer.summarize(results['steps'])
+            if self.card_store:
+                results['hotel_cards'] = self.card_store.describe(scenario_config.get('requirements'))
+            if self.selector_index:
+                results['selector_index'] = self.selector_index.get_stats()
+            if self.analysis_cache:
+                results['analysis_cache'] = self.analysis_cache.get_stats()
+            
             # AI анализ результатов
             results['analysis'] = self.ai_analyzer.analyze_results(results)
             
+            if self.har_session:
+                results['har'] = self.har_session.get_stats()
+            
         except Exception as e:
             logger.error(f"Ошибка при выполнении сценария: {e}")
             results['error'] = str(e)
             
+        finally:
+            if self.selector_index:
+                self.selector_index.save()
+            if owns_driver:
+                self.cleanup()
+            
+        return results
+        
+    def run_personas(self, personas: Dict[str, Dict[str, Any]],
+                     scenario_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Одновременный прогон персон в изолированных контекстах одного Chrome
+        
+        Каждая персона получает свой контекст (отдельные cookies и хранилище),
+        контексты закрываются сразу после прогона.
+        """
+        
+        scenario_config = scenario_config or self.config['scenarios']['sochi_winter']
+        logger.info(f"Запуск персон: {', '.join(personas)}")
+        
+        results = {
+            'scenario': scenario_config.get('description', ''),
+            'timestamp': time.time(),
+            'config': scenario_config,
+            'personas': {}
+        }
+        
+        owns_driver = self.driver is None
+        start_time = time.time()
+        
+        try:
+            if owns_driver:
+                self.setup_driver()
+                
+            contexts = BrowserContextManager(self.driver)
+            
+            try:
+                tasks = {}
+                for persona_name, persona in personas.items():
+                    context = contexts.create_context()
+                    tasks[persona_name] = {
+                        'handle': context['handle'],
+                        'task': self._persona_task(persona_name, persona, scenario_config)
+                    }
+                    
+                scheduler = TabScheduler(self.driver,
+                                         poll_interval=self.waiter.settings['poll_interval'],
+                                         task_timeout=self.config['browser']['page_load_timeout'] * 4)
+                results['personas'] = scheduler.run(tasks)
+                if self.analysis_cache:
+                    results['analysis_cache'] = self.analysis_cache.get_stats()
+                
+            finally:
+                contexts.dispose_all()
+                
+        except Exception as e:
+            logger.error(f"Ошибка при прогоне персон: {e}")
+            results['error'] = str(e)
+            
+        finally:
+            if owns_driver:
+                self.cleanup()
+                
+        results['duration'] = time.time() - start_time
         return results
         
+    def _persona_task(self, persona_name: str, persona: Dict[str, Any], scenario_config: Dict[str, Any]):
+        """Сценарий одной персоны; yield отдает управление, пока вкладка загружается"""
+        
+        start_time = time.time()
+        quiet_time = self.waiter.settings['dom_quiet_time']
+        steps = []
+        
+        # Задачи персон чередуются, поэтому записи поисков у каждой свои
+        lookup = ElementLookup(self.config.get('lookup'))
+        web_analyzer = WebAnalyzer(lookup=lookup, parser_config=self.config.get('parser'), cache=self.analysis_cache)
+        in_page_analyzer = InPageAnalyzer(web_analyzer, self.config.get('in_page_analysis'))
+        
+        # Шаг 1: Открытие главной страницы (без блокирующего driver.get)
+        step_start = time.time()
+        self.driver.execute_script('window.location.href = arguments[0];', self.config['base_url'])
+        yield page_loaded()
+        
+        analysis, transfer = in_page_analyzer.analyze_homepage(self.driver)
+        steps.append({
+            'action': 'analyze_homepage',
+            'analysis': analysis,
+            'page_transfer': transfer,
+            'success': True,
+            'timestamp': time.time(),
+            'duration': time.time() - step_start
+        })
+        
+        # Шаг 2: Поиск направления
+        step_start = time.time()
+        search_box = lookup.find_first(self.driver, self.config['selectors']['search_box'])
+        
+        if search_box:
+            search_box.clear()
+            search_box.send_keys(scenario_config['destination'])
+            yield dom_quiet(quiet_time)
+            
+            suggestions = lookup.find_optional(self.driver, '.suggestion-item')
+            if suggestions:
+                suggestions[0].click()
+                yield dom_quiet(quiet_time)
+                
+        steps.append({
+            'action': 'search_destination',
+            'destination': scenario_config['destination'],
+            'success': search_box is not None,
+            'timestamp': time.time(),
+            'duration': time.time() - step_start
+        })
+        
+        # Шаг 3: Поиск отелей
+        if search_box:
+            step_start = time.time()
+            previous_url = self.driver.current_url
+            search_button = lookup.find_first(self.driver, self.config['selectors']['search_button'])
+            
+            if search_button:
+                search_button.click()
+            else:
+                search_box.send_keys(Keys.ENTER)
+            yield page_settled(previous_url, quiet_time)
+            
+            steps.append({
+                'action': 'search_hotels',
+                'success': True,
+                'timestamp': time.time(),
+                'duration': time.time() - step_start
+            })
+            
+            # Шаг 4: Анализ результатов
+            step_start = time.time()
+            analysis, transfer = in_page_analyzer.analyze_search_results(self.driver)
+            steps.append({
+                'action': 'analyze_search_results',
+                'analysis': analysis,
+                'page_transfer': transfer,
+                'success': True,
+                'timestamp': time.time(),
+                'duration': time.time() - step_start
+            })
+            
+        journey = {'steps': steps, 'persona': persona}
+        
+        return {
+            'persona': persona_name,
+            'persona_name': persona.get('name', persona_name),
+            'steps': steps,
+            'feedback': self.user_simulator.generate_user_feedback(journey),
+            'lookups': ElementLookup.summarize(lookup.pop_records()),
+            'success': all(step['success'] for step in steps),
+            'duration': time.time() - start_time
+        }
+        
+    def _run_step(self, step_func: Callable[..., Dict[str, Any]], *args) -> Dict[str, Any]:
+        """Выполнение шага с учетом ожиданий, поисков элементов и сетевой активности"""
+        self.user_simulator.pop_timing()
+        self.user_simulator.typing_engine.pop_records()
+        self.instrumentation.begin(self.driver)
+        
+        start_time = time.time()
+        step = step_func(*args)
+        wall_time = time.time() - start_time
+        
+        # Длительность шага для реального пользователя: реальные паузы заменены человеческими
+        timing = self.user_simulator.pop_timing()
+        step['simulated_user_duration'] = round(wall_time - timing['slept'] + timing['simulated'], 3)
+        
+        typing = self.user_simulator.typing_engine.pop_records()
+        if typing:
+            step['typing'] = typing
+        
+        return self.instrumentation.end(self.driver, step)
+        
     def navigate_to_homepage(self):
         """Переход на главную страницу"""
         logger.info("Переход на главную страницу Ostrovok.ru")
         self.driver.get(self.config['base_url'])
-        time.sleep(self.config['delays']['page_load'])
+        self.waiter.wait_for_page(self.driver, timeout=self.config['browser']['page_load_timeout'])
         
     def execute_sochi_scenario(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """Выполнение сценария поиска отелей в Сочи"""
+        return self.execute_destination_scenario(results, self.config['scenarios']['sochi_winter'])
+        
+    def execute_andorra_scenario(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Выполнение сценария поиска отелей в Андорре"""
+        return self.execute_destination_scenario(results, self.config['scenarios']['andorra'])
         
-        scenario_config = self.config['scenarios']['sochi_winter']
+    def execute_destination_scenario(self, results: Dict[str, Any], scenario_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Выполнение сценария поиска отелей по направлению"""
         
         # Шаг 1: Поиск направления
-        step1 = self.search_destination(scenario_config['destination'])
+        step1 = self._run_step(self.search_destination, scenario_config['destination'])
         results['steps'].append(step1)
         
         # Шаг 2: Выбор дат
-        step2 = self.select_dates(scenario_config['check_in'], scenario_config['check_out'])
+        step2 = self._run_step(self.select_dates, scenario_config['check_in'], scenario_config['check_out'])
         results['steps'].append(step2)
         
         # Шаг 3: Настройка гостей
-        step3 = self.configure_guests(scenario_config['guests'], scenario_config['rooms'])
+        step3 = self._run_step(self.configure_guests, scenario_config['guests'], scenario_config['rooms'])
         results['steps'].append(step3)
         
         # Шаг 4: Поиск отелей
-        step4 = self.search_hotels()
+        step4 = self._run_step(self.search_hotels)
         results['steps'].append(step4)
         
         # Шаг 5: Анализ результатов
-        step5 = self.analyze_search_results()
+        step5 = self._run_step(self.analyze_search_results)
         results['steps'].append(step5)
         
-        return results
-        
-    def execute_andorra_scenario(self, results: Dict[str, Any]) -> Dict[str, Any]:
-        """Выполнение сценария поиска отелей в Андорре"""
-        
-        scenario_config = self.config['scenarios']['andorra']
+        # Шаг 6: Комбинации фильтров под требования сценария
+        if scenario_config.get('requirements') and self.config.get('filter_exploration', {}).get('requirements'):
+            step6 = self._run_step(self.explore_requirement_filters,
+                                   {results['scenario']: scenario_config['requirements']})
+            results['steps'].append(step6)
         
-        # Аналогичные шаги для Андорры
-        step1 = self.search_destination(scenario_config['destination'])
-        results['steps'].append(step1)
-        
-        step2 = self.select_dates(scenario_config['check_in'], scenario_config['check_out'])
-        results['steps'].append(step2)
-        
-        step3 = self.configure_guests(scenario_config['guests'], scenario_config['rooms'])
-        results['steps'].append(step3)
-        
-        step4 = self.search_hotels()
-        results['steps'].append(step4)
-        
-        step5 = self.analyze_search_results()
-        results['steps'].append(step5)
+        # Шаг 7: Обход всей выдачи (уводит со страницы результатов, поэтому последним)
+        if self.scenario_executor.crawler:
+            step7 = self._run_step(self.crawl_search_results, results['scenario'], scenario_config.get('requirements'))
+            results['steps'].append(step7)
         
         return results
         
@@ -175,19 +406,19 @@ class UXResearchAgent:
         """Полный анализ всех функций сайта"""
         
         # Анализ главной страницы
-        step1 = self.analyze_homepage()
+        step1 = self._run_step(self.analyze_homepage)
         results['steps'].append(step1)
         
         # Анализ поиска
-        step2 = self.analyze_search_functionality()
+        step2 = self._run_step(self.analyze_search_functionality)
         results['steps'].append(step2)
         
         # Анализ фильтров
-        step3 = self.analyze_filters()
+        step3 = self._run_step(self.analyze_filters)
         results['steps'].append(step3)
         
         # Анализ процесса бронирования
-        step4 = self.analyze_booking_process()
+        step4 = self._run_step(self.analyze_booking_process)
         results['steps'].append(step4)
         
         return results
@@ -198,17 +429,18 @@ class UXResearchAgent:
         
         try:
             # Поиск поля ввода
-            search_box = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.config['selectors']['search_box']))
-            )
+            search_box = self.lookup.find_required(self.driver, self.config['selectors']['search_box'])
             
             # Очистка поля и ввод направления
-            search_box.clear()
-            search_box.send_keys(destination)
-            time.sleep(self.config['delays']['user_action'])
+            if self.human_behavior:
+                self.user_simulator.simulate_human_behavior(self.driver, 'type', element=search_box, text=destination)
+            else:
+                search_box.clear()
+                search_box.send_keys(destination)
+            self.waiter.wait_for_update(self.driver)
             
             # Выбор первого предложения (если есть)
-            suggestions = self.driver.find_elements(By.CSS_SELECTOR, '.suggestion-item')
+            suggestions = self.lookup.find_optional(self.driver, '.suggestion-item')
             if suggestions:
                 suggestions[0].click()
                 
@@ -236,7 +468,7 @@ class UXResearchAgent:
         try:
             # Здесь будет логика выбора дат
             # Пока заглушка
-            time.sleep(self.config['delays']['user_action'])
+            self.waiter.wait_for_dom_quiet(self.driver)
             
             return {
                 'action': 'select_dates',
@@ -263,7 +495,7 @@ class UXResearchAgent:
         
         try:
             # Здесь будет логика настройки гостей
-            time.sleep(self.config['delays']['user_action'])
+            self.waiter.wait_for_dom_quiet(self.driver)
             
             return {
                 'action': 'configure_guests',
@@ -290,11 +522,14 @@ class UXResearchAgent:
         
         try:
             # Нажатие кнопки поиска
-            search_button = self.driver.find_element(By.CSS_SELECTOR, self.config['selectors']['search_button'])
-            search_button.click()
+            search_button = self.lookup.find_required(self.driver, self.config['selectors']['search_button'])
+            if self.human_behavior:
+                self.user_simulator.simulate_human_behavior(self.driver, 'click', element=search_button)
+            else:
+                search_button.click()
             
             # Ожидание загрузки результатов
-            time.sleep(self.config['delays']['page_load'])
+            self.waiter.wait_for_page(self.driver, timeout=self.config['browser']['page_load_timeout'])
             
             return {
                 'action': 'search_hotels',
@@ -316,11 +551,8 @@ class UXResearchAgent:
         logger.info("Анализ результатов поиска")
         
         try:
-            # Получение HTML страницы
-            page_source = self.driver.page_source
-            
-            # Анализ с помощью WebAnalyzer
-            analysis = self.web_analyzer.analyze_search_results(page_source)
+            # Анализ в странице (page_source передается только для сверки или при ошибке скрипта)
+            analysis, transfer = self.in_page_analyzer.analyze_search_results(self.driver)
             
             # Создание скриншота
             screenshot_path = f"screenshots/search_results_{int(time.time())}.png"
@@ -329,6 +561,7 @@ class UXResearchAgent:
             return {
                 'action': 'analyze_search_results',
                 'analysis': analysis,
+                'page_transfer': transfer,
                 'screenshot': screenshot_path,
                 'success': True,
                 'timestamp': time.time()
@@ -343,13 +576,68 @@ class UXResearchAgent:
                 'timestamp': time.time()
             }
             
+    def explore_requirement_filters(self, requirement_sets: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Комбинации фильтров выдачи, выполняющие требования"""
+        logger.info("Перебор комбинаций фильтров по требованиям")
+        
+        try:
+            explorer = self.scenario_executor.filter_explorer
+            exploration = explorer.explore_requirements(self.driver, requirement_sets)
+            error = explorer.requirements_error(exploration)
+            
+            step = {
+                'action': 'explore_requirement_filters',
+                'analysis': exploration,
+                'success': error is None,
+                'timestamp': time.time()
+            }
+            if error:
+                step['error'] = error
+            return step
+            
+        except Exception as e:
+            logger.error(f"Ошибка при переборе фильтров: {e}")
+            return {
+                'action': 'explore_requirement_filters',
+                'success': False,
+                'error': str(e),
+                'timestamp': time.time()
+            }
+            
+    def crawl_search_results(self, run: str = '', requirements: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Обход всей выдачи с прокруткой и пагинацией (карточки - в колоночное хранилище)"""
+        logger.info("Обход всей выдачи")
+        
+        try:
+            start = len(self.card_store)
+            crawl = self.scenario_executor.crawler.crawl(self.driver, lambda card: self.card_store.append(card, run))
+            if requirements:
+                rows = slice(start, len(self.card_store))
+                crawl['requirements_matched'] = int(self.card_store.match_requirements(requirements, rows).sum())
+            
+            return {
+                'action': 'crawl_search_results',
+                'analysis': crawl,
+                'success': True,
+                'timestamp': time.time()
+            }
+            
+        except Exception as e:
+            logger.error(f"Ошибка при обходе выдачи: {e}")
+            return {
+                'action': 'crawl_search_results',
+                'success': False,
+                'error': str(e),
+                'timestamp': time.time()
+            }
+            
     def analyze_homepage(self) -> Dict[str, Any]:
         """Анализ главной страницы"""
         logger.info("Анализ главной страницы")
         
         try:
-            page_source = self.driver.page_source
-            analysis = self.web_analyzer.analyze_homepage(page_source)
+            analysis, transfer = self.in_page_analyzer.analyze_homepage(
+                self.driver, self.page_metrics.navigation_timing(self.driver))
             
             screenshot_path = f"screenshots/homepage_{int(time.time())}.png"
             self.driver.save_screenshot(screenshot_path)
@@ -357,6 +645,7 @@ class UXResearchAgent:
             return {
                 'action': 'analyze_homepage',
                 'analysis': analysis,
+                'page_transfer': transfer,
                 'screenshot': screenshot_path,
                 'success': True,
                 'timestamp': time.time()
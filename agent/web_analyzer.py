@@ -4,24 +4,87 @@ Web Analyzer - модуль для анализа веб-страниц и эл
 
 import re
 import logging
-from typing import Dict, Any, List
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Optional, Callable
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 
+from .element_lookup import ElementLookup
+from .dom_index import DOMIndex
+from .page_parser import PageParser
+from .analysis_cache import AnalysisCache
+from .price_stats import price_range_report, average_price
+
 logger = logging.getLogger(__name__)
 
 class WebAnalyzer:
     """Анализатор веб-страниц"""
     
-    def __init__(self):
-        self.soup = None
+    # Меняется при изменении проверок: закэшированные результаты прошлых версий не используются
+    VERSION = '3'
+    
+    def __init__(self, lookup: Optional[ElementLookup] = None, parser_config: Optional[Dict[str, Any]] = None,
+                 cache: Optional[AnalysisCache] = None):
+        self.parser = PageParser(parser_config)
+        self.index = None
+        self.lookup = lookup or ElementLookup()
+        self.cache = cache
+        self.last_cache_hit = False  # Результат последнего анализа взят из кэша (без разбора)
+        
+    @property
+    def cache_version(self) -> str:
+        """Версия результатов для ключа кэша (парсеры могут по-разному разбирать битую разметку)"""
+        return f"{self.VERSION}:{self.parser.backend}:{self.parser.settings['strainers']}"
+        
+    @staticmethod
+    def timing_indicators(navigation_timing: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Время загрузки из Navigation Timing (мс от начала навигации)"""
+        timing = navigation_timing or {}
+        return {
+            'load_time': timing.get('load'),
+            'dom_content_loaded': timing.get('dom_content_loaded'),
+            'ttfb': timing.get('ttfb')
+        }
+        
+    def analyze_homepage(self, html_content: str, navigation_timing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Анализ главной страницы
         
-    def analyze_homepage(self, html_content: str) -> Dict[str, Any]:
-        """Анализ главной страницы"""
+        navigation_timing - Navigation Timing страницы из браузера (см. PageMetrics),
+        из него берется время загрузки.
+        """
         logger.info("Анализ главной страницы")
         
-        self.soup = BeautifulSoup(html_content, 'html.parser')
+        # Время загрузки не зависит от разметки и в кэш не попадает
+        analysis = self._cached('homepage', html_content, self._analyze_homepage_page)
+        analysis['performance_indicators'].update(self.timing_indicators(navigation_timing))
+        
+        return analysis
+        
+    def analyze_search_results(self, html_content: str) -> Dict[str, Any]:
+        """Анализ результатов поиска"""
+        logger.info("Анализ результатов поиска")
+        
+        return self._cached('search_results', html_content, self._analyze_search_results_page)
+        
+    def _cached(self, kind: str, html_content: str, analyze: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Анализ страницы через кэш по хэшу содержимого (если он подключен)"""
+        self.last_cache_hit = False
+        if not self.cache:
+            return analyze(html_content)
+
+        computed = []
+
+        def compute() -> Dict[str, Any]:
+            computed.append(True)
+            return analyze(html_content)
+
+        analysis = self.cache.get_or_compute(kind, html_content, self.cache_version, compute)
+        self.last_cache_hit = not computed
+        return analysis
+        
+    def _analyze_homepage_page(self, html_content: str) -> Dict[str, Any]:
+        """Проверки главной страницы"""
+        # Один обход документа; все проверки ниже читают индекс
+        self.index = self.parser.index(html_content, 'homepage')
         
         analysis = {
             'page_title': self._get_page_title(),
@@ -34,11 +97,10 @@ class WebAnalyzer:
         
         return analysis
         
-    def analyze_search_results(self, html_content: str) -> Dict[str, Any]:
-        """Анализ результатов поиска"""
-        logger.info("Анализ результатов поиска")
-        
-        self.soup = BeautifulSoup(html_content, 'html.parser')
+    def _analyze_search_results_page(self, html_content: str) -> Dict[str, Any]:
+        """Проверки выдачи"""
+        # Разбираются только карточки, фильтры, сортировка и пагинация (PARSE_ONLY)
+        self.index = self.parser.index(html_content, 'search_results')
         
         analysis = {
             'hotels_count': self._count_hotels(),
@@ -92,8 +154,8 @@ class WebAnalyzer:
         
     def _get_page_title(self) -> str:
         """Получение заголовка страницы"""
-        title = self.soup.find('title')
-        return title.get_text().strip() if title else "Заголовок не найден"
+        title = self.index.first(self.index.by_tag('title'))
+        return self.index.text(title) if title is not None else "Заголовок не найден"
         
     def _analyze_search_elements(self) -> Dict[str, Any]:
         """Анализ элементов поиска на главной странице"""
@@ -130,10 +192,11 @@ class WebAnalyzer:
     def _analyze_performance_indicators(self) -> Dict[str, Any]:
         """Анализ индикаторов производительности"""
         indicators = {
-            'load_time': None,  # Будет заполнено из метрик
-            'images_count': len(self.soup.find_all('img')),
-            'scripts_count': len(self.soup.find_all('script')),
-            'css_files_count': len(self.soup.find_all('link', rel='stylesheet'))
+            **self.timing_indicators(None),  # Заполняется в analyze_homepage
+            'images_count': len(self.index.by_tag('img')),
+            'scripts_count': len(self.index.by_tag('script')),
+            'css_files_count': len([link for link in self.index.by_tag('link')
+                                    if 'stylesheet' in DOMIndex.attr_text(link.get('rel')).split()])
         }
         
         return indicators
@@ -150,35 +213,16 @@ class WebAnalyzer:
         
     def _count_hotels(self) -> int:
         """Подсчет количества отелей в результатах"""
-        hotel_cards = self.soup.find_all(class_=re.compile(r'hotel|card|item'))
-        return len(hotel_cards)
+        return len(self.index.by_class(r'hotel|card|item'))
         
     def _analyze_available_filters(self) -> List[str]:
         """Анализ доступных фильтров"""
-        filters = []
-        
         # Поиск различных типов фильтров
-        filter_elements = self.soup.find_all(class_=re.compile(r'filter|facet'))
-        
-        for element in filter_elements:
-            filter_text = element.get_text().strip()
-            if filter_text:
-                filters.append(filter_text)
-                
-        return filters
+        return self.index.texts(self.index.by_class(r'filter|facet'))
         
     def _analyze_sorting_options(self) -> List[str]:
         """Анализ опций сортировки"""
-        sorting_options = []
-        
-        sort_elements = self.soup.find_all(class_=re.compile(r'sort|order'))
-        
-        for element in sort_elements:
-            option_text = element.get_text().strip()
-            if option_text:
-                sorting_options.append(option_text)
-                
-        return sorting_options
+        return self.index.texts(self.index.by_class(r'sort|order'))
         
     def _analyze_hotel_cards(self) -> Dict[str, Any]:
         """Анализ карточек отелей"""
@@ -190,31 +234,30 @@ class WebAnalyzer:
             'average_price': 0
         }
         
-        hotel_cards = self.soup.find_all(class_=re.compile(r'hotel|card'))
+        hotel_cards = self.index.by_class(r'hotel|card')
         cards_analysis['total_cards'] = len(hotel_cards)
         
-        prices = []
+        images = self.index.by_tag('img')
+        price_elements = self.index.by_class(r'price|cost')
+        rating_elements = self.index.by_class(r'rating|star')
+        
+        price_texts = []
         for card in hotel_cards:
             # Проверка наличия изображений
-            if card.find('img'):
+            if self.index.first_within(card, images) is not None:
                 cards_analysis['cards_with_images'] += 1
                 
-            # Проверка наличия цен
-            price_element = card.find(class_=re.compile(r'price|cost'))
-            if price_element:
+            # Проверка наличия цен (разбираются все сразу)
+            price_element = self.index.first_within(card, price_elements)
+            if price_element is not None:
                 cards_analysis['cards_with_prices'] += 1
-                price_text = price_element.get_text()
-                price_match = re.search(r'\d+', price_text.replace(' ', ''))
-                if price_match:
-                    prices.append(int(price_match.group()))
+                price_texts.append(self.index.text(price_element))
                     
             # Проверка наличия рейтингов
-            rating_element = card.find(class_=re.compile(r'rating|star'))
-            if rating_element:
+            if self.index.first_within(card, rating_elements) is not None:
                 cards_analysis['cards_with_ratings'] += 1
                 
-        if prices:
-            cards_analysis['average_price'] = sum(prices) / len(prices)
+        cards_analysis['average_price'] = average_price(price_texts)
             
         return cards_analysis
         
@@ -227,63 +270,33 @@ class WebAnalyzer:
             'next_page_available': False
         }
         
-        pagination_element = self.soup.find(class_=re.compile(r'pagination|pages'))
-        if pagination_element:
+        pagination_element = self.index.first(self.index.by_class(r'pagination|pages'))
+        if pagination_element is not None:
             pagination['has_pagination'] = True
             
             # Поиск текущей страницы
-            current_page = pagination_element.find(class_=re.compile(r'current|active'))
-            if current_page:
-                page_text = current_page.get_text()
-                page_match = re.search(r'\d+', page_text)
+            current_page = self.index.first_within(pagination_element, self.index.by_class(r'current|active'))
+            if current_page is not None:
+                page_match = re.search(r'\d+', self.index.text(current_page))
                 if page_match:
                     pagination['current_page'] = int(page_match.group())
                     
             # Поиск кнопки следующей страницы
-            next_button = pagination_element.find(class_=re.compile(r'next|forward'))
-            if next_button and not 'disabled' in next_button.get('class', []):
+            next_button = self.index.first_within(pagination_element, self.index.by_class(r'next|forward'))
+            if next_button is not None and not 'disabled' in self.index.class_list(next_button):
                 pagination['next_page_available'] = True
                 
         return pagination
         
     def _analyze_price_range(self) -> Dict[str, Any]:
-        """Анализ диапазона цен"""
-        price_range = {
-            'min_price': None,
-            'max_price': None,
-            'price_distribution': {}
-        }
-        
-        price_elements = self.soup.find_all(class_=re.compile(r'price|cost'))
-        prices = []
-        
-        for element in price_elements:
-            price_text = element.get_text()
-            price_match = re.search(r'\d+', price_text.replace(' ', ''))
-            if price_match:
-                price = int(price_match.group())
-                prices.append(price)
-                
-        if prices:
-            price_range['min_price'] = min(prices)
-            price_range['max_price'] = max(prices)
-            
-            # Распределение цен по диапазонам
-            if price_range['max_price'] > price_range['min_price']:
-                range_size = (price_range['max_price'] - price_range['min_price']) / 5
-                for i in range(5):
-                    start = price_range['min_price'] + i * range_size
-                    end = price_range['min_price'] + (i + 1) * range_size
-                    count = len([p for p in prices if start <= p < end])
-                    price_range['price_distribution'][f'{int(start)}-{int(end)}'] = count
-                    
-        return price_range
+        """Анализ диапазона цен: распределение, медиана, процентили и выбросы"""
+        return price_range_report(self.index.text(element) for element in self.index.by_class(r'price|cost'))
         
     def _find_search_box(self) -> Dict[str, Any]:
         """Поиск поля поиска"""
-        search_box = self.soup.find('input', attrs={'name': re.compile(r'query|search|destination')})
+        search_box = self.index.first(self.index.with_attr('name', r'query|search|destination', tag='input'))
         
-        if search_box:
+        if search_box is not None:
             return {
                 'found': True,
                 'placeholder': search_box.get('placeholder', ''),
@@ -295,25 +308,16 @@ class WebAnalyzer:
             
     def _find_destination_suggestions(self) -> List[str]:
         """Поиск предложений направлений"""
-        suggestions = []
-        
         # Поиск элементов с предложениями
-        suggestion_elements = self.soup.find_all(class_=re.compile(r'suggestion|autocomplete|dropdown'))
-        
-        for element in suggestion_elements:
-            suggestion_text = element.get_text().strip()
-            if suggestion_text:
-                suggestions.append(suggestion_text)
-                
-        return suggestions
+        return self.index.texts(self.index.by_class(r'suggestion|autocomplete|dropdown'))
         
     def _find_date_inputs(self) -> List[Dict[str, Any]]:
         """Поиск полей ввода дат"""
         date_inputs = []
         
         # Поиск полей дат
-        date_elements = self.soup.find_all('input', attrs={'type': 'date'})
-        date_elements.extend(self.soup.find_all(class_=re.compile(r'date|calendar')))
+        date_elements = [element for element in self.index.by_tag('input') if element.get('type') == 'date']
+        date_elements.extend(self.index.by_class(r'date|calendar'))
         
         for element in date_elements:
             date_inputs.append({
@@ -329,11 +333,11 @@ class WebAnalyzer:
         guest_inputs = []
         
         # Поиск элементов для гостей
-        guest_elements = self.soup.find_all(class_=re.compile(r'guest|person|traveler'))
+        guest_elements = self.index.by_class(r'guest|person|traveler')
         
         for element in guest_elements:
             guest_inputs.append({
-                'text': element.get_text().strip(),
+                'text': self.index.text(element),
                 'type': element.get('type', 'text')
             })
             
@@ -342,49 +346,33 @@ class WebAnalyzer:
     def _find_main_menu(self) -> List[str]:
         """Поиск главного меню"""
         menu_items = []
+        links = self.index.by_tag('a')
         
         # Поиск элементов меню
-        menu_elements = self.soup.find_all(class_=re.compile(r'menu|nav|header'))
-        
-        for element in menu_elements:
-            links = element.find_all('a')
-            for link in links:
-                link_text = link.get_text().strip()
-                if link_text:
-                    menu_items.append(link_text)
+        for element in self.index.by_class(r'menu|nav|header'):
+            menu_items.extend(self.index.texts(self.index.within(element, links)))
                     
         return menu_items
         
     def _find_breadcrumbs(self) -> List[str]:
         """Поиск хлебных крошек"""
         breadcrumbs = []
+        links = self.index.by_tag('a')
         
         # Поиск хлебных крошек
-        breadcrumb_elements = self.soup.find_all(class_=re.compile(r'breadcrumb|bread'))
-        
-        for element in breadcrumb_elements:
-            links = element.find_all('a')
-            for link in links:
-                link_text = link.get_text().strip()
-                if link_text:
-                    breadcrumbs.append(link_text)
+        for element in self.index.by_class(r'breadcrumb|bread'):
+            breadcrumbs.extend(self.index.texts(self.index.within(element, links)))
                     
         return breadcrumbs
         
     def _find_footer_links(self) -> List[str]:
         """Поиск ссылок в футере"""
-        footer_links = []
-        
         # Поиск футера
-        footer = self.soup.find('footer')
-        if footer:
-            links = footer.find_all('a')
-            for link in links:
-                link_text = link.get_text().strip()
-                if link_text:
-                    footer_links.append(link_text)
+        footer = self.index.first(self.index.by_tag('footer'))
+        if footer is not None:
+            return self.index.texts(self.index.within(footer, self.index.by_tag('a')))
                     
-        return footer_links
+        return []
         
     def _find_hero_section(self) -> Dict[str, Any]:
         """Поиск главной секции"""
@@ -396,82 +384,63 @@ class WebAnalyzer:
         }
         
         # Поиск главной секции
-        hero_element = self.soup.find(class_=re.compile(r'hero|banner|main'))
+        hero_element = self.index.first(self.index.by_class(r'hero|banner|main'))
         
-        if hero_element:
+        if hero_element is not None:
             hero['found'] = True
             
             # Поиск заголовка
-            title = hero_element.find(['h1', 'h2'])
-            if title:
-                hero['title'] = title.get_text().strip()
+            title = self.index.first_within(hero_element, self.index.by_tag('h1', 'h2'))
+            if title is not None:
+                hero['title'] = self.index.text(title)
                 
             # Поиск подзаголовка
-            subtitle = hero_element.find(['h3', 'h4', 'p'])
-            if subtitle:
-                hero['subtitle'] = subtitle.get_text().strip()
+            subtitle = self.index.first_within(hero_element, self.index.by_tag('h3', 'h4', 'p'))
+            if subtitle is not None:
+                hero['subtitle'] = self.index.text(subtitle)
                 
             # Поиск кнопки призыва к действию
-            cta_button = hero_element.find('button')
-            if cta_button:
-                hero['cta_button'] = cta_button.get_text().strip()
+            cta_button = self.index.first_within(hero_element, self.index.by_tag('button'))
+            if cta_button is not None:
+                hero['cta_button'] = self.index.text(cta_button)
                 
         return hero
         
     def _find_featured_destinations(self) -> List[str]:
         """Поиск популярных направлений"""
-        destinations = []
-        
         # Поиск секции с направлениями
-        destinations_section = self.soup.find(class_=re.compile(r'destination|popular|featured'))
+        destinations_section = self.index.first(self.index.by_class(r'destination|popular|featured'))
         
-        if destinations_section:
-            destination_elements = destinations_section.find_all(class_=re.compile(r'city|destination|place'))
-            
-            for element in destination_elements:
-                destination_text = element.get_text().strip()
-                if destination_text:
-                    destinations.append(destination_text)
+        if destinations_section is not None:
+            return self.index.texts(self.index.within(destinations_section,
+                                                      self.index.by_class(r'city|destination|place')))
                     
-        return destinations
+        return []
         
     def _find_special_offers(self) -> List[str]:
         """Поиск специальных предложений"""
-        offers = []
-        
         # Поиск секции с предложениями
-        offers_section = self.soup.find(class_=re.compile(r'offer|deal|promotion'))
+        offers_section = self.index.first(self.index.by_class(r'offer|deal|promotion'))
         
-        if offers_section:
-            offer_elements = offers_section.find_all(class_=re.compile(r'offer|deal'))
-            
-            for element in offer_elements:
-                offer_text = element.get_text().strip()
-                if offer_text:
-                    offers.append(offer_text)
+        if offers_section is not None:
+            return self.index.texts(self.index.within(offers_section, self.index.by_class(r'offer|deal')))
                     
-        return offers
+        return []
         
     def _find_testimonials(self) -> List[str]:
         """Поиск отзывов"""
-        testimonials = []
-        
         # Поиск секции с отзывами
-        testimonials_section = self.soup.find(class_=re.compile(r'testimonial|review|feedback'))
+        testimonials_section = self.index.first(self.index.by_class(r'testimonial|review|feedback'))
         
-        if testimonials_section:
-            testimonial_elements = testimonials_section.find_all(class_=re.compile(r'testimonial|review'))
-            
-            for element in testimonial_elements:
-                testimonial_text = element.get_text().strip()
-                if testimonial_text:
-                    testimonials.append(testimonial_text)
+        if testimonials_section is not None:
+            return self.index.texts(self.index.within(testimonials_section,
+                                                      self.index.by_class(r'testimonial|review')))
                     
-        return testimonials
+        return []
         
     def _check_alt_texts(self) -> Dict[str, Any]:
         """Проверка alt-текстов изображений"""
-        images = self.soup.find_all('img')
+        images = self.index.by_tag('img')
         total_images = len(images)
         images_with_alt = len([img for img in images if img.get('alt')])
         
@@ -483,7 +452,7 @@ class WebAnalyzer:
         
     def _check_aria_labels(self) -> Dict[str, Any]:
         """Проверка aria-лейблов"""
-        elements_with_aria = self.soup.find_all(attrs={'aria-label': True})
+        elements_with_aria = self.index.with_attr('aria-label')
         
         return {
             'elements_with_aria': len(elements_with_aria),
@@ -493,13 +462,13 @@ class WebAnalyzer:
     def _check_semantic_elements(self) -> Dict[str, Any]:
         """Проверка семантических элементов"""
         semantic_elements = {
-            'header': len(self.soup.find_all('header')),
-            'nav': len(self.soup.find_all('nav')),
-            'main': len(self.soup.find_all('main')),
-            'section': len(self.soup.find_all('section')),
-            'article': len(self.soup.find_all('article')),
-            'aside': len(self.soup.find_all('aside')),
-            'footer': len(self.soup.find_all('footer'))
+            'header': len(self.index.by_tag('header')),
+            'nav': len(self.index.by_tag('nav')),
+            'main': len(self.index.by_tag('main')),
+            'section': len(self.index.by_tag('section')),
+            'article': len(self.index.by_tag('article')),
+            'aside': len(self.index.by_tag('aside')),
+            'footer': len(self.index.by_tag('footer'))
         }
         
         return semantic_elements
@@ -508,7 +477,10 @@ class WebAnalyzer:
     def _analyze_search_box(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ поля поиска с помощью Selenium"""
         try:
-            search_box = driver.find_element(By.CSS_SELECTOR, 'input[name*="query"], input[placeholder*="поиск"]')
+            search_box = self.lookup.find_first(driver, 'input[name*="query"], input[placeholder*="поиск"]')
+            if not search_box:
+                return {'found': False}
+                
             return {
                 'found': True,
                 'placeholder': search_box.get_attribute('placeholder'),
@@ -522,7 +494,7 @@ class WebAnalyzer:
     def _analyze_date_pickers(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ выбора дат"""
         try:
-            date_elements = driver.find_elements(By.CSS_SELECTOR, 'input[type="date"], .date-picker')
+            date_elements = self.lookup.find_optional(driver, 'input[type="date"], .date-picker')
             return {
                 'count': len(date_elements),
                 'elements': [{'type': elem.get_attribute('type'), 'enabled': elem.is_enabled()} for elem in date_elements]
@@ -533,7 +505,7 @@ class WebAnalyzer:
     def _analyze_guest_selectors(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ селекторов гостей"""
         try:
-            guest_elements = driver.find_elements(By.CSS_SELECTOR, '.guest-selector, .traveler-selector')
+            guest_elements = self.lookup.find_optional(driver, '.guest-selector, .traveler-selector')
             return {
                 'count': len(guest_elements),
                 'elements': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in guest_elements]
@@ -544,7 +516,10 @@ class WebAnalyzer:
     def _analyze_search_button(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ кнопки поиска"""
         try:
-            search_button = driver.find_element(By.CSS_SELECTOR, 'button[type="submit"], .search-button')
+            search_button = self.lookup.find_first(driver, 'button[type="submit"], .search-button')
+            if not search_button:
+                return {'found': False}
+                
             return {
                 'found': True,
                 'text': search_button.text,
@@ -557,7 +532,7 @@ class WebAnalyzer:
     def _analyze_price_filters(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ фильтров цен"""
         try:
-            price_filters = driver.find_elements(By.CSS_SELECTOR, '.price-filter, .cost-filter')
+            price_filters = self.lookup.find_optional(driver, '.price-filter, .cost-filter')
             return {
                 'count': len(price_filters),
                 'filters': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in price_filters]
@@ -568,7 +543,7 @@ class WebAnalyzer:
     def _analyze_star_filters(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ фильтров по звездам"""
         try:
-            star_filters = driver.find_elements(By.CSS_SELECTOR, '.star-filter, .rating-filter')
+            star_filters = self.lookup.find_optional(driver, '.star-filter, .rating-filter')
             return {
                 'count': len(star_filters),
                 'filters': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in star_filters]
@@ -579,7 +554,7 @@ class WebAnalyzer:
     def _analyze_amenity_filters(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ фильтров удобств"""
         try:
-            amenity_filters = driver.find_elements(By.CSS_SELECTOR, '.amenity-filter, .facility-filter')
+            amenity_filters = self.lookup.find_optional(driver, '.amenity-filter, .facility-filter')
             return {
                 'count': len(amenity_filters),
                 'filters': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in amenity_filters]
@@ -590,7 +565,7 @@ class WebAnalyzer:
     def _analyze_location_filters(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ фильтров местоположения"""
         try:
-            location_filters = driver.find_elements(By.CSS_SELECTOR, '.location-filter, .area-filter')
+            location_filters = self.lookup.find_optional(driver, '.location-filter, .area-filter')
             return {
                 'count': len(location_filters),
                 'filters': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in location_filters]
@@ -601,7 +576,7 @@ class WebAnalyzer:
     def _analyze_booking_buttons(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ кнопок бронирования"""
         try:
-            booking_buttons = driver.find_elements(By.CSS_SELECTOR, '.booking-button, .book-button')
+            booking_buttons = self.lookup.find_optional(driver, '.booking-button, .book-button')
             return {
                 'count': len(booking_buttons),
                 'buttons': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in booking_buttons]
@@ -612,7 +587,7 @@ class WebAnalyzer:
     def _analyze_room_selection(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ выбора комнат"""
         try:
-            room_elements = driver.find_elements(By.CSS_SELECTOR, '.room-selection, .room-option')
+            room_elements = self.lookup.find_optional(driver, '.room-selection, .room-option')
             return {
                 'count': len(room_elements),
                 'options': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in room_elements]
@@ -623,7 +598,7 @@ class WebAnalyzer:
     def _analyze_guest_form(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ формы гостей"""
         try:
-            form_elements = driver.find_elements(By.CSS_SELECTOR, '.guest-form, .traveler-form')
+            form_elements = self.lookup.find_optional(driver, '.guest-form, .traveler-form')
             return {
                 'count': len(form_elements),
                 'forms': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in form_elements]
@@ -634,7 +609,7 @@ class WebAnalyzer:
     def _analyze_payment_options(self, driver: WebDriver) -> Dict[str, Any]:
         """Анализ опций оплаты"""
         try:
-            payment_elements = driver.find_elements(By.CSS_SELECTOR, '.payment-option, .payment-method')
+            payment_elements = self.lookup.find_optional(driver, '.payment-option, .payment-method')
             return {
                 'count': len(payment_elements),
                 'options': [{'text': elem.text, 'enabled': elem.is_enabled()} for elem in payment_elements]
@@ -0,0 +1,3 @@
+"""
+Benchmarks - локальный тестовый сайт и сквозные замеры производительности агента
+"""
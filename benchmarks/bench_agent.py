@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Сквозной замер агента на локальном тестовом сайте
+
+Для каждого размера выдачи поднимается FixtureSite, config['base_url'] указывает
+на него, и сценарий прогоняется несколько раз (последовательно или в пакетном режиме).
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.ux_agent import UXResearchAgent
+from agent.batch_runner import BatchRunner
+from config.settings import load_config
+from benchmarks.fixture_site import FixtureSite
+
+logger = logging.getLogger(__name__)
+
+def summarize_runs(runs: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    """Сводка по прогонам одного размера выдачи"""
+    durations = [run['duration'] for run in runs]
+    steps = [step for run in runs for step in run['steps']]
+
+    return {
+        'runs': len(runs),
+        'wall_time': round(wall_time, 3),
+        'throughput_per_min': round(len(runs) / wall_time * 60, 2) if wall_time > 0 else 0,
+        'duration_mean': round(statistics.mean(durations), 3) if durations else 0,
+        'duration_median': round(statistics.median(durations), 3) if durations else 0,
+        'duration_max': round(max(durations), 3) if durations else 0,
+        'wait_time_mean': round(statistics.mean([run['wait_time'] for run in runs]), 3) if runs else 0,
+        'steps_success_rate': round(len([s for s in steps if s.get('success')]) / len(steps), 3) if steps else 0,
+        'errors': [run['error'] for run in runs if run.get('error')]
+    }
+
+def _run_record(results: Dict[str, Any], duration: float) -> Dict[str, Any]:
+    """Краткая запись об одном прогоне"""
+    steps = results.get('steps', [])
+    return {
+        'duration': duration,
+        'steps': [{'action': step.get('action'), 'success': step.get('success')} for step in steps],
+        'wait_time': sum(step.get('wait_time', 0) for step in steps),
+        'error': results.get('error')
+    }
+
+def bench_sequential(config: Dict[str, Any], scenario: str, runs: int) -> List[Dict[str, Any]]:
+    """Последовательные прогоны в одном браузере"""
+    records = []
+
+    with UXResearchAgent(config, headless=True) as agent:
+        for _ in range(runs):
+            start_time = time.time()
+            results = agent.run_scenario(scenario)
+            records.append(_run_record(results, time.time() - start_time))
+
+    return records
+
+def bench_parallel(config: Dict[str, Any], scenario: str, runs: int, workers: int) -> List[Dict[str, Any]]:
+    """Прогоны в пуле процессов (как main.py --parallel)"""
+    jobs = [
+        {'job_id': f'{scenario}__{index}', 'scenario': scenario, 'scenario_config': config['scenarios'][scenario]}
+        for index in range(runs)
+    ]
+
+    runner = BatchRunner(config, workers=workers, headless=True)
+    return [_run_record(results, results.get('duration', 0)) for _, results in runner.run(jobs)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер производительности агента на локальном сайте')
+    parser.add_argument('--scenario', default='sochi_winter', help='Сценарий из config["scenarios"]')
+    parser.add_argument('--results', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                        help='Размеры выдачи (количество карточек)')
+    parser.add_argument('--runs', type=int, default=3, help='Прогонов на каждый размер')
+    parser.add_argument('--parallel', type=int, metavar='N', help='Выполнять прогоны в N процессах')
+    parser.add_argument('--latency', type=float, default=0, help='Задержка HTML-страниц, мс')
+    parser.add_argument('--api-latency', type=float, default=0, help='Задержка API-ответов, мс')
+    parser.add_argument('--dom-padding', type=int, default=0, help='Дополнительных узлов в карточке')
+    parser.add_argument('--output', default='reports', help='Папка для сохранения результатов')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    Path('logs').mkdir(exist_ok=True)
+    Path(args.output).mkdir(exist_ok=True)
+
+    report = {
+        'scenario': args.scenario,
+        'settings': {
+            'runs': args.runs,
+            'parallel': args.parallel,
+            'latency_ms': args.latency,
+            'api_latency_ms': args.api_latency,
+            'dom_padding': args.dom_padding
+        },
+        'sizes': {}
+    }
+
+    for results_count in args.results:
+        with FixtureSite(results=results_count, latency_ms=args.latency,
+                         api_latency_ms=args.api_latency, dom_padding=args.dom_padding) as site:
+            config = load_config()
+            config['base_url'] = site.base_url
+
+            start_time = time.time()
+            if args.parallel:
+                runs = bench_parallel(config, args.scenario, args.runs, args.parallel)
+            else:
+                runs = bench_sequential(config, args.scenario, args.runs)
+
+            summary = summarize_runs(runs, time.time() - start_time)
+            report['sizes'][results_count] = summary
+
+        print(f"{results_count:>6} карточек: {summary['duration_mean']:.2f} сек/прогон "
+              f"(медиана {summary['duration_median']:.2f}), {summary['throughput_per_min']:.1f} прогонов/мин, "
+              f"успешных шагов {summary['steps_success_rate']:.0%}")
+
+    report_path = Path(args.output) / f'benchmark_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"Результаты сохранены: {report_path}")
+
+if __name__ == "__main__":
+    main()
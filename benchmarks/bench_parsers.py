@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Замер разбора страниц выдачи разными парсерами WebAnalyzer
+
+Страницы берутся из сохраненных HTML-файлов, из HAR-архивов прогонов
+(документы text/html) или генерируются FixtureSite. Для каждой страницы
+анализ выполняется каждым парсером с ограничением разбора и без него;
+результат сравнивается с эталоном (html.parser, вся страница).
+"""
+
+import sys
+import json
+import time
+import base64
+import argparse
+import logging
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.web_analyzer import WebAnalyzer
+from agent.page_parser import PARSER_BACKENDS
+from agent.har_archive import load_har
+from benchmarks.fixture_site import FixtureSite
+
+logger = logging.getLogger(__name__)
+
+def pages_from_har(path: str) -> List[Tuple[str, str]]:
+    """HTML-документы из HAR-архива"""
+    pages = []
+    for entry in load_har(path)['log']['entries']:
+        content = entry['response'].get('content', {})
+        if entry.get('_resourceType') != 'Document' or 'html' not in content.get('mimeType', ''):
+            continue
+
+        text = content.get('text', '')
+        if content.get('encoding') == 'base64':
+            text = base64.b64decode(text).decode('utf-8', errors='replace')
+        if text:
+            pages.append((entry['request']['url'], text))
+
+    return pages
+
+def fixture_pages(sizes: List[int], dom_padding: int) -> List[Tuple[str, str]]:
+    """Страницы выдачи тестового сайта (все карточки на одной странице)"""
+    pages = []
+    for results_count in sizes:
+        site = FixtureSite(results=results_count, page_size=0, dom_padding=dom_padding)
+        try:
+            pages.append((f'fixture:{results_count}', site.render_results({})))
+        finally:
+            site.server.server_close()
+
+    return pages
+
+def bench_page(html: str, runs: int) -> Dict[str, Any]:
+    """Все парсеры на одной странице"""
+    reference = WebAnalyzer(parser_config={'backend': 'html.parser', 'strainers': False}).analyze_search_results(html)
+    variants = {}
+
+    for backend in PARSER_BACKENDS:
+        for strainers in (False, True):
+            # Для lxml.html ограничение разбора не применяется
+            if backend == 'lxml.html' and strainers:
+                continue
+
+            analyzer = WebAnalyzer(parser_config={'backend': backend, 'strainers': strainers})
+            timings = []
+            for _ in range(runs):
+                start_time = time.perf_counter()
+                analysis = analyzer.analyze_search_results(html)
+                timings.append({**analyzer.parser.last_timing, 'total': time.perf_counter() - start_time})
+
+            variants[f'{backend}{" +strainer" if strainers else ""}'] = {
+                'parse_median': round(statistics.median(t['parse'] for t in timings), 4),
+                'index_median': round(statistics.median(t['index'] for t in timings), 4),
+                'total_median': round(statistics.median(t['total'] for t in timings), 4),
+                'elements': timings[-1]['elements'],
+                'matches_reference': analysis == reference
+            }
+
+    return variants
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер парсеров HTML на страницах выдачи')
+    parser.add_argument('--pages', nargs='*', default=[], help='Сохраненные HTML-страницы выдачи')
+    parser.add_argument('--har', nargs='*', default=[], help='HAR-архивы прогонов (берутся документы text/html)')
+    parser.add_argument('--results', type=int, nargs='*', default=[100, 1000, 5000],
+                        help='Размеры выдачи тестового сайта (если страницы не указаны)')
+    parser.add_argument('--dom-padding', type=int, default=0, help='Дополнительных узлов в карточке')
+    parser.add_argument('--runs', type=int, default=5, help='Повторов на каждый парсер')
+    parser.add_argument('--output', default='reports', help='Папка для сохранения результатов')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    Path(args.output).mkdir(exist_ok=True)
+
+    pages = [(path, Path(path).read_text(encoding='utf-8', errors='replace')) for path in args.pages]
+    for path in args.har:
+        pages.extend(pages_from_har(path))
+    if not pages:
+        pages = fixture_pages(args.results, args.dom_padding)
+
+    report = {'runs': args.runs, 'pages': {}}
+
+    for name, html in pages:
+        variants = bench_page(html, args.runs)
+        report['pages'][name] = {'size_kb': round(len(html.encode('utf-8')) / 1024, 1), 'variants': variants}
+
+        print(f"{name} ({report['pages'][name]['size_kb']} КБ)")
+        for variant, summary in variants.items():
+            print(f"  {variant:<24} разбор {summary['parse_median']:.3f} сек, индекс {summary['index_median']:.3f} сек, "
+                  f"всего {summary['total_median']:.3f} сек"
+                  f"{'' if summary['matches_reference'] else ', РЕЗУЛЬТАТ ОТЛИЧАЕТСЯ'}")
+
+    report_path = Path(args.output) / f'parsers_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"Результаты сохранены: {report_path}")
+
+if __name__ == "__main__":
+    main()
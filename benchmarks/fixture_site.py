@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Fixture Site - локальный сайт-заменитель для сквозных замеров агента
+
+Повторяет структуру страниц, с которыми работают ScenarioExecutor и WebAnalyzer:
+главная с автодополнением, выбором дат и гостей, выдача с карточками .hotel-card
+и фильтрами, страница отеля и форма бронирования. Задержка ответов, количество
+карточек и размер DOM настраиваются.
+"""
+
+import json
+import time
+import random
+import argparse
+import logging
+import threading
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SITE_CONFIG = {
+    'latency_ms': 0,  # Задержка HTML-страниц
+    'api_latency_ms': 0,  # Задержка ответов /api/* (автодополнение, фильтры)
+    'results': 50,  # Количество отелей в выдаче (10 - 10 000)
+    'page_size': None,  # Карточек на странице выдачи (None - все сразу)
+    'dom_padding': 0,  # Дополнительных узлов в каждой карточке (увеличение DOM)
+    'seed': 42
+}
+
+DESTINATIONS = ['Сочи', 'Красная Поляна', 'Андорра', 'Шерегеш', 'Домбай', 'Архыз', 'Москва', 'Санкт-Петербург']
+NAME_PREFIXES = ['Гранд', 'Альпийский', 'Ривьера', 'Горный', 'Парк', 'Морской', 'Снежный', 'Панорама']
+NAME_SUFFIXES = ['Отель', 'Резорт', 'Шале', 'Апартаменты', 'Лодж', 'Спа-отель']
+DISTRICTS = ['Центр', 'У моря', 'У подъемников', 'Старый город']
+AMENITIES = ['Wi-Fi', 'Бассейн', 'Парковка', 'Спа', 'Завтрак', 'Трансфер']
+SORT_OPTIONS = {'popular': 'По популярности', 'price': 'Сначала дешевле', 'rating': 'По рейтингу'}
+
+STYLE = """
+body { font-family: sans-serif; margin: 0; }
+header, footer { padding: 12px 24px; background: #f3f3f3; }
+.main-menu a, footer a { margin-right: 12px; }
+.hero { padding: 40px 24px; background: #dfefff; }
+.search-form { display: flex; gap: 8px; align-items: flex-start; }
+.autocomplete { position: absolute; background: #fff; border: 1px solid #ccc; }
+.suggestion { padding: 4px 8px; cursor: pointer; }
+.guests-popup { display: none; }
+.guests-selector.open .guests-popup { display: block; }
+.layout { display: flex; gap: 24px; padding: 24px; }
+.filters { width: 240px; }
+.filter-option, .sort-option { cursor: pointer; padding: 2px 0; }
+.active-filter { font-weight: bold; }
+.results-grid { display: grid; grid-template-columns: repeat(3, 1fr); gap: 12px; flex: 1; }
+.hotel-card { border: 1px solid #ddd; padding: 8px; }
+.hotel-card img { width: 100%; height: 120px; background: #eee; }
+"""
+
+HOMEPAGE_SCRIPT = """
+var input = document.querySelector('input[name="query"]');
+var list = document.querySelector('.autocomplete');
+input.addEventListener('input', function () {
+    fetch('/api/suggest?q=' + encodeURIComponent(input.value))
+        .then(function (response) { return response.json(); })
+        .then(function (items) {
+            list.innerHTML = items.map(function (item) {
+                return '<div class="suggestion suggestion-item autocomplete-item">' + item + '</div>';
+            }).join('');
+        });
+});
+list.addEventListener('click', function (event) {
+    if (event.target.classList.contains('suggestion')) {
+        input.value = event.target.textContent;
+        list.innerHTML = '';
+    }
+});
+document.querySelector('.guests-selector .guests-toggle').addEventListener('click', function () {
+    document.querySelector('.guests-selector').classList.toggle('open');
+});
+"""
+
+RESULTS_SCRIPT = """
+var params = new URLSearchParams(location.search);
+var state = {stars: null, price_max: null, amenities: [], districts: [], sort: 'popular'};
+
+function refresh() {
+    var query = new URLSearchParams(params);
+    if (state.stars) { query.set('stars', state.stars); }
+    if (state.price_max) { query.set('price_max', state.price_max); }
+    state.amenities.forEach(function (value) { query.append('amenity', value); });
+    state.districts.forEach(function (value) { query.append('district', value); });
+    query.set('sort', state.sort);
+    fetch('/api/results?' + query)
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+            document.querySelector('.results-grid').innerHTML = data.html;
+            document.querySelector('.results-count').textContent = data.total;
+        });
+}
+
+function toggle(list, value) {
+    var index = list.indexOf(value);
+    if (index >= 0) { list.splice(index, 1); } else { list.push(value); }
+}
+
+document.querySelectorAll('.filter-option').forEach(function (element) {
+    element.addEventListener('click', function () {
+        element.classList.toggle('active-filter');
+        var kind = element.dataset.kind, value = element.dataset.value;
+        if (kind === 'stars') { state.stars = state.stars === value ? null : value; }
+        if (kind === 'amenity') { toggle(state.amenities, value); }
+        if (kind === 'district') { toggle(state.districts, value); }
+        refresh();
+    });
+});
+document.querySelectorAll('.price-range input').forEach(function (element) {
+    ['change', 'input'].forEach(function (type) {
+        element.addEventListener(type, function () { state.price_max = element.value; refresh(); });
+    });
+});
+document.querySelectorAll('.sort-option').forEach(function (element) {
+    element.addEventListener('click', function () { state.sort = element.dataset.sort; refresh(); });
+});
+document.querySelector('.results-grid').addEventListener('click', function (event) {
+    var card = event.target.closest('.hotel-card');
+    if (card && !event.target.closest('a')) { location.href = card.dataset.href; }
+});
+"""
+
+def generate_hotels(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Детерминированный набор отелей"""
+    rng = random.Random(seed)
+    hotels = []
+
+    for hotel_id in range(1, count + 1):
+        hotels.append({
+            'id': hotel_id,
+            'name': f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_SUFFIXES)} {hotel_id}",
+            'stars': rng.randint(2, 5),
+            'rating': round(rng.uniform(6.0, 9.9), 1),
+            'price': rng.randrange(2000, 40000, 100),
+            'district': rng.choice(DISTRICTS),
+            'amenities': sorted(rng.sample(AMENITIES, rng.randint(1, len(AMENITIES))))
+        })
+
+    return hotels
+
+class FixtureSite:
+    """Локальный HTTP-сервер сайта-заменителя"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, **settings):
+        self.settings = {**DEFAULT_SITE_CONFIG, **settings}
+        self.hotels = generate_hotels(self.settings['results'], self.settings['seed'])
+        self.requests_served = 0
+
+        self.server = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+        self.server.daemon_threads = True
+        self.server.site = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Адрес сайта (для config['base_url'])"""
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'FixtureSite':
+        """Запуск сервера в фоновом потоке"""
+        self._thread = threading.Thread(target=self.server.serve_forever, name='fixture-site', daemon=True)
+        self._thread.start()
+        logger.info(f"Тестовый сайт запущен: {self.base_url} ({len(self.hotels)} отелей)")
+        return self
+
+    def stop(self):
+        """Остановка сервера"""
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join(5)
+        logger.info(f"Тестовый сайт остановлен, обслужено запросов: {self.requests_served}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # Данные
+
+    def suggest(self, query: str) -> List[str]:
+        """Подсказки автодополнения"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        return [destination for destination in DESTINATIONS if query in destination.lower()][:5]
+
+    def filter_hotels(self, params: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        """Отбор и сортировка отелей по параметрам запроса"""
+        hotels = self.hotels
+
+        if params.get('stars'):
+            min_stars = int(params['stars'][0])
+            hotels = [hotel for hotel in hotels if hotel['stars'] >= min_stars]
+        if params.get('price_max'):
+            price_max = int(float(params['price_max'][0]))
+            hotels = [hotel for hotel in hotels if hotel['price'] <= price_max]
+        for amenity in params.get('amenity', []):
+            hotels = [hotel for hotel in hotels if amenity in hotel['amenities']]
+        if params.get('district'):
+            hotels = [hotel for hotel in hotels if hotel['district'] in params['district']]
+
+        sort = params.get('sort', ['popular'])[0]
+        if sort == 'price':
+            hotels = sorted(hotels, key=lambda hotel: hotel['price'])
+        elif sort == 'rating':
+            hotels = sorted(hotels, key=lambda hotel: -hotel['rating'])
+
+        return hotels
+
+    def page_of(self, hotels: List[Dict[str, Any]], params: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        """Карточки текущей страницы выдачи"""
+        page_size = self.settings['page_size']
+        if not page_size:
+            return hotels
+        page = self.page_number(params)
+        return hotels[(page - 1) * page_size:page * page_size]
+
+    @staticmethod
+    def page_number(params: Dict[str, List[str]]) -> int:
+        """Номер страницы из запроса (пустой или нечисловой - первая страница)"""
+        try:
+            return max(1, int(params.get('page', ['1'])[0]))
+        except ValueError:
+            return 1
+
+    # Разметка
+
+    def render_layout(self, title: str, body: str, script: str = '') -> str:
+        """Общий каркас страницы"""
+        return f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>{escape(title)}</title>
+<link rel="stylesheet" href="/static/site.css">
+</head>
+<body>
+<header class="header">
+<nav class="main-menu" aria-label="Главное меню">
+<a href="/">Отели</a><a href="/?tab=apartments">Апартаменты</a><a href="/?tab=offers">Акции</a><a href="/?tab=help">Помощь</a>
+</nav>
+</header>
+<main>
+{body}
+</main>
+<footer>
+<a href="/?page=about">О компании</a><a href="/?page=contacts">Контакты</a><a href="/?page=rules">Правила</a>
+</footer>
+<script>{script}</script>
+</body>
+</html>"""
+
+    def render_homepage(self) -> str:
+        """Главная страница с формой поиска"""
+        destinations = ''.join(f'<div class="destination city">{escape(name)}</div>' for name in DESTINATIONS[:6])
+        offers = ''.join(f'<div class="offer deal">Скидка {discount}% на проживание</div>' for discount in (10, 15, 25))
+        testimonials = ''.join(f'<div class="testimonial review">Отличный сервис, отзыв №{index}</div>'
+                               for index in range(1, 4))
+
+        body = f"""
+<section class="hero banner">
+<h1>Найдите отель для зимнего отдыха</h1>
+<form class="search-form" action="/search" method="get">
+<div class="search-field">
+<input type="text" name="query" class="search-input" placeholder="Куда едем? Город или отель для поиска" autocomplete="off" aria-label="Направление">
+<div class="autocomplete dropdown"></div>
+</div>
+<div class="date-picker calendar">
+<div class="check-in"><input type="date" name="check_in" aria-label="Заезд"></div>
+<div class="check-out"><input type="date" name="check_out" aria-label="Выезд"></div>
+</div>
+<div class="guests-selector guest-selector">
+<button type="button" class="guests-toggle">Гости</button>
+<div class="guests-popup">
+<input type="number" name="guests" class="guest-count" value="2" min="1" aria-label="Гостей">
+<input type="number" name="rooms" class="room-count" value="1" min="1" aria-label="Номеров">
+</div>
+</div>
+<button type="submit" class="search-button">Найти</button>
+</form>
+</section>
+<section class="popular-destinations"><h2>Популярные направления</h2>{destinations}</section>
+<section class="special-offers promotion"><h2>Спецпредложения</h2>{offers}</section>
+<section class="testimonials"><h2>Отзывы</h2>{testimonials}</section>
+"""
+        return self.render_layout('Отели и апартаменты - тестовый сайт', body, HOMEPAGE_SCRIPT)
+
+    def render_cards(self, hotels: List[Dict[str, Any]]) -> str:
+        """Карточки отелей"""
+        padding = ''.join(f'<span class="decor decor-{index}"></span>' for index in range(self.settings['dom_padding']))
+
+        return ''.join(self._render_card(hotel, padding) for hotel in hotels)
+
+    def _render_card(self, hotel: Dict[str, Any], padding: str) -> str:
+        """Одна карточка отеля"""
+        price = f"{hotel['price']:,}".replace(',', ' ')
+        return f"""<article class="hotel-card" data-id="{hotel['id']}" data-href="/hotel/{hotel['id']}">
+<img src="data:image/gif;base64,R0lGODlhAQABAAAAACw=" alt="{escape(hotel['name'])}">
+<h3 class="hotel-name">{escape(hotel['name'])}</h3>
+<div class="rating stars-{hotel['stars']}">{'★' * hotel['stars']} {hotel['rating']}</div>
+<div class="district">{escape(hotel['district'])}</div>
+<div class="amenities">{escape(', '.join(hotel['amenities']))}</div>
+<div class="price">{price} ₽</div>
+<a class="booking-button book-button" href="/hotel/{hotel['id']}">Выбрать</a>
+{padding}
+</article>"""
+
+    def render_results(self, params: Dict[str, List[str]]) -> str:
+        """Страница выдачи с фильтрами, сортировкой и пагинацией"""
+        hotels = self.filter_hotels(params)
+        destination = params.get('query', [''])[0]
+
+        stars = ''.join(f'<div class="filter-option" data-kind="stars" data-value="{value}">{value}+ звезд</div>'
+                        for value in (3, 4, 5))
+        amenities = ''.join(f'<div class="filter filter-option amenity-filter" data-kind="amenity" '
+                            f'data-value="{escape(name)}">{escape(name)}</div>' for name in AMENITIES)
+        districts = ''.join(f'<div class="filter-option location-filter" data-kind="district" '
+                            f'data-value="{escape(name)}">Район: {escape(name)}</div>' for name in DISTRICTS)
+        sort_options = ''.join(f'<div class="sort-option" data-sort="{key}">{label}</div>'
+                               for key, label in SORT_OPTIONS.items())
+
+        body = f"""
+<div class="layout">
+<aside class="filters">
+<div class="filter price-filter" data-filter="price">Цена за ночь, до
+<div class="price-range"><input type="range" min="1000" max="40000" step="500" value="40000"></div>
+</div>
+<div class="filter star-filter rating-filter" data-filter="stars">Звездность {stars}</div>
+<div class="facet" data-filter="amenities">Удобства {amenities}</div>
+<div class="facet">Расположение {districts}</div>
+</aside>
+<section class="results">
+<h1>Отели: {escape(destination)} — найдено <span class="results-count">{len(hotels)}</span></h1>
+<div class="sort-options order-by">{sort_options}</div>
+<div class="results-grid">{self.render_cards(self.page_of(hotels, params))}</div>
+{self.render_pagination(len(hotels), params)}
+</section>
+</div>
+"""
+        return self.render_layout(f'Отели {destination} - результаты поиска', body, RESULTS_SCRIPT)
+
+    def render_pagination(self, total: int, params: Dict[str, List[str]]) -> str:
+        """Блок пагинации (только при заданном page_size)"""
+        page_size = self.settings['page_size']
+        if not page_size or total <= page_size:
+            return ''
+
+        page = self.page_number(params)
+        pages = (total + page_size - 1) // page_size
+
+        def link(number: int) -> str:
+            query = {key: values[0] for key, values in params.items()}
+            query['page'] = number
+            return f'/search?{urlencode(query)}'
+
+        current = f'<span class="page current active">{page}</span>'
+        if page < pages:
+            next_button = f'<a class="next" href="{link(page + 1)}">Далее</a>'
+        else:
+            next_button = '<span class="next disabled">Далее</span>'
+
+        return f'<nav class="pagination pages">{current} из {pages} {next_button}</nav>'
+
+    def render_hotel(self, hotel: Dict[str, Any]) -> str:
+        """Страница отеля с выбором номера"""
+        rooms = ''.join(f"""<div class="room-option room-selection">
+<h3>{name}</h3><div class="price">{int(hotel['price'] * factor)} ₽</div>
+<a class="select-room room-select" href="/booking/{hotel['id']}?room={index}">Выбрать номер</a>
+</div>""" for index, (name, factor) in enumerate([('Стандарт', 1.0), ('Улучшенный', 1.4), ('Люкс', 2.2)], 1))
+
+        body = f"""
+<section class="hotel-details">
+<nav class="breadcrumbs"><a href="/">Главная</a> / <a href="javascript:history.back()">Выдача</a></nav>
+<h1>{escape(hotel['name'])}</h1>
+<div class="rating">{'★' * hotel['stars']} {hotel['rating']}</div>
+<div class="amenities">{escape(', '.join(hotel['amenities']))}</div>
+<div class="rooms">{rooms}</div>
+</section>
+"""
+        return self.render_layout(hotel['name'], body)
+
+    def render_booking(self, hotel: Dict[str, Any]) -> str:
+        """Форма бронирования"""
+        payments = ''.join(f'<label class="payment-option payment-method"><input type="radio" name="payment" '
+                           f'value="{key}">{label}</label>' for key, label in
+                           [('card', 'Картой онлайн'), ('sbp', 'СБП'), ('hotel', 'В отеле')])
+
+        body = f"""
+<section class="booking">
+<h1>Бронирование: {escape(hotel['name'])}</h1>
+<form class="guest-form traveler-form" action="/booking/{hotel['id']}/confirm" method="get">
+<input type="text" name="name" placeholder="Имя и фамилия" aria-label="Имя и фамилия">
+<input type="email" name="email" placeholder="Email" aria-label="Email">
+<input type="tel" name="phone" placeholder="Телефон" aria-label="Телефон">
+<div class="payment">{payments}</div>
+<button type="submit" class="pay-button checkout-button">Забронировать</button>
+</form>
+</section>
+"""
+        return self.render_layout(f"Бронирование - {hotel['name']}", body)
+
+    def find_hotel(self, hotel_id: str) -> Optional[Dict[str, Any]]:
+        """Отель по идентификатору из URL"""
+        if not hotel_id.isdigit() or not 1 <= int(hotel_id) <= len(self.hotels):
+            return None
+        return self.hotels[int(hotel_id) - 1]
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Маршрутизация запросов тестового сайта"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        site = self.server.site
+        site.requests_served += 1
+
+        parts = urlsplit(self.path)
+        params = parse_qs(parts.query)
+        segments = [segment for segment in parts.path.split('/') if segment]
+
+        if parts.path.startswith('/api/'):
+            self._delay(site.settings['api_latency_ms'])
+        elif not parts.path.startswith('/static/'):
+            self._delay(site.settings['latency_ms'])
+
+        if parts.path == '/':
+            self._send(site.render_homepage())
+        elif parts.path == '/search':
+            self._send(site.render_results(params))
+        elif parts.path == '/static/site.css':
+            self._send(STYLE, 'text/css; charset=utf-8')
+        elif parts.path == '/api/suggest':
+            self._send_json(site.suggest(params.get('q', [''])[0]))
+        elif parts.path == '/api/results':
+            hotels = site.filter_hotels(params)
+            self._send_json({'total': len(hotels), 'html': site.render_cards(site.page_of(hotels, params))})
+        elif len(segments) == 2 and segments[0] == 'hotel' and site.find_hotel(segments[1]):
+            self._send(site.render_hotel(site.find_hotel(segments[1])))
+        elif len(segments) == 2 and segments[0] == 'booking' and site.find_hotel(segments[1]):
+            self._send(site.render_booking(site.find_hotel(segments[1])))
+        elif len(segments) == 3 and segments[0] == 'booking' and segments[2] == 'confirm':
+            self._send(site.render_layout('Бронирование подтверждено', '<h1 class="confirmation">Бронирование подтверждено</h1>'))
+        else:
+            self._send(site.render_layout('Страница не найдена', '<h1>404</h1>'), status=404)
+
+    def log_message(self, format: str, *args):
+        """Запросы пишутся в отладочный лог, а не в stderr"""
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _delay(self, latency_ms: float):
+        """Искусственная задержка ответа"""
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    def _send_json(self, data: Any):
+        """Ответ в формате JSON"""
+        self._send(json.dumps(data, ensure_ascii=False), 'application/json; charset=utf-8')
+
+    def _send(self, body: str, content_type: str = 'text/html; charset=utf-8', status: int = 200):
+        """Отправка ответа"""
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(payload)
+
+def main():
+    """Запуск тестового сайта из командной строки"""
+    parser = argparse.ArgumentParser(description='Локальный тестовый сайт для замеров UX-агента')
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес сервера')
+    parser.add_argument('--port', type=int, default=8000, help='Порт сервера')
+    parser.add_argument('--results', type=int, default=DEFAULT_SITE_CONFIG['results'], help='Количество отелей')
+    parser.add_argument('--page-size', type=int, help='Карточек на странице выдачи')
+    parser.add_argument('--latency', type=float, default=0, help='Задержка HTML-страниц, мс')
+    parser.add_argument('--api-latency', type=float, default=0, help='Задержка API-ответов, мс')
+    parser.add_argument('--dom-padding', type=int, default=0, help='Дополнительных узлов в карточке')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    site = FixtureSite(args.host, args.port, results=args.results, page_size=args.page_size,
+                       latency_ms=args.latency, api_latency_ms=args.api_latency, dom_padding=args.dom_padding)
+    site.start()
+    print(f"Тестовый сайт: {site.base_url} (Ctrl+C для остановки)")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
+
+if __name__ == "__main__":
+    main()
@@ -16,9 +16,26 @@ def load_config() -> Dict[str, Any]:
         
         # Настройки браузера
         'browser': {
-            'implicit_wait': 10,
+            'implicit_wait': 0,  # Ожидания задаются явно для каждого поиска (см. 'lookup')
             'page_load_timeout': 30,
-            'window_size': (1920, 1080)
+            'window_size': (1920, 1080),
+            
+            # Пул заранее запущенных драйверов
+            'pool': {
+                'min_size': 1,
+                'max_size': 4,
+                'max_uses': 50,  # После стольких запусков драйвер пересоздается
+                'acquire_timeout': 120
+            },
+            
+            # Поиск chromedriver (кэш по версии Chrome, без сети в штатном режиме)
+            'driver': {
+                'cache_dir': os.getenv('CHROMEDRIVER_CACHE_DIR',
+                                       str(Path.home() / '.cache' / 'ux-research-agent' / 'chromedriver')),
+                'chromedriver_path': os.getenv('CHROMEDRIVER_PATH'),
+                'chrome_binary': os.getenv('CHROME_BINARY'),
+                'offline': os.getenv('UX_AGENT_OFFLINE', '').lower() in ('1', 'true', 'yes')
+            }
         },
         
         # Настройки AI
@@ -63,11 +80,192 @@ def load_config() -> Dict[str, Any]:
             'booking_button': '.booking-button'
         },
         
-        # Временные задержки
-        'delays': {
-            'page_load': 3,
-            'element_wait': 2,
-            'user_action': 1
+        # Блокировка запросов через CDP (Network.setBlockedURLs)
+        'network': {
+            'profile': os.getenv('UX_AGENT_NETWORK_PROFILE', 'functional'),
+            'profiles': {
+                # Функциональные прогоны: только то, что нужно для работы сценария
+                'functional': {
+                    'block': ['analytics', 'trackers', 'fonts', 'media'],
+                    'disable_images': True
+                },
+                # Страница как у пользователя, но без аналитики и трекеров
+                'analytics-off': {
+                    'block': ['analytics', 'trackers'],
+                    'disable_images': False
+                },
+                # UX-прогоны: загружается все
+                'full-fidelity': {
+                    'block': [],
+                    'disable_images': False
+                }
+            },
+            'blocking_patterns': {
+                'analytics': [
+                    '*google-analytics.com*',
+                    '*googletagmanager.com*',
+                    '*mc.yandex.ru*',
+                    '*top-fwz1.mail.ru*',
+                    '*hotjar.com*',
+                    '*amplitude.com*',
+                    '*segment.io*'
+                ],
+                'trackers': [
+                    '*doubleclick.net*',
+                    '*connect.facebook.net*',
+                    '*vk.com/rtrg*',
+                    '*criteo.com*',
+                    '*adriver.ru*',
+                    '*ads.adfox.ru*',
+                    '*an.yandex.ru*'
+                ],
+                'fonts': [
+                    '*.woff',
+                    '*.woff2',
+                    '*.ttf',
+                    '*.otf',
+                    '*fonts.googleapis.com*',
+                    '*fonts.gstatic.com*'
+                ],
+                'media': [
+                    '*.mp4',
+                    '*.webm',
+                    '*.mp3',
+                    '*youtube.com/embed*',
+                    '*player.vimeo.com*'
+                ]
+            },
+            # Средний размер ресурса (байт) для оценки сэкономленного трафика,
+            # пока в сессии не загружено ни одного ресурса этого типа
+            'average_resource_bytes': {
+                'Font': 40000,
+                'Script': 60000,
+                'Image': 50000,
+                'Media': 500000,
+                'XHR': 5000,
+                'Fetch': 5000,
+                'Other': 10000
+            }
+        },
+        
+        # Запись и воспроизведение сетевого трафика (HAR)
+        'har': {
+            'mode': os.getenv('UX_AGENT_HAR_MODE', 'off'),  # off / record / replay
+            'path': os.getenv('UX_AGENT_HAR_PATH', 'har/run.har'),
+            'latency_ms': float(os.getenv('UX_AGENT_HAR_LATENCY_MS', '0')),  # Задержка каждого ответа
+            'latency_scale': 0.0,  # Доля записанного времени ответа (1.0 - как при записи)
+            'ignore_query_params': ['_', 'ts', 'timestamp', 'rnd', 'nocache'],
+            'unmatched': 'fail'  # fail - запросы вне архива отклоняются, continue - уходят в сеть
+        },
+        
+        # Метрики производительности страниц (Navigation Timing, Core Web Vitals)
+        'page_metrics': {
+            'enabled': True,
+            'event_duration_threshold': 16,  # мс, минимальная длительность события для INP
+            'slowest_resources': 5
+        },
+        
+        # Симуляция пользователя
+        'user_simulation': {
+            # Ввод и клики в сценариях выполняются с человеческими паузами (UserSimulator)
+            'human_behavior': os.getenv('UX_AGENT_HUMAN_BEHAVIOR', '').lower() in ('1', 'true', 'yes'),
+            # Паузы пользователя только учитываются (simulated_user_duration), а не выполняются
+            'virtual_clock': os.getenv('UX_AGENT_VIRTUAL_CLOCK', '').lower() in ('1', 'true', 'yes'),
+            'min_real_pause': 0.05  # Минимальная реальная пауза в режиме виртуальных часов, сек
+        },
+        
+        # Ввод текста с человеческим ритмом (одним скриптом в странице)
+        'typing': {
+            'suggestion_selector': '.suggestion, .suggestion-item, .autocomplete-item, .dropdown-item',
+            'suggestion_timeout': 3,  # Ожидание подсказок после последнего символа, сек
+            'settle_time': 0.15
+        },
+        
+        # Контрольные точки сценариев ScenarioExecutor (продолжение после сбоя)
+        'checkpoints': {
+            'enabled': os.getenv('UX_AGENT_CHECKPOINTS', '').lower() in ('1', 'true', 'yes'),
+            'directory': os.getenv('UX_AGENT_CHECKPOINT_DIR', 'checkpoints'),
+            'retries': 1,  # Повторов упавшего шага с последней контрольной точки
+            'max_age': 6 * 3600  # сек
+        },
+        
+        # Проверка фильтров выдачи в параллельных вкладках
+        'filter_exploration': {
+            'parallel_tabs': int(os.getenv('UX_AGENT_FILTER_TABS', '0')),  # 0 - по очереди на одной странице
+            'task_timeout': 60,
+            'quiet_time': 0.3,
+            'poll_interval': 0.1,
+            # Перебор комбинаций фильтров под requirements расширенных сценариев
+            'requirements': os.getenv('UX_AGENT_EXPLORE_REQUIREMENTS', '').lower() in ('1', 'true', 'yes'),
+            'max_combination_size': 6,
+            'max_combinations': 128
+        },
+        
+        # Асинхронный исполнитель (много вкладок одного Chrome через DevTools)
+        'async_engine': {
+            'concurrency': int(os.getenv('UX_AGENT_ASYNC_SESSIONS', '50')),
+            'job_timeout': 180,  # Ограничение времени одного сценария, сек
+            'navigation_start_timeout': 1.0,
+            'launch_timeout': 20
+        },
+        
+        # Разбор HTML для WebAnalyzer: html.parser / lxml (BeautifulSoup) / lxml.html (без BeautifulSoup)
+        'parser': {
+            'backend': os.getenv('UX_AGENT_HTML_PARSER', 'lxml.html'),
+            'strainers': True  # BeautifulSoup разбирает только нужные анализу области страницы
+        },
+        
+        # Кэш результатов WebAnalyzer по хэшу HTML (память + диск, общий для процессов)
+        'analysis_cache': {
+            'enabled': os.getenv('UX_AGENT_ANALYSIS_CACHE', '1').lower() in ('1', 'true', 'yes'),
+            'memory_entries': 128,
+            'directory': os.getenv('UX_AGENT_ANALYSIS_CACHE_DIR',
+                                   str(Path.home() / '.cache' / 'ux-research-agent' / 'analysis')),
+            'max_disk_bytes': 64 * 1024 * 1024
+        },
+        
+        # Анализ главной и выдачи скриптом в странице (без передачи page_source)
+        'in_page_analysis': {
+            'enabled': os.getenv('UX_AGENT_IN_PAGE_ANALYSIS', '1').lower() in ('1', 'true', 'yes'),
+            'cross_check_every': 10  # Каждый N-й анализ сверяется с WebAnalyzer по page_source (0 - никогда)
+        },
+        
+        # Обход всей выдачи (прокрутка и пагинация) с потоковой записью карточек
+        'crawl': {
+            'enabled': os.getenv('UX_AGENT_CRAWL_RESULTS', '').lower() in ('1', 'true', 'yes'),
+            'max_pages': int(os.getenv('UX_AGENT_CRAWL_MAX_PAGES', '20')),
+            'max_cards': int(os.getenv('UX_AGENT_CRAWL_MAX_CARDS', '2000')),
+            'max_scrolls': 200,
+            'stall_rounds': 2,  # Прокруток без новых карточек до перехода на следующую страницу
+            'output': os.getenv('UX_AGENT_CRAWL_OUTPUT', 'reports/crawl')  # JSONL с карточками
+        },
+        
+        # Статистика селекторов по сайтам и типам страниц: порядок кандидатов по прошлым попаданиям
+        'selector_index': {
+            'enabled': os.getenv('UX_AGENT_SELECTOR_INDEX', '1').lower() in ('1', 'true', 'yes'),
+            # Файл статистики (например, ~/.cache/ux-research-agent/selectors.json); по умолчанию
+            # статистика живет только в памяти процесса и не меняет порядок проверок в других прогонах
+            'path': os.getenv('UX_AGENT_SELECTOR_INDEX_PATH') or None,
+            'heuristics': True,  # Поиск по роли, подписи и placeholder, если ни один селектор не подошел
+            'min_attempts': 3
+        },
+        
+        # Бюджеты ожидания при поиске элементов
+        'lookup': {
+            'required_timeout': 10,  # Обязательные элементы
+            'poll_interval': 0.1
+        },
+        
+        # Ожидания готовности страницы (вместо фиксированных задержек)
+        'waits': {
+            'default_timeout': 10,
+            'poll_interval': 0.1,
+            'network_idle_time': 0.5,  # Сколько сеть должна простаивать
+            'max_inflight_requests': 0,
+            # Более долгие запросы (long polling, WebSocket) не учитываются; должно быть заметно
+            # меньше default_timeout, иначе страницы с long polling всегда ждут до таймаута
+            'max_request_age': 4,
+            'dom_quiet_time': 0.3  # Сколько DOM должен оставаться неизменным
         }
     }
     
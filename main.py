@@ -4,13 +4,19 @@ AI UX Research Agent для Ostrovok.ru
 Основной файл запуска
 """
 
+import json
+import time
+import asyncio
 import argparse
 import logging
 from datetime import datetime
 from pathlib import Path
 
 from agent.ux_agent import UXResearchAgent
+from agent.batch_runner import BatchRunner, build_jobs, summarize_batch
+from agent.async_engine import AsyncScenarioEngine
 from config.settings import load_config
+from config.advanced_scenarios import get_advanced_scenarios, get_ski_personas
 from reports.report_generator import ReportGenerator
 
 # Настройка логирования
@@ -39,6 +45,39 @@ def main():
     parser.add_argument('--output', 
                        default='reports',
                        help='Папка для сохранения отчетов')
+    parser.add_argument('--parallel',
+                       type=int,
+                       metavar='N',
+                       help='Пакетный режим: выполнить набор сценариев в N процессах')
+    parser.add_argument('--async-sessions',
+                       type=int,
+                       metavar='N',
+                       help='Пакетный режим: выполнить набор сценариев в N вкладках одного браузера (asyncio + CDP)')
+    parser.add_argument('--scenarios',
+                       nargs='+',
+                       help='Сценарии для пакетного режима (по умолчанию все расширенные сценарии)')
+    parser.add_argument('--destinations',
+                       nargs='+',
+                       help='Направления для пакетного режима (матрица сценарии × направления)')
+    parser.add_argument('--personas',
+                       action='store_true',
+                       help='Прогнать персон одновременно в изолированных контекстах одного браузера')
+    parser.add_argument('--human',
+                       action='store_true',
+                       help='Вводить текст и кликать с человеческими паузами')
+    parser.add_argument('--virtual-clock',
+                       action='store_true',
+                       help='Не выполнять человеческие паузы, а только учитывать их в отчете')
+    parser.add_argument('--record-har',
+                       metavar='PATH',
+                       help='Записать весь сетевой трафик прогона в HAR-архив')
+    parser.add_argument('--replay-har',
+                       metavar='PATH',
+                       help='Воспроизвести прогон из HAR-архива без обращения к сайту')
+    parser.add_argument('--har-latency',
+                       type=float,
+                       metavar='MS',
+                       help='Задержка каждого ответа при воспроизведении, мс')
     
     args = parser.parse_args()
     
@@ -49,6 +88,37 @@ def main():
     # Загрузка конфигурации
     config = load_config()
     
+    if args.human:
+        config['user_simulation']['human_behavior'] = True
+    if args.virtual_clock:
+        config['user_simulation']['virtual_clock'] = True
+        
+    if args.record_har and (args.parallel or args.async_sessions):
+        parser.error('--record-har нельзя совмещать с --parallel и --async-sessions: '
+                     'все прогоны писали бы в один архив')
+    if args.replay_har and args.async_sessions:
+        parser.error('--replay-har не поддерживается асинхронным исполнителем (--async-sessions)')
+    if args.record_har:
+        config['har'].update(mode='record', path=args.record_har)
+    elif args.replay_har:
+        config['har'].update(mode='replay', path=args.replay_har)
+    if args.har_latency is not None:
+        config['har']['latency_ms'] = args.har_latency
+    
+    if args.async_sessions:
+        asyncio.run(run_async_batch(config, args))
+        return
+        
+    if args.parallel:
+        run_batch(config, args)
+        return
+    
+    if args.personas:
+        if 'destination' not in config['scenarios'][args.scenario]:
+            parser.error(f'--personas требует сценарий с направлением, у "{args.scenario}" его нет')
+        run_personas(config, args)
+        return
+        
     logger.info(f"Запуск UX исследования: {args.scenario}")
     
     try:
@@ -68,6 +138,89 @@ def main():
         logger.error(f"Ошибка при выполнении исследования: {e}")
         raise
 
+def select_jobs(config, args):
+    """Задания пакетного режима из аргументов командной строки"""
+    
+    all_scenarios = {**config['scenarios'], **get_advanced_scenarios()}
+    names = args.scenarios or list(get_advanced_scenarios().keys())
+    
+    unknown = [name for name in names if name not in all_scenarios]
+    if unknown:
+        raise ValueError(f"Неизвестные сценарии: {', '.join(unknown)}")
+        
+    return build_jobs({name: all_scenarios[name] for name in names}, args.destinations)
+
+def run_batch(config, args):
+    """Пакетный запуск сценариев в пуле процессов"""
+    
+    jobs = select_jobs(config, args)
+    
+    report_gen = ReportGenerator()
+    runner = BatchRunner(config, workers=args.parallel, headless=True)
+    records = []
+    start_time = time.time()
+    
+    # Отчеты пишутся сразу по завершении каждого запуска
+    for job, results in runner.run(jobs):
+        try:
+            results['report_path'] = report_gen.generate_report(results, job['job_id'], args.output)
+        except Exception as e:
+            logger.error(f"Не удалось создать отчет для {job['job_id']}: {e}")
+            
+        records.append(results)
+        logger.info(f"[{len(records)}/{len(jobs)}] {job['job_id']}: {len(results.get('steps', []))} шагов, "
+                    f"{results.get('duration', 0):.1f} сек")
+        
+    summary = summarize_batch(records, time.time() - start_time)
+    summary_path = Path(args.output) / f'batch_summary_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+        
+    logger.info(f"Пакет завершен: {summary['jobs_succeeded']}/{summary['jobs_total']} успешно "
+                f"за {summary['wall_time']:.1f} сек. Сводка: {summary_path}")
+
+async def run_async_batch(config, args):
+    """Пакетный запуск сценариев во вкладках одного браузера"""
+    
+    jobs = select_jobs(config, args)
+    
+    report_gen = ReportGenerator()
+    records = []
+    start_time = time.time()
+    
+    async with AsyncScenarioEngine(config, headless=True, concurrency=args.async_sessions) as engine:
+        async for job, results in engine.run_jobs(jobs):
+            try:
+                results['report_path'] = report_gen.generate_report(results, job['job_id'], args.output)
+            except Exception as e:
+                logger.error(f"Не удалось создать отчет для {job['job_id']}: {e}")
+                
+            records.append(results)
+            logger.info(f"[{len(records)}/{len(jobs)}] {job['job_id']}: {len(results.get('steps', []))} шагов, "
+                        f"{results.get('duration', 0):.1f} сек")
+            
+    summary = summarize_batch(records, time.time() - start_time)
+    summary_path = Path(args.output) / f'async_batch_summary_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+        
+    logger.info(f"Асинхронный пакет завершен: {summary['jobs_succeeded']}/{summary['jobs_total']} успешно "
+                f"за {summary['wall_time']:.1f} сек. Сводка: {summary_path}")
+
+def run_personas(config, args):
+    """Одновременный прогон персон в одном браузере"""
+    
+    agent = UXResearchAgent(config, headless=args.headless)
+    results = agent.run_personas(get_ski_personas(), config['scenarios'][args.scenario])
+    
+    report_path = Path(args.output) / f'personas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2, default=str)
+        
+    succeeded = len([result for result in results['personas'].values() if result.get('success')])
+    logger.info(f"Персоны: {succeeded}/{len(results['personas'])} успешно за {results['duration']:.1f} сек. "
+                f"Результаты: {report_path}")
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,84 @@
+"""
+Тесты кэша результатов анализа (agent/analysis_cache.py)
+"""
+
+import os
+import sys
+import json
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.analysis_cache import AnalysisCache, content_key
+
+def test_content_key_ignores_volatile_markup():
+    """Комментарии, nonce и CSRF-токен не меняют ключ; вид анализа и версия меняют"""
+    first = '<html><!-- build 1 --><script nonce="a1">x()</script><meta name="csrf-token" content="t1"></html>'
+    second = '<html><!-- build 2 --><script nonce="b2">x()</script><meta name="csrf-token" content="t2"></html>'
+
+    assert content_key('homepage', first, '1') == content_key('homepage', second, '1')
+    assert content_key('homepage', first, '1') != content_key('search_results', first, '1')
+    assert content_key('homepage', first, '1') != content_key('homepage', first, '2')
+    assert content_key('homepage', first, '1') != content_key('homepage', '<html><p>1</p></html>', '1')
+
+def test_memory_lru_eviction():
+    """В памяти остаются последние использованные записи"""
+    cache = AnalysisCache({'memory_entries': 2})
+    cache.put('a', {'value': 1})
+    cache.put('b', {'value': 2})
+    cache.get('a')
+    cache.put('c', {'value': 3})
+
+    assert list(cache.memory) == ['a', 'c']
+    assert cache.get('b') is None
+    assert cache.get_stats()['memory_hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+def test_get_returns_independent_copy():
+    """Изменение полученного результата не портит кэш"""
+    cache = AnalysisCache()
+    cache.put('a', {'items': [1, 2]})
+    cache.get('a')['items'].append(3)
+
+    assert cache.get('a') == {'items': [1, 2]}
+
+def test_get_or_compute_calls_once():
+    """Повторный анализ той же страницы берется из кэша"""
+    cache = AnalysisCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'hotels': 3}
+
+    html = '<div class="hotel-card">1</div>'
+    assert cache.get_or_compute('search_results', html, '1', compute) == {'hotels': 3}
+    assert cache.get_or_compute('search_results', html + '<!-- ts -->', '1', compute) == {'hotels': 3}
+    assert len(calls) == 1
+    assert cache.get_stats()['hit_rate'] == 0.5
+
+def test_disk_cache_shared_between_instances(tmp_path):
+    """Запись на диске доступна новому экземпляру (другому процессу пакета)"""
+    AnalysisCache({'directory': str(tmp_path)}).put('a', {'value': 1})
+    cache = AnalysisCache({'directory': str(tmp_path)})
+
+    assert cache.disk_bytes == (tmp_path / 'a.json').stat().st_size
+    assert cache.get('a') == {'value': 1}
+    assert cache.get('a') == {'value': 1}
+    assert cache.get_stats()['disk_hits'] == 1
+    assert cache.get_stats()['memory_hits'] == 1
+
+def test_disk_eviction_removes_least_recently_used(tmp_path):
+    """При превышении max_disk_bytes удаляются записи с самым старым доступом"""
+    record = json.dumps({'value': 'x' * 100})
+    cache = AnalysisCache({'directory': str(tmp_path), 'max_disk_bytes': 2 * len(record)})
+    cache.put('old', {'value': 'x' * 100})
+    cache.put('used', {'value': 'x' * 100})
+    os.utime(tmp_path / 'old.json', (1000, 1000))
+    os.utime(tmp_path / 'used.json', (2000, 2000))
+
+    cache.put('new', {'value': 'x' * 100})
+
+    assert sorted(path.stem for path in tmp_path.glob('*.json')) == ['new', 'used']
+    assert cache.disk_bytes == 2 * len(record)
+    assert cache.get_stats()['evictions'] == 1
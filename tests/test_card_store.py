@@ -0,0 +1,87 @@
+"""
+Тесты колоночного хранилища карточек отелей (agent/card_store.py)
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+pytest.importorskip('selenium')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.card_store import HotelCardStore
+
+CARDS = [
+    {'id': 'h1', 'name': 'Альпика', 'price': '12 500 ₽', 'rating': '9,1 Превосходно · 1 234 отзыва',
+     'stars': '4 звезды', 'distance': '300 м до подъемника', 'amenities': 'Wi-Fi, Бассейн, Спа',
+     'features': 'Бесплатная отмена, ski-in'},
+    {'id': 'h2', 'name': 'Роза Хутор', 'price': '8 900 ₽', 'rating': '★★★ 7.8',
+     'distance': '2,5 км', 'amenities': 'Wi-Fi; Ресторан'},
+    {'url': '/hotel/h3', 'name': 'Горки', 'price': 'Цена по запросу', 'rating': '', 'amenities': ''}
+]
+
+def test_extend_fills_columns():
+    """Цены, звезды, оценки и расстояния разбираются в числовые колонки"""
+    store = HotelCardStore(capacity=2)
+    store.extend(CARDS, run='sochi')
+
+    assert len(store) == 3
+    prices = store.column('price')
+    assert prices[:2].tolist() == [12500.0, 8900.0] and np.isnan(prices[2])
+    assert store.column('stars').tolist() == [4, 3, 0]
+    assert store.column('rating')[:2].tolist() == pytest.approx([9.1, 7.8])
+    assert np.isnan(store.column('rating')[2])
+    assert store.column('distance_km')[:2].tolist() == pytest.approx([0.3, 2.5])
+    assert store.strings('hotel') == ['h1', 'h2', '/hotel/h3']
+    assert store.strings('run') == ['sochi'] * 3
+
+def test_rating_ignores_review_count():
+    """Оценка - первое число до 10, число отзывов не учитывается"""
+    assert HotelCardStore._rating('9,1 Превосходно · 1 234 отзыва') == pytest.approx(9.1)
+    assert HotelCardStore._rating('8,5 (345 reviews)') == pytest.approx(8.5)
+    assert HotelCardStore._rating('Отзывов 120, оценка 8,2') == pytest.approx(8.2)
+    assert np.isnan(HotelCardStore._rating('1 234 отзыва'))
+
+def test_amenity_mask_across_batches():
+    """Удобства ищутся по кодам, в том числе после роста буферов"""
+    store = HotelCardStore(capacity=1)
+    store.extend(CARDS[:1], run='a')
+    store.extend(CARDS[1:], run='b')
+    store.append({'id': 'h4', 'name': 'Экспресс', 'price': '5 000', 'amenities': 'бассейн'}, run='b')
+
+    assert store.amenity_mask('Wi-Fi').tolist() == [True, True, False, False]
+    assert store.amenity_mask('бассейн').tolist() == [True, False, False, True]
+    assert store.amenity_mask('сауна').tolist() == [False] * 4
+    assert store.describe()['runs'] == {'a': 1, 'b': 3}
+
+def test_match_requirements():
+    """Требования сценария: звезды, цена, расстояние до подъемника и признаки"""
+    store = HotelCardStore()
+    store.extend(CARDS)
+
+    assert store.match_requirements({'stars': '4+', 'cancellation': True}).tolist() == [True, False, False]
+    assert store.match_requirements({'price_limit': 'до 10 000 рублей'}).tolist() == [False, True, False]
+    assert store.match_requirements({'distance_to_lift': 'до 500м'}).tolist() == [True, False, False]
+    assert store.match_requirements({'distance_to_lift': True}).tolist() == [True, False, False]
+    assert store.match_requirements({'restaurant': True, 'spa': False}).tolist() == [False, True, False]
+    assert store.match_requirements({'pool': True}, rows=slice(1, 3)).tolist() == [False, False]
+
+def test_describe_and_jsonl(tmp_path):
+    """Хранилище из файлов обхода и сводка с лучшими совпадениями"""
+    path = tmp_path / 'sochi.jsonl'
+    path.write_text('\n'.join(json.dumps(card, ensure_ascii=False) for card in CARDS + CARDS[:1]) + '\n',
+                    encoding='utf-8')
+
+    store = HotelCardStore.from_jsonl({'sochi': path})
+    summary = store.describe({'pool': True})
+
+    assert summary['cards'] == 4 and summary['unique_hotels'] == 3
+    assert summary['requirements_matched'] == 2
+    assert summary['top_matches'] == ['Альпика', 'Альпика']
+    assert summary['flags']['pool'] == 2
+    assert len(store.to_pandas()) == 4
@@ -0,0 +1,96 @@
+"""
+Тесты контрольных точек сценариев (agent/checkpoints.py)
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('selenium')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.checkpoints import CheckpointStore
+
+IDENTITY = {'identity': {'destination': 'Сочи', 'guests': 2},
+            'plan': ['_search_destination', '_select_dates', '_search_hotels', '_analyze_results']}
+
+def _state(url):
+    """Снимок состояния браузера"""
+    return {'url': url, 'cookies': [], 'local_storage': {}, 'captured_at': time.time()}
+
+def test_fingerprint_depends_on_identity_and_plan(tmp_path):
+    """Одинаковые параметры дают тот же файл, другие параметры или план - другой"""
+    store = CheckpointStore({'directory': str(tmp_path)})
+    checkpoint = store.open('search', IDENTITY)
+
+    assert store.open('search', dict(reversed(list(IDENTITY.items())))).path == checkpoint.path
+    assert store.open('booking', IDENTITY).path != checkpoint.path
+    assert store.open('search', {**IDENTITY, 'identity': {'destination': 'Андорра', 'guests': 2}}).path != checkpoint.path
+    assert store.open('search', {**IDENTITY, 'plan': IDENTITY['plan'][:-1]}).path != checkpoint.path
+
+def test_resume_from_last_restorable_step(tmp_path):
+    """Прогон продолжается после последнего шага со снимком, следующие шаги отбрасываются"""
+    store = CheckpointStore({'directory': str(tmp_path)})
+    checkpoint = store.open('search', IDENTITY)
+    checkpoint.start(_state('https://x.ru/'))
+    checkpoint.record({'action': 'search_destination', 'success': True})
+    checkpoint.record({'action': 'search_hotels', 'success': True}, _state('https://x.ru/hotels'))
+    checkpoint.record({'action': 'select_dates', 'success': True})
+
+    resumed = store.open('search', IDENTITY)
+    steps, state = resumed.resume_point()
+
+    assert resumed.has_progress
+    assert [step['action'] for step in steps] == ['search_destination', 'search_hotels']
+    assert state['url'] == 'https://x.ru/hotels'
+
+def test_start_truncates_stale_steps(tmp_path):
+    """Записи после точки продолжения не попадают в новый прогон и в файл"""
+    store = CheckpointStore({'directory': str(tmp_path)})
+    checkpoint = store.open('search', IDENTITY)
+    checkpoint.start(_state('https://x.ru/'))
+    checkpoint.record({'action': 'search_hotels', 'success': True}, _state('https://x.ru/hotels'))
+    checkpoint.record({'action': 'analyze_results', 'success': True})
+
+    resumed = store.open('search', IDENTITY)
+    resumed.start(_state('https://x.ru/'))
+    resumed.record({'action': 'analyze_results', 'success': True, 'attempt': 2})
+
+    with open(resumed.path, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert [step['action'] for step in saved['steps']] == ['search_hotels', 'analyze_results']
+    assert saved['steps'][-1]['attempt'] == 2
+    assert saved['resume']['state']['url'] == 'https://x.ru/hotels'
+
+def test_no_progress_without_restorable_step(tmp_path):
+    """Шаги без снимка не дают точки продолжения"""
+    store = CheckpointStore({'directory': str(tmp_path)})
+    checkpoint = store.open('search', IDENTITY)
+    checkpoint.start(_state('https://x.ru/'))
+    checkpoint.record({'action': 'search_destination', 'success': True})
+
+    resumed = store.open('search', IDENTITY)
+    steps, state = resumed.resume_point()
+
+    assert not resumed.has_progress
+    assert steps == [] and state['url'] == 'https://x.ru/'
+
+def test_expired_and_corrupted_checkpoints_ignored(tmp_path):
+    """Старая или поврежденная точка не продолжается, clear() удаляет файл"""
+    store = CheckpointStore({'directory': str(tmp_path), 'max_age': 60})
+    checkpoint = store.open('search', IDENTITY)
+    checkpoint.start(_state('https://x.ru/'))
+    checkpoint.record({'action': 'search_hotels', 'success': True},
+                      {**_state('https://x.ru/hotels'), 'captured_at': time.time() - 120})
+
+    assert not store.open('search', IDENTITY).has_progress
+
+    checkpoint.path.write_text('{"fingerprint": ', encoding='utf-8')
+    assert not store.open('search', IDENTITY).has_progress
+
+    checkpoint.clear()
+    assert not checkpoint.path.exists()
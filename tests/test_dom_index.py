@@ -0,0 +1,106 @@
+"""
+Тесты индекса документа (agent/dom_index.py): те же ответы, что у запросов BeautifulSoup
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+bs4 = pytest.importorskip('bs4')
+lxml_html = pytest.importorskip('lxml.html')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.dom_index import DOMIndex
+
+HTML = """
+<html><head><title>Отели в Сочи</title></head>
+<body>
+  <nav class="main-nav"><a href="/">Главная</a><a href="/hotels" aria-label="Отели">Отели</a></nav>
+  <div class="filters">
+    <label><input type="checkbox" id="spa" class="filter-option"> Спа</label>
+    <select class="sort-select"><option>Цена</option><option>Рейтинг</option></select>
+  </div>
+  <div class="results">
+    <div class="hotel-card premium" data-id="1">
+      <h3 class="hotel-name">Альпика</h3><span class="price">12 500 ₽</span>
+      <img src="a.jpg" alt="Фасад"><div class="rating"><span class="star">★</span>9,1</div>
+    </div>
+    <div class="hotel-card" data-id="2">
+      <h3 class="hotel-name">Роза Хутор</h3><span class="price-total">8 900 ₽</span>
+      <img src="b.jpg">
+    </div>
+    <div class="hotel-item" data-id="3"><h2>Горки</h2></div>
+  </div>
+  <div class="pagination"><a href="?page=2">2</a><a href="?page=3" class="next">Далее</a></div>
+  <footer><a href="/about">О нас</a></footer>
+</body></html>
+"""
+
+@pytest.fixture
+def soup():
+    """Документ BeautifulSoup"""
+    return bs4.BeautifulSoup(HTML, 'html.parser')
+
+@pytest.fixture
+def index(soup):
+    """Индекс того же документа"""
+    return DOMIndex(soup)
+
+def test_by_tag_matches_find_all(soup, index):
+    """Поиск по тегам - в порядке документа, как find_all"""
+    assert index.by_tag('a') == soup.find_all('a')
+    assert index.by_tag('h2', 'h3') == soup.find_all(['h2', 'h3'])
+    assert index.by_tag('table') == soup.find_all('table') == []
+    assert index.size == len(soup.find_all(True))
+
+@pytest.mark.parametrize('pattern', ['hotel', r'^price', 'star|rating', 'hotel-card', 'missing'])
+def test_by_class_matches_class_regex(soup, index, pattern):
+    """Поиск по шаблону класса совпадает с class_=re.compile(...)"""
+    assert index.by_class(re.compile(pattern)) == soup.find_all(class_=re.compile(pattern))
+    assert index.by_class(pattern) == soup.find_all(class_=re.compile(pattern))
+
+def test_with_attr_matches_attrs_query(soup, index):
+    """Поиск по атрибуту и значению совпадает с attrs={...}"""
+    assert index.with_attr('aria-label') == soup.find_all(attrs={'aria-label': True})
+    assert index.with_attr('alt', tag='img') == soup.find_all('img', alt=True)
+    assert index.with_attr('href', r'page=') == soup.find_all(href=re.compile(r'page='))
+    assert index.with_attr('class', 'hotel-card premium') == soup.find_all(class_='hotel-card premium')
+
+def test_within_matches_nested_find_all(soup, index):
+    """Поиск внутри элемента совпадает с container.find_all"""
+    cards = index.by_class('hotel-card|hotel-item')
+    prices = index.by_class('price')
+
+    for card in cards:
+        assert index.within(card, prices) == card.find_all(class_=re.compile('price'))
+        assert index.first_within(card, index.by_tag('h2', 'h3')) == card.find(['h2', 'h3'])
+        assert index.first_within(card, index.by_tag('img')) == card.find('img')
+
+    results = soup.find(class_='results')
+    assert index.within(results, index.by_tag('a')) == []
+    assert index.within(results, list(reversed(prices))) == prices
+
+def test_text_matches_get_text(soup, index):
+    """Текст элемента - get_text() без пробелов по краям"""
+    names = index.by_class('hotel-name')
+
+    assert index.texts(names) == [element.get_text().strip() for element in soup.find_all(class_='hotel-name')]
+    assert index.text(index.first(index.by_tag('title'))) == 'Отели в Сочи'
+    assert index.class_list(index.first(index.by_class('premium'))) == ['hotel-card', 'premium']
+
+def test_lxml_tree_gives_same_answers(index):
+    """Индекс дерева lxml.html отвечает так же, как индекс BeautifulSoup"""
+    tree = DOMIndex(lxml_html.document_fromstring(HTML))
+
+    assert tree.size == index.size
+    assert tree.texts(tree.by_tag('a')) == index.texts(index.by_tag('a'))
+    # Парсеры по-разному сохраняют пробелы между тегами
+    assert [' '.join(text.split()) for text in tree.texts(tree.by_class('hotel'))] == \
+        [' '.join(text.split()) for text in index.texts(index.by_class('hotel'))]
+    assert [element.get('data-id') for element in tree.with_attr('data-id')] == ['1', '2', '3']
+    for card, soup_card in zip(tree.by_class('hotel-card'), index.by_class('hotel-card')):
+        assert tree.texts(tree.within(card, tree.by_class('price'))) == \
+            index.texts(index.within(soup_card, index.by_class('price')))
@@ -0,0 +1,180 @@
+"""
+Тесты перебора комбинаций фильтров и кэша страниц выдачи (agent/filter_explorer.py)
+"""
+
+import sys
+from itertools import combinations
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('selenium')
+pytest.importorskip('numpy')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.filter_explorer import FilterExplorer, ResultPageCache, map_requirements, parse_number
+
+RESULTS_URL = 'https://x.ru/hotels?q=sochi'
+
+# Варианты фильтров страницы и отели, которые остаются после каждого из них
+OPTIONS = [
+    {'kind': 'amenity', 'value': 'spa', 'label': 'Спа-центр', 'selector': '#spa'},
+    {'kind': 'amenity', 'value': 'pool', 'label': 'Бассейн', 'selector': '#pool'},
+    {'kind': 'amenity', 'value': 'restaurant', 'label': 'Ресторан', 'selector': '#restaurant'},
+    {'kind': 'price', 'value': None, 'label': 'price', 'selector': None, 'min': 0, 'max': 50000}
+]
+HOTELS = {
+    'amenity:spa': {1, 2},
+    'amenity:pool': {3, 4},
+    'amenity:restaurant': {1, 3, 5}
+}
+REQUIREMENTS = {'luxury': {'spa': True, 'pool': True, 'restaurant': True}}
+
+class FakeDriver:
+    """Драйвер страницы выдачи: отдает только варианты фильтров"""
+
+    current_url = RESULTS_URL
+
+    def execute_script(self, script, *args):
+        return OPTIONS
+
+class FakeSite:
+    """Выдача сайта: пересечение отелей примененных фильтров; вкладки не открываются
+
+    Комбинации из failing завершаются ошибкой вкладки.
+    """
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.runs = []
+
+    def __call__(self, driver, jobs, tabs=None):
+        results = {}
+        for name, (url, filters) in jobs.items():
+            self.runs.append(name)
+            if name in self.failing:
+                results[name] = {'success': False, 'error': 'Превышено время ожидания', 'duration': 1.0}
+                continue
+            hotels = set.intersection(*(HOTELS[atom] for atom in name.split('+')))
+            results[name] = {'success': True, 'hotels_count': len(hotels), 'duration': 0.5,
+                             'url': f"{RESULTS_URL}&f={name}"}
+        return results
+
+def _explorer(site, **settings):
+    """Исследователь с подмененным выполнением заданий"""
+    explorer = FilterExplorer(settings)
+    explorer._run_jobs = site
+    return explorer
+
+def test_explore_reports_missing_filters():
+    """Комбинации с ненайденными фильтрами попадают в ошибки отчета"""
+    def run_jobs(driver, jobs, tabs=None):
+        return {name: {'success': 'amenities' not in name, 'missing': ['amenities'] if 'amenities' in name else [],
+                       'hotels_count': 0 if 'amenities' in name else 4, 'duration': 0.5}
+                for name in jobs}
+
+    explorer = FilterExplorer()
+    explorer._run_jobs = run_jobs
+    report = explorer.explore(FakeDriver(), [('price',), ('price', 'amenities')])
+
+    assert report['combinations_tested'] == 2
+    assert report['combinations_succeeded'] == report['combinations_with_results'] == 1
+    assert report['errors'] == {'price+amenities': 'Фильтры не найдены: amenities'}
+    assert report['total_tab_time'] == 1.0
+
+def test_map_requirements():
+    """Требования сопоставляются с вариантами по ключевым словам, цена - с ползунком"""
+    mapping = map_requirements({'spa': True, 'ski_storage': True, 'price_limit': 'до 10 000 рублей',
+                                'pool': False}, OPTIONS)
+
+    assert mapping['atoms']['spa']['selectors'] == ['#spa']
+    assert mapping['atoms']['price_limit']['name'] == 'price<=10000'
+    assert mapping['unmapped'] == ['ski_storage']
+    assert 'pool' not in mapping['atoms']
+    assert parse_number('до 10 000 рублей') == 10000 and parse_number('любая') is None
+
+def test_empty_result_prunes_supersets():
+    """Надмножества комбинации с пустой выдачей не проверяются"""
+    site = FakeSite()
+    report = _explorer(site).explore_requirements(FakeDriver(), REQUIREMENTS)
+    luxury = report['requirement_sets']['luxury']
+
+    assert 'amenity:pool+amenity:spa' in site.runs
+    assert 'amenity:pool+amenity:restaurant+amenity:spa' not in site.runs
+    assert report['combinations_pruned'] == 1
+    assert luxury['pruned'] and not luxury['satisfied']
+    assert luxury['blocking_combinations'] == ['amenity:pool+amenity:spa']
+    assert FilterExplorer.requirements_error(report) == 'Ни один набор требований не выполним'
+
+def test_failed_check_does_not_prune():
+    """Неудачная проверка подмножества не отсекает надмножества"""
+    site = FakeSite(failing={'amenity:pool'})
+    report = _explorer(site).explore_requirements(FakeDriver(), {'set': {'pool': True, 'restaurant': True}})
+    item = report['requirement_sets']['set']
+
+    assert 'amenity:pool+amenity:restaurant' in site.runs
+    assert report['combinations_pruned'] == 0
+    assert item['satisfied']
+    assert [failed['combination'] for failed in item['failed_combinations']] == ['amenity:pool']
+    assert FilterExplorer.requirements_error(report) is None
+
+def test_budget_skips_are_reported():
+    """Комбинации сверх max_combinations перечисляются в отчете и в причине неудачи"""
+    site = FakeSite()
+    report = _explorer(site, max_combinations=3).explore_requirements(FakeDriver(), REQUIREMENTS)
+
+    assert len(site.runs) == 3
+    assert report['combinations_skipped'] == ['amenity:pool+amenity:restaurant', 'amenity:pool+amenity:spa',
+                                              'amenity:restaurant+amenity:spa']
+    assert report['requirement_sets']['luxury']['skipped_combinations'] == report['combinations_skipped']
+    assert 'не проверено комбинаций' in FilterExplorer.requirements_error(report)
+
+def test_no_successful_combination():
+    """Перебор без единой примененной комбинации - неудача"""
+    site = FakeSite(failing={'+'.join(sorted(combination)) for size in range(1, len(HOTELS) + 1)
+                             for combination in combinations(HOTELS, size)})
+    report = _explorer(site).explore_requirements(FakeDriver(), REQUIREMENTS)
+
+    assert report['combinations_succeeded'] == 0
+    assert report['combinations_failed'] == len(site.runs) == 7
+    assert FilterExplorer.requirements_error(report) == 'Ни одна комбинация фильтров не применена'
+
+def test_repeated_exploration_uses_combination_cache():
+    """Повторный перебор той же выдачи не открывает вкладки для уже проверенных комбинаций"""
+    site = FakeSite()
+    explorer = _explorer(site)
+    explorer.explore_requirements(FakeDriver(), REQUIREMENTS)
+    runs = len(site.runs)
+
+    report = explorer.explore_requirements(FakeDriver(), REQUIREMENTS)
+
+    assert len(site.runs) == runs
+    assert report['combinations_tested'] == 0
+    assert report['combinations_cached'] == runs
+
+def test_plan_starts_from_parent_page():
+    """Комбинация начинается со страницы успешного подмножества и применяет один фильтр"""
+    explorer = FilterExplorer()
+    atoms = {name: {'name': name, 'selectors': []} for name in HOTELS}
+    combination = frozenset(['amenity:pool', 'amenity:restaurant'])
+
+    explored = {frozenset(['amenity:pool']): {'success': True, 'url': RESULTS_URL + '&pool=1'}}
+    url, filters = explorer._plan(RESULTS_URL, combination, explored, atoms)
+    assert url == RESULTS_URL + '&pool=1'
+    assert [control['name'] for control in filters] == ['amenity:restaurant']
+
+    explored = {frozenset(['amenity:pool']): {'success': False, 'url': RESULTS_URL + '&pool=1'}}
+    url, filters = explorer._plan(RESULTS_URL, combination, explored, atoms)
+    assert url == RESULTS_URL
+    assert [control['name'] for control in filters] == ['amenity:pool', 'amenity:restaurant']
+
+def test_result_page_cache():
+    """Страница узнается по каноническому URL и хэшу карточек"""
+    cache = ResultPageCache(['ts'])
+    cache.put('https://x.ru/hotels?b=2&a=1&ts=5', 'abc:10', {'hotels': 10})
+
+    assert cache.get('https://x.ru/hotels?a=1&b=2&ts=7', 'abc:10') == {'hotels': 10}
+    assert cache.get('https://x.ru/hotels?a=1&b=2', 'def:10') is None
+    assert cache.get('https://x.ru/hotels?a=1', 'abc:10') is None
+    assert cache.get_stats() == {'pages': 1, 'hits': 1, 'misses': 2}
@@ -0,0 +1,54 @@
+"""
+Тесты сопоставления запросов HAR-архива (agent/har_archive.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('selenium')
+pytest.importorskip('websockets')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.har_archive import normalize_url, save_har, load_har, HarReplayer
+
+def test_normalize_url_sorts_query():
+    """Порядок параметров не влияет на ключ, фрагмент отбрасывается"""
+    assert normalize_url('https://x.ru/hotels?b=2&a=1#top') == normalize_url('https://x.ru/hotels?a=1&b=2')
+    assert normalize_url('https://x.ru/hotels?b=2&a=1#top') == 'https://x.ru/hotels?a=1&b=2'
+
+def test_normalize_url_ignores_params():
+    """Изменчивые параметры удаляются, остальные и пустые значения сохраняются"""
+    url = 'https://x.ru/search?q=%D0%A1%D0%BE%D1%87%D0%B8&ts=123&page=&utm_source=ad'
+
+    assert normalize_url(url, ['ts', 'utm_source']) == 'https://x.ru/search?page=&q=%D0%A1%D0%BE%D1%87%D0%B8'
+    assert normalize_url(url) != normalize_url(url, ['ts'])
+
+def test_normalize_url_keeps_path_and_host():
+    """Разные пути и хосты дают разные ключи"""
+    assert normalize_url('https://x.ru/a?q=1') != normalize_url('https://x.ru/b?q=1')
+    assert normalize_url('https://x.ru/a') != normalize_url('https://y.ru/a')
+
+def _entry(method, url, body):
+    """Запись архива с текстовым ответом"""
+    return {'request': {'method': method, 'url': url},
+            'response': {'status': 200, 'content': {'text': body}}}
+
+def test_replayer_matches_in_order(tmp_path):
+    """Повторные запросы получают записанные ответы по порядку, последний повторяется"""
+    path = tmp_path / 'run.har'
+    save_har(str(path), [
+        _entry('GET', 'https://x.ru/api?page=1&ts=1', 'first'),
+        _entry('GET', 'https://x.ru/api?ts=2&page=1', 'second'),
+        _entry('POST', 'https://x.ru/api?page=1', 'post')
+    ])
+
+    replayer = HarReplayer(None, load_har(str(path)), ignore_query_params=['ts'])
+    served = [replayer._match('get', 'https://x.ru/api?page=1&ts=9')['response']['content']['text']
+              for _ in range(3)]
+
+    assert served == ['first', 'second', 'second']
+    assert replayer._match('POST', 'https://x.ru/api?page=1')['response']['content']['text'] == 'post'
+    assert replayer._match('GET', 'https://x.ru/api?page=2') is None
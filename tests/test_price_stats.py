@@ -0,0 +1,63 @@
+"""
+Тесты разбора цен и статистики по ним (agent/price_stats.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.price_stats import parse_prices, describe_prices, price_range_report, average_price
+
+def test_parse_prices_formats():
+    """Разряды через пробелы, десятичная запятая, диапазоны и тексты без цены"""
+    prices = parse_prices([
+        '5 000 ₽',
+        '12 345,50 руб.',
+        'от 3 200',
+        '5 000 – 7 500 ₽',
+        'Цена по запросу',
+        '',
+        '1 200\nза ночь'
+    ])
+
+    assert prices[:4].tolist() == [5000.0, 12345.5, 3200.0, 5000.0]
+    assert np.isnan(prices[4]) and np.isnan(prices[5])
+    assert prices[6] == 1200.0
+
+def test_parse_prices_empty():
+    """Пустой список - пустой массив"""
+    assert parse_prices([]).size == 0
+
+def test_describe_prices():
+    """Минимум, максимум, медиана и выбросы без учета NaN"""
+    stats = describe_prices(np.array([1000, 2000, 2000, 3000, 3000, 100000, np.nan]))
+
+    assert stats['count'] == 6
+    assert stats['min'] == 1000
+    assert stats['max'] == 100000
+    assert stats['median'] == 2500
+    assert stats['outliers']['high'] == [100000]
+    assert sum(stats['histogram'].values()) == 6
+
+def test_describe_prices_without_prices():
+    """Нет цен - пустая статистика"""
+    stats = describe_prices(parse_prices(['нет мест']))
+
+    assert stats['count'] == 0
+    assert stats['min'] is None
+    assert stats['histogram'] == {}
+
+def test_report_and_average():
+    """Раздел price_range анализа и средняя цена"""
+    report = price_range_report(['3 000 ₽', '5 000 ₽', 'нет цены'])
+
+    assert report['min_price'] == 3000
+    assert report['max_price'] == 5000
+    assert report['median_price'] == 4000
+    assert average_price(['3 000 ₽', '5 000 ₽']) == 4000
+    assert average_price([]) == 0
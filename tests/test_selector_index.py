@@ -0,0 +1,124 @@
+"""
+Тесты статистики селекторов по сайтам (agent/selector_index.py)
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent.selector_index import SelectorIndex, index_key, page_type
+
+SELECTORS = ['#search', '.search-input', 'input[name="q"]']
+KEY = ('ostrovok.ru', 'home', 'search_box')
+
+def test_page_type_and_key():
+    """Тип страницы - первый сегмент пути без чисел"""
+    assert page_type('https://ostrovok.ru/') == 'home'
+    assert page_type('https://ostrovok.ru/hotel/12345/') == 'hotel'
+    assert page_type('https://ostrovok.ru/hotels-2024/sochi.html') == 'hotels'
+    assert index_key('https://ostrovok.ru/?q=1', 'search_box') == KEY
+    assert index_key('file:///tmp/page.html', 'search_box')[0] == 'local'
+
+def test_order_keeps_configured_order_without_data():
+    """Пока проверок меньше min_attempts, порядок кандидатов не меняется"""
+    index = SelectorIndex({'min_attempts': 3})
+    index.record(KEY, SELECTORS, 2, 0.3)
+
+    assert index.order(KEY, SELECTORS) == SELECTORS
+    assert index.get_stats()['reordered'] == 0
+
+def test_order_prefers_selector_with_hits():
+    """Селектор, который чаще находил элемент, проверяется первым"""
+    index = SelectorIndex({'min_attempts': 3})
+    for _ in range(3):
+        index.record(KEY, SELECTORS, 2, 0.3)
+
+    assert index.order(KEY, SELECTORS) == ['input[name="q"]', '#search', '.search-input']
+    assert index.order(('other.ru', 'home', 'search_box'), SELECTORS) == SELECTORS
+    assert index.get_stats()['reordered'] == 1
+
+def test_record_counts_hits_and_misses():
+    """Кандидаты до найденного - промахи, без совпадения промахи - все"""
+    index = SelectorIndex()
+    index.record(KEY, SELECTORS, 1, 0.2)
+    index.record(KEY, SELECTORS, None, 0.3)
+    index.record(KEY, SELECTORS, 0, 0.1)
+    entry = index.entries['|'.join(KEY)]
+
+    assert {selector: (data['hits'], data['misses']) for selector, data in entry.items()} == {
+        '#search': (1, 2), '.search-input': (1, 1), 'input[name="q"]': (0, 1)}
+    assert entry['#search']['time'] == pytest.approx(0.1 + 0.1 + 0.1)
+    assert index.get_stats()['first_candidate_hits'] == 1
+
+def test_learned_selector_becomes_candidate():
+    """Подтвержденный эвристический селектор добавляется после заданных"""
+    index = SelectorIndex()
+    index.learn(KEY, None, False, 0.1)
+    index.learn(KEY, '[role="searchbox"]', True, 0.1)
+
+    assert index.order(KEY, SELECTORS) == [*SELECTORS, '[role="searchbox"]']
+    stats = index.get_stats()
+    assert (stats['heuristic_hits'], stats['heuristic_misses'], stats['learned_selectors']) == (1, 1, 1)
+
+def test_in_memory_index_writes_nothing(tmp_path):
+    """Без path статистика остается в памяти процесса"""
+    index = SelectorIndex()
+    index.record(KEY, SELECTORS, 0, 0.1)
+    index.save()
+
+    assert index.path is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_save_merges_concurrent_writers(tmp_path):
+    """Процессы записывают приращения поверх файла, а не затирают друг друга"""
+    path = tmp_path / 'selectors.json'
+    first = SelectorIndex({'path': str(path)})
+    second = SelectorIndex({'path': str(path)})
+
+    first.record(KEY, SELECTORS, 0, 0.1)
+    second.record(KEY, SELECTORS, 1, 0.2)
+    first.save()
+    second.save()
+    second.save()
+
+    entry = json.loads(path.read_text(encoding='utf-8'))['entries']['|'.join(KEY)]
+    assert (entry['#search']['hits'], entry['#search']['misses']) == (1, 1)
+    assert (entry['.search-input']['hits'], entry['.search-input']['misses']) == (1, 0)
+    assert SelectorIndex({'path': str(path)}).entries == second.entries
+
+class FakeDriver:
+    """Страница, на которой заданные селекторы не находят элемент, а эвристика находит"""
+
+    current_url = 'https://ostrovok.ru/'
+
+    def execute_script(self, script, *args):
+        # Эвристический поиск получает только подсказки цели
+        if len(args) == 1:
+            return {'selector': '[aria-label="Куда"]', 'elements': ['input']}
+        return None
+
+def test_probe_learns_only_confirmed_selectors():
+    """Найденный эвристикой селектор становится кандидатом после подтверждения действием"""
+    pytest.importorskip('selenium')
+    from agent.selector_probe import SelectorProbe
+
+    index = SelectorIndex()
+    probe = SelectorProbe(index=index)
+
+    probe.probe(FakeDriver(), SELECTORS, target='search_box')
+    assert probe.has_pending_learn('search_box')
+    probe.confirm_learn('search_box', False)
+    assert index.order(KEY, SELECTORS) == SELECTORS
+
+    probe.probe(FakeDriver(), SELECTORS, target='search_box')
+    probe.confirm_learn('search_box', True)
+    assert not probe.has_pending_learn('search_box')
+    assert index.order(KEY, SELECTORS)[-1] == '[aria-label="Куда"]'
+
+    probe.probe(FakeDriver(), SELECTORS, target='search_box')
+    probe.discard_learns()
+    assert index.get_stats()['heuristic_misses'] == 2